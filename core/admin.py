@@ -0,0 +1,25 @@
+from django.contrib import admin
+from .models import APIKey
+
+
+@admin.register(APIKey)
+class APIKeyAdmin(admin.ModelAdmin):
+    """Admin interface for APIKey model. Keys are issued with create_api_key."""
+    list_display = ['name', 'prefix', 'user', 'created_at', 'revoked_at']
+    list_filter = ['revoked_at', 'created_at']
+    search_fields = ['name', 'prefix', 'user__username']
+    readonly_fields = ['prefix', 'user', 'created_at', 'revoked_at']
+    fields = ['name', 'prefix', 'user', 'created_at', 'revoked_at']
+    list_select_related = ['user']
+    actions = ['revoke_keys']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description='Revoke selected API keys')
+    def revoke_keys(self, request, queryset):
+        revoked = 0
+        for api_key in queryset.filter(revoked_at__isnull=True):
+            api_key.revoke()
+            revoked += 1
+        self.message_user(request, f'Revoked {revoked} API key(s).')
@@ -0,0 +1,116 @@
+"""
+Async read endpoints mirroring the DRF viewsets.
+
+DRF views are synchronous, so under ASGI every request to them holds a
+thread. These views serve list and retrieve from an ``async def`` handler:
+authentication, permissions and filter validation run through the viewset
+in a worker thread, while counting and fetching use the async ORM, so a
+slow client does not pin a thread while it waits.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.paginator import InvalidPage
+from django.views import View
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.response import Response
+
+from .renderers import FastJSONRenderer
+
+
+class AsyncReadOnlyView(View):
+    """
+    Async list (``pk`` absent) or retrieve (``pk`` given) for ``viewset_class``.
+
+    The serializers run on fully prefetched objects, so subclasses must make
+    ``get_list_queryset()``/``get_detail_queryset()`` load everything the
+    serializer touches; lazy loads are not allowed in async code.
+    """
+    viewset_class = None
+    http_method_names = ['get', 'head', 'options']
+
+    def get_list_queryset(self, queryset):
+        return queryset
+
+    def get_detail_queryset(self, queryset):
+        return queryset
+
+    def prepare(self, request, action, kwargs):
+        """
+        Run the viewset's request setup and build the queryset.
+
+        Returns ``(viewset, queryset, error_response)``.
+        """
+        viewset = self.viewset_class(
+            action_map={'get': action},
+            format_kwarg=None,
+            args=(),
+            kwargs=kwargs,
+        )
+        # The browsable API renders forms that query the database.
+        viewset.renderer_classes = [FastJSONRenderer]
+        viewset.request = viewset.initialize_request(request, **kwargs)
+        viewset.headers = viewset.default_response_headers
+        try:
+            viewset.initial(viewset.request)
+            queryset = viewset.get_queryset()
+            if action == 'list':
+                queryset = self.get_list_queryset(viewset.filter_queryset(queryset))
+            else:
+                queryset = self.get_detail_queryset(queryset)
+        except Exception as exc:
+            return viewset, None, self.finalize(viewset, viewset.handle_exception(exc))
+        return viewset, queryset, None
+
+    def finalize(self, viewset, response):
+        response = viewset.finalize_response(viewset.request, response)
+        return response.render()
+
+    async def get(self, request, pk=None):
+        action = 'list' if pk is None else 'retrieve'
+        kwargs = {} if pk is None else {'pk': pk}
+        viewset, queryset, error = await sync_to_async(self.prepare)(request, action, kwargs)
+        if error is not None:
+            return error
+
+        try:
+            if action == 'list':
+                response = await self.list(viewset, queryset)
+            else:
+                response = await self.retrieve(viewset, queryset, pk)
+        except APIException as exc:
+            response = viewset.handle_exception(exc)
+        return self.finalize(viewset, response)
+
+    async def list(self, viewset, queryset):
+        paginator = viewset.paginator
+        if paginator is None:
+            objects = [obj async for obj in queryset]
+            return Response(viewset.get_serializer(objects, many=True).data)
+
+        request = viewset.request
+        django_paginator = paginator.django_paginator_class(
+            queryset, paginator.get_page_size(request)
+        )
+        # Pre-set the cached count so the paginator never counts synchronously.
+        django_paginator.count = await queryset.acount()
+        page_number = paginator.get_page_number(request, django_paginator)
+        try:
+            page = django_paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(paginator.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+        page.object_list = [obj async for obj in page.object_list]
+        paginator.page = page
+        paginator.request = request
+
+        serializer = viewset.get_serializer(page.object_list, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    async def retrieve(self, viewset, queryset, pk):
+        try:
+            instance = await queryset.aget(pk=pk)
+        except (ObjectDoesNotExist, ValueError):
+            raise NotFound()
+        await sync_to_async(viewset.check_object_permissions)(viewset.request, instance)
+        return Response(viewset.get_serializer(instance).data)
@@ -0,0 +1,112 @@
+"""
+API key authentication for service clients.
+"""
+import threading
+import time
+
+from django.conf import settings
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from .models import APIKey, hash_api_key
+
+
+class PrincipalCache:
+    """
+    Small in-process TTL cache of resolved API keys.
+
+    Entries map a key hash to ``(user, api_key)``. Revocations and user
+    changes made in this process invalidate entries immediately; other
+    processes pick them up once the TTL expires.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'API_KEY_CACHE_TTL', 60)
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'API_KEY_CACHE_SIZE', 1024)
+
+    def get(self, key_hash):
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key_hash]
+                return None
+            return principal
+
+    def set(self, key_hash, principal):
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                # Drop the entry closest to expiry to stay within bounds.
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[key_hash] = (time.monotonic() + self.ttl, principal)
+
+    def invalidate(self, key_hash):
+        with self._lock:
+            self._entries.pop(key_hash, None)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key_hash, (_, (user, _api_key)) in list(self._entries.items()):
+                if user.pk == user_id:
+                    del self._entries[key_hash]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+class APIKeyAuthentication(BaseAuthentication):
+    """
+    Authenticate requests carrying ``Authorization: Api-Key <key>``.
+    """
+    keyword = 'Api-Key'
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed('Invalid API key header.')
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed('Invalid API key header.')
+
+        return self.authenticate_credentials(key)
+
+    def authenticate_credentials(self, key):
+        key_hash = hash_api_key(key)
+        principal = principal_cache.get(key_hash)
+        if principal is not None:
+            return principal
+
+        api_key = APIKey.objects.select_related('user').filter(
+            hashed_key=key_hash,
+            revoked_at__isnull=True
+        ).first()
+        if api_key is None:
+            raise exceptions.AuthenticationFailed('Invalid API key.')
+        if not api_key.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+
+        principal = (api_key.user, api_key)
+        principal_cache.set(key_hash, principal)
+        return principal
+
+    def authenticate_header(self, request):
+        return self.keyword
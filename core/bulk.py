@@ -0,0 +1,335 @@
+"""
+Bulk create, update and delete endpoints for API viewsets.
+
+A batch is validated with the viewset's write serializer, but without the
+per-item queries DRF would run: primary key references are resolved with
+one query per related model and uniqueness constraints are checked with one
+query per constraint. Creates and updates go through ``bulk_create`` and
+``bulk_update``, so model signals do not fire for them: the search index
+is refreshed explicitly, the response cache once per request, and other
+derived data by overriding ``bulk_save()``.
+
+Deletes keep ``QuerySet.delete()``: its delete signals maintain the
+statistics, the search index and the response cache of every row,
+cascades included. Unlike processes (see ``processes.purge``), parties and
+contacts cascade to at most their contacts, so the collector stays cheap.
+"""
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import DateTimeField
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
+
+from .caching import bulk_invalidation
+
+BULK_MODES = ('atomic', 'best_effort')
+
+
+class _PrefetchedObjects:
+    """
+    Stand-in for a related field's queryset, serving ``get(pk=...)`` from
+    objects fetched beforehand for the whole batch.
+    """
+
+    def __init__(self, model, objects):
+        self.model = model
+        self.objects = objects
+
+    def get(self, pk):
+        try:
+            return self.objects[self.model._meta.pk.to_python(pk)]
+        except KeyError:
+            raise ObjectDoesNotExist
+        except DjangoValidationError:
+            raise ValueError(pk)
+
+
+def _unique_constraints(model):
+    """Field name tuples that must be unique together, the primary key aside."""
+    constraints = [
+        (field.name,) for field in model._meta.concrete_fields
+        if field.unique and not field.primary_key
+    ]
+    constraints.extend(tuple(fields) for fields in model._meta.unique_together)
+    return constraints
+
+
+def _unique_error(model, fields):
+    """The error DRF's unique validators report for ``fields``."""
+    if len(fields) > 1:
+        return {'non_field_errors': [f'The fields {", ".join(fields)} must make a unique set.']}
+    field = model._meta.get_field(fields[0])
+    return {fields[0]: [field.error_messages['unique'] % {
+        'model_name': model._meta.verbose_name,
+        'field_label': field.verbose_name,
+    }]}
+
+
+class BulkWriteMixin:
+    """
+    Add a ``bulk`` action, where POST creates and PATCH updates a list of
+    items in one request, and a ``bulk_delete`` action, where POST deletes
+    ``{"ids": [...]}`` as the process ``bulk_delete`` does.
+
+    Updates are items carrying their ``id`` plus the fields to change.
+    With ``?mode=atomic`` (the default) nothing
+    is written unless every item is valid; with ``?mode=best_effort`` the
+    valid items are written and the others reported. Errors are listed by
+    item index in either mode.
+    """
+    bulk_mode_param = 'mode'
+    bulk_serializer_class = None
+    # Fields set by prepare_bulk_instance(), saved along with updates.
+    bulk_derived_fields = ()
+
+    def get_bulk_serializer_class(self):
+        if self.bulk_serializer_class is not None:
+            return self.bulk_serializer_class
+        action = self.action
+        self.action = 'create'
+        try:
+            return self.get_serializer_class()
+        finally:
+            self.action = action
+
+    def get_bulk_mode(self):
+        mode = self.request.query_params.get(self.bulk_mode_param, 'atomic')
+        if mode not in BULK_MODES:
+            raise ValidationError({self.bulk_mode_param: [
+                f'Must be one of: {", ".join(BULK_MODES)}.'
+            ]})
+        return mode
+
+    def prepare_bulk_instance(self, instance):
+        """Set derived fields that ``Model.save()`` would otherwise compute."""
+
+    def get_bulk_status(self, result, mode, written, success_status):
+        """201/200 when all went well, 207 for a partial best effort, else 400."""
+        if not result['errors']:
+            return success_status
+        if mode == 'best_effort' and written:
+            return status.HTTP_207_MULTI_STATUS
+        return status.HTTP_400_BAD_REQUEST
+
+    @action(detail=False, methods=['post', 'patch'])
+    def bulk(self, request):
+        """Create or update many objects at once."""
+        mode = self.get_bulk_mode()
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({'non_field_errors': ['Expected a list of items.']})
+
+        with bulk_invalidation():
+            result = self.bulk_write(items, mode, update=request.method == 'PATCH')
+        success_status = status.HTTP_201_CREATED if request.method == 'POST' else status.HTTP_200_OK
+        return Response(result, status=self.get_bulk_status(result, mode, result['ids'], success_status))
+
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request):
+        """Delete many objects at once, given ``{"ids": [...]}``."""
+        mode = self.get_bulk_mode()
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list):
+            raise ValidationError({'ids': ['Expected a list of ids.']})
+
+        with bulk_invalidation():
+            result = self.bulk_destroy(ids, mode)
+        return Response(result, status=self.get_bulk_status(result, mode, result['deleted'], status.HTTP_200_OK))
+
+    def bulk_write(self, items, mode, update=False):
+        model = self.get_queryset().model
+        serializer_class = self.get_bulk_serializer_class()
+        errors = []
+        instances = None
+        if update:
+            queryset = self.get_queryset()
+            instances = queryset.in_bulk(self.to_pks(
+                queryset.model, [item.get('id') for item in items if isinstance(item, dict)]
+            ))
+
+        valid = []
+        for index, serializer in self.build_bulk_serializers(serializer_class, items, instances, errors):
+            if serializer.is_valid():
+                valid.append((index, serializer))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+
+        objects = []
+        for index, serializer in valid:
+            instance = serializer.instance or model()
+            for name, value in serializer.validated_data.items():
+                setattr(instance, name, value)
+            self.prepare_bulk_instance(instance)
+            objects.append((index, instance))
+        objects = self.check_bulk_uniqueness(model, objects, errors)
+
+        errors.sort(key=lambda error: error['index'])
+        if errors and mode == 'atomic':
+            return {'ids': [], 'errors': errors}
+
+        saved = [instance for _, instance in objects]
+        fields = None
+        if update:
+            fields = {
+                name for _, serializer in valid for name in serializer.validated_data
+            }
+            for field in model._meta.concrete_fields:
+                # bulk_update() does not apply auto_now either.
+                if isinstance(field, DateTimeField) and field.auto_now:
+                    now = timezone.now()
+                    for instance in saved:
+                        setattr(instance, field.attname, now)
+                    fields.add(field.name)
+            fields.update(self.bulk_derived_fields)
+        with transaction.atomic():
+            self.bulk_save(model, saved, fields)
+            search_index = getattr(self, 'search_index', None)
+            if search_index is not None and saved:
+                search_index.update([instance.pk for instance in saved])
+        return {'ids': [instance.pk for instance in saved], 'errors': errors}
+
+    def bulk_save(self, model, instances, fields=None):
+        """
+        Insert ``instances``, or update their ``fields`` when given.
+
+        Runs inside the batch transaction; override to maintain data that
+        model signals would otherwise have kept in sync.
+        """
+        if fields is None:
+            model._default_manager.bulk_create(instances, batch_size=settings.BULK_CREATE_CHUNK_SIZE)
+        elif instances and fields:
+            model._default_manager.bulk_update(
+                instances, fields, batch_size=settings.BULK_CREATE_CHUNK_SIZE
+            )
+
+    def to_pks(self, model, values):
+        """Convert ``values`` to primary keys of ``model``, skipping invalid ones."""
+        pks = set()
+        for value in values:
+            try:
+                pk = model._meta.pk.to_python(value)
+            except (DjangoValidationError, TypeError):
+                continue
+            if pk is not None:
+                pks.add(pk)
+        return list(pks)
+
+    def build_bulk_serializers(self, serializer_class, items, instances, errors):
+        """
+        Instantiate one serializer per item, sharing prefetched relations.
+
+        ``instances`` maps primary keys to the objects to update, or is None
+        when creating.
+        """
+        pk_field = self.get_queryset().model._meta.pk
+        entries = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors.append({'index': index, 'errors': {'non_field_errors': ['Expected an object.']}})
+                continue
+            if instances is None:
+                entries.append((index, serializer_class(data=item)))
+                continue
+            try:
+                instance = instances.get(pk_field.to_python(item.get('id')))
+            except (DjangoValidationError, TypeError):
+                instance = None
+            if instance is None:
+                errors.append({'index': index, 'errors': {'id': ['Not found.']}})
+                continue
+            # Validated as a whole so that cross-field rules see every value.
+            data = dict(serializer_class(instance).data)
+            data.update({key: value for key, value in item.items() if key != 'id'})
+            entries.append((index, serializer_class(instance, data=data)))
+
+        related = {}
+        for _, serializer in entries:
+            serializer.validators = [
+                validator for validator in serializer.validators
+                if not isinstance(validator, UniqueTogetherValidator)
+            ]
+            for name, field in serializer.fields.items():
+                field.validators = [
+                    validator for validator in field.validators
+                    if not isinstance(validator, UniqueValidator)
+                ]
+                if isinstance(field, serializers.PrimaryKeyRelatedField) and not field.read_only:
+                    related.setdefault(name, (field.get_queryset(), []))[1].append(
+                        serializer.initial_data.get(name)
+                    )
+
+        for name, (queryset, pks) in related.items():
+            model = queryset.model
+            objects = _PrefetchedObjects(model, queryset.in_bulk(self.to_pks(model, pks)))
+            for _, serializer in entries:
+                serializer.fields[name].queryset = objects
+        return entries
+
+    def check_bulk_uniqueness(self, model, objects, errors):
+        """Drop objects clashing with stored rows or earlier items of the batch."""
+        for fields in _unique_constraints(model):
+            attnames = [model._meta.get_field(name).attname for name in fields]
+            keys = {
+                index: tuple(getattr(instance, attname) for attname in attnames)
+                for index, instance in objects
+            }
+            lookups = {
+                f'{attname}__in': {key[position] for key in keys.values()}
+                for position, attname in enumerate(attnames)
+            }
+            stored = {}
+            if keys:
+                for row in model._default_manager.filter(**lookups).order_by().values_list('pk', *attnames):
+                    stored[tuple(row[1:])] = row[0]
+
+            seen = set()
+            kept = []
+            for index, instance in objects:
+                key = keys[index]
+                owner = stored.get(key)
+                if (owner is not None and owner != instance.pk) or key in seen:
+                    errors.append({'index': index, 'errors': _unique_error(model, fields)})
+                    continue
+                seen.add(key)
+                kept.append((index, instance))
+            objects = kept
+        return objects
+
+    def bulk_destroy(self, items, mode):
+        queryset = self.get_queryset()
+        pk_field = queryset.model._meta.pk
+        errors = []
+        pks = []
+        for index, item in enumerate(items):
+            try:
+                pks.append((index, pk_field.to_python(item)))
+            except (DjangoValidationError, TypeError):
+                errors.append({'index': index, 'errors': {'id': ['A valid integer is required.']}})
+
+        existing = set(queryset.filter(pk__in=[pk for _, pk in pks]).values_list('pk', flat=True))
+        for index, pk in pks:
+            if pk not in existing:
+                errors.append({'index': index, 'errors': {'id': ['Not found.']}})
+        errors.sort(key=lambda error: error['index'])
+        if errors and mode == 'atomic':
+            return {'deleted': 0, 'errors': errors}
+
+        model = queryset.model
+        try:
+            with transaction.atomic():
+                _, deleted = model._default_manager.filter(pk__in=existing).delete()
+        except IntegrityError:
+            # Rows referencing them were added concurrently: nothing was deleted.
+            errors.extend(
+                {'index': index, 'errors': {'id': ['Could not be deleted, other rows refer to it.']}}
+                for index, pk in pks if pk in existing
+            )
+            errors.sort(key=lambda error: error['index'])
+            return {'deleted': 0, 'errors': errors}
+        # Rows deleted concurrently since the lookup are not counted.
+        return {'deleted': deleted.get(model._meta.label, 0), 'errors': errors}
@@ -0,0 +1,213 @@
+"""
+Response cache for API viewsets.
+
+Serialized list and detail payloads are stored in the ``api`` cache, keyed on
+the request path, its normalized query parameters, the caller's permission
+scope and a set of generation tokens:
+
+* a global generation, bumped by bulk operations;
+* a list generation per resource, bumped whenever any row of it changes;
+* an object generation per row, bumped when that row (or data nested in its
+  payload) changes.
+
+Bumping a generation replaces its token, so every entry keyed on the old
+token is simply never read again and expires on its own. Tokens are random
+rather than counters, so an evicted generation can never come back to match
+stale entries.
+"""
+import hashlib
+import json
+import threading
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from rest_framework.response import Response
+
+API_CACHE_ALIAS = 'api'
+
+GLOBAL_GENERATION_KEY = 'generation'
+
+_state = threading.local()
+
+
+def get_cache():
+    return caches[API_CACHE_ALIAS]
+
+
+def _list_generation_key(resource):
+    return f'generation:{resource}'
+
+
+def _object_generation_key(resource, pk):
+    return f'generation:{resource}:{pk}'
+
+
+def _new_token():
+    return uuid.uuid4().hex[:16]
+
+
+def get_generations(keys):
+    """Return the current token of each generation key, creating missing ones."""
+    cache = get_cache()
+    tokens = cache.get_many(keys)
+    missing = [key for key in keys if key not in tokens]
+    if missing:
+        for key in missing:
+            cache.add(key, _new_token(), None)
+        tokens.update(cache.get_many(missing))
+    return [tokens.get(key, '') for key in keys]
+
+
+def get_list_generations(resource=None):
+    """Tokens a cached list of ``resource`` depends on: global, then the list's."""
+    keys = [GLOBAL_GENERATION_KEY]
+    if resource is not None:
+        keys.append(_list_generation_key(resource))
+    return get_generations(keys)
+
+
+class _BumpGenerations:
+    """on_commit callback replacing the tokens of some generation keys."""
+
+    def __init__(self, keys):
+        self.keys = keys
+
+    def __call__(self):
+        get_cache().set_many({key: _new_token() for key in self.keys}, None)
+
+
+def _bump(keys, using=DEFAULT_DB_ALIAS):
+    # Deferred to commit: a reader between the write and the commit would
+    # otherwise cache the old rows under the new token.
+    transaction.on_commit(_BumpGenerations(keys), using=using)
+
+
+def has_pending_invalidations(using=DEFAULT_DB_ALIAS):
+    """
+    Whether the current transaction changed cached data without committing.
+
+    Responses built inside such a transaction can see uncommitted rows, so
+    they are neither read from nor written to the cache.
+    """
+    return any(
+        isinstance(callback, _BumpGenerations)
+        for _, callback, *_ in connections[using].run_on_commit
+    )
+
+
+def invalidate(resource, pks=(), lists=True, using=DEFAULT_DB_ALIAS):
+    """
+    Invalidate cached responses of ``resource`` once the transaction commits.
+
+    Detail responses of ``pks`` are dropped, and list responses too unless
+    ``lists`` is False. Inside ``bulk_invalidation()`` this is a no-op.
+    """
+    if getattr(_state, 'bulk_depth', 0):
+        return
+    keys = [_object_generation_key(resource, pk) for pk in pks if pk is not None]
+    if lists:
+        keys.append(_list_generation_key(resource))
+    if keys:
+        _bump(keys, using=using)
+
+
+def bump_generation(using=DEFAULT_DB_ALIAS):
+    """Invalidate every cached response once the transaction commits."""
+    _bump([GLOBAL_GENERATION_KEY], using=using)
+
+
+@contextmanager
+def bulk_invalidation(using=DEFAULT_DB_ALIAS):
+    """
+    Replace per-row invalidation with one global generation bump.
+
+    Used around imports and other bulk writes, where invalidating row by row
+    would cost a cache write per saved object.
+    """
+    _state.bulk_depth = getattr(_state, 'bulk_depth', 0) + 1
+    try:
+        yield
+    finally:
+        _state.bulk_depth -= 1
+        if not _state.bulk_depth:
+            bump_generation(using=using)
+
+
+class ResponseCacheMixin:
+    """
+    Serve the ``cached_actions`` of a viewset from the ``api`` cache.
+
+    ``cache_resource`` names the generations the view depends on; model
+    signal receivers call ``invalidate()`` with the same name. Responses are
+    cached per permission scope (see ``get_cache_scope()``) after
+    authentication and permission checks have run.
+    """
+    cache_resource = None
+    cached_actions = ('list', 'retrieve')
+
+    @property
+    def cache_timeout(self):
+        return getattr(settings, 'API_CACHE_TIMEOUT', 300)
+
+    def get_cache_scope(self):
+        """Group of callers that are allowed to share cached responses."""
+        user = self.request.user
+        if user.is_superuser:
+            return 'superuser'
+        if user.is_staff:
+            return 'staff'
+        return 'user'
+
+    def get_cache_key(self, request):
+        if self.detail:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            generation_key = _object_generation_key(self.cache_resource, self.kwargs[lookup_url_kwarg])
+        else:
+            generation_key = _list_generation_key(self.cache_resource)
+        generations = get_generations([GLOBAL_GENERATION_KEY, generation_key])
+
+        # Parameter order and blank parameters do not change the response.
+        params = sorted(
+            ((key, value) for key, values in request.query_params.lists() for value in values if value),
+            key=lambda param: param[0],
+        )
+        digest = hashlib.sha256(json.dumps(
+            [request.get_host(), request.path, params, generations]
+        ).encode()).hexdigest()
+        return f'response:{self.cache_resource}:{self.get_cache_scope()}:{digest}'
+
+    def is_cacheable(self, request):
+        return (
+            self.cache_timeout
+            and self.action in self.cached_actions
+            and request.method in ('GET', 'HEAD')
+            and not has_pending_invalidations()
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            data, status = cached
+            response = Response(data, status=status)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, (response.data, response.status_code), self.cache_timeout)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
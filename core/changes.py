@@ -0,0 +1,308 @@
+"""
+Incremental change feed for downstream sync.
+
+Every insert, update and delete of a feed table is logged in ``Change`` by
+database triggers (``ChangeTrigger``), inside the writing transaction, so
+bulk paths and raw SQL are covered as well as ``save()`` and ``delete()``.
+Each row keeps one entry, its latest change, which is what makes a row
+changed several times appear once.
+
+Entries are ordered by ``(transaction_id, id)``, which doubles as the
+cursor. Save times are not used: a transaction can commit long after it
+stamped its rows, and a cursor that had moved past those stamps would skip
+them for good.
+
+* On PostgreSQL ``transaction_id`` is the writer's ``txid_current()``, and
+  the feed only reads entries below the ``xmin`` of its snapshot, i.e. of
+  transactions that have all finished. Any transaction still to commit has
+  a higher id than every entry served, so it lands after every cursor. A
+  long-running writer holds the feed back until it ends.
+* SQLite runs one write transaction at a time, so entry ids are already
+  allocated in commit order and ``transaction_id`` is always 0.
+"""
+import base64
+from collections import namedtuple
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import BigIntegerField, Q
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Change
+from .rows import RowSerializer
+
+# A resource whose rows are in the feed, and the serializer of their data.
+ChangeSource = namedtuple('ChangeSource', 'resource queryset serializer_class')
+
+# Statement-level trigger function: logs the rows of the ``changed_rows``
+# transition table under resource ``TG_ARGV[0]`` and action ``TG_ARGV[1]``,
+# carrying over the creation position of the entries it replaces.
+POSTGRES_LOG_FUNCTION = '''
+CREATE OR REPLACE FUNCTION core_change_log() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO core_change (
+        id, resource, object_id, action, transaction_id,
+        created_transaction_id, created_change_id, changed_at
+    )
+    SELECT entry.id, TG_ARGV[0], entry.object_id, TG_ARGV[1], txid_current(),
+           CASE WHEN TG_OP = 'INSERT' THEN txid_current() ELSE previous.created_transaction_id END,
+           CASE WHEN TG_OP = 'INSERT' THEN entry.id ELSE previous.created_change_id END,
+           now()
+    FROM (
+        SELECT nextval(pg_get_serial_sequence('core_change', 'id')) AS id, id AS object_id
+        FROM changed_rows
+    ) AS entry
+    LEFT JOIN LATERAL (
+        SELECT created_transaction_id, created_change_id FROM core_change
+        WHERE resource = TG_ARGV[0] AND object_id = entry.object_id
+        ORDER BY id DESC LIMIT 1
+    ) AS previous ON true;
+
+    DELETE FROM core_change AS replaced USING changed_rows
+    WHERE replaced.resource = TG_ARGV[0] AND replaced.object_id = changed_rows.id
+      AND replaced.id < (
+          SELECT max(id) FROM core_change
+          WHERE resource = TG_ARGV[0] AND object_id = changed_rows.id
+      );
+    RETURN NULL;
+END;
+$$
+'''
+
+SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+# Trigger event, transition table / row alias, and the action it logs.
+TRIGGER_EVENTS = [
+    ('INSERT', 'NEW', Change.CREATED),
+    ('UPDATE', 'NEW', Change.UPDATED),
+    ('DELETE', 'OLD', Change.DELETED),
+]
+
+
+class ChangeTrigger:
+    """
+    Triggers logging the changes of ``table`` under ``resource``.
+
+    PostgreSQL uses statement-level triggers over transition tables, so a
+    bulk write is logged with one ``INSERT ... SELECT``. SQLite drops the
+    triggers of a table it rebuilds: migrations that alter a feed table on
+    SQLite must call ``create()`` again.
+    """
+
+    def __init__(self, resource, table):
+        self.resource = resource
+        self.table = table
+
+    def trigger_name(self, event):
+        return f'{self.table}_change_{event.lower()}'
+
+    def create(self, schema_editor):
+        """Create the triggers, and on PostgreSQL the shared log function."""
+        connection = schema_editor.connection
+        quote_name = schema_editor.quote_name
+        if connection.vendor == 'postgresql':
+            schema_editor.execute(POSTGRES_LOG_FUNCTION, params=None)
+            for event, alias, action in TRIGGER_EVENTS:
+                schema_editor.execute(
+                    f'CREATE TRIGGER {quote_name(self.trigger_name(event))} '
+                    f'AFTER {event} ON {quote_name(self.table)} '
+                    f'REFERENCING {alias} TABLE AS changed_rows FOR EACH STATEMENT '
+                    f"EXECUTE FUNCTION core_change_log('{self.resource}', '{action}')",
+                    params=None,
+                )
+        elif connection.vendor == 'sqlite':
+            for event, alias, action in TRIGGER_EVENTS:
+                schema_editor.execute(
+                    f'CREATE TRIGGER IF NOT EXISTS {quote_name(self.trigger_name(event))} '
+                    f'AFTER {event} ON {quote_name(self.table)} '
+                    f'BEGIN {self._sqlite_body(alias, action)} END',
+                    params=None,
+                )
+
+    def _sqlite_body(self, alias, action):
+        entry = f"resource = '{self.resource}' AND object_id = {alias}.id"
+        if action == Change.CREATED:
+            return (
+                f'DELETE FROM core_change WHERE {entry}; '
+                'INSERT INTO core_change (resource, object_id, action, transaction_id, changed_at) '
+                f"VALUES ('{self.resource}', {alias}.id, '{action}', 0, {SQLITE_NOW}); "
+                'UPDATE core_change SET created_transaction_id = 0, created_change_id = id '
+                'WHERE id = last_insert_rowid();'
+            )
+        previous = f'FROM core_change WHERE {entry} ORDER BY id DESC LIMIT 1'
+        return (
+            'INSERT INTO core_change (resource, object_id, action, transaction_id, '
+            'created_transaction_id, created_change_id, changed_at) '
+            f"SELECT '{self.resource}', {alias}.id, '{action}', 0, "
+            f'(SELECT created_transaction_id {previous}), (SELECT created_change_id {previous}), '
+            f'{SQLITE_NOW}; '
+            f'DELETE FROM core_change WHERE {entry} AND id < last_insert_rowid();'
+        )
+
+    def drop(self, schema_editor):
+        """Drop the triggers."""
+        quote_name = schema_editor.quote_name
+        on_table = f' ON {quote_name(self.table)}' if schema_editor.connection.vendor == 'postgresql' else ''
+        for event, _, _ in TRIGGER_EVENTS:
+            schema_editor.execute(
+                f'DROP TRIGGER IF EXISTS {quote_name(self.trigger_name(event))}{on_table}'
+            )
+
+    def backfill(self, using=DEFAULT_DB_ALIAS):
+        """Log every existing row as created, in ``(updated_at, id)`` order."""
+        connection = connections[using]
+        quote_name = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO core_change (resource, object_id, action, transaction_id, changed_at) '
+                f'SELECT %s, {quote_name("id")}, %s, 0, {quote_name("updated_at")} '
+                f'FROM {quote_name(self.table)} '
+                f'ORDER BY {quote_name("updated_at")}, {quote_name("id")}',
+                [self.resource, Change.CREATED],
+            )
+            cursor.execute(
+                'UPDATE core_change SET created_transaction_id = transaction_id, created_change_id = id '
+                'WHERE resource = %s AND action = %s AND created_change_id IS NULL',
+                [self.resource, Change.CREATED],
+            )
+
+
+def settled_changes(using=DEFAULT_DB_ALIAS):
+    """Entries no transaction still in flight can sort before."""
+    queryset = Change.objects.using(using)
+    if connections[using].vendor == 'postgresql':
+        queryset = queryset.filter(transaction_id__lt=RawSQL(
+            'txid_snapshot_xmin(txid_current_snapshot())', [], output_field=BigIntegerField()
+        ))
+    return queryset
+
+
+def encode_cursor(transaction_id, change_id):
+    value = f'{transaction_id}|{change_id}'
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return the ``(transaction_id, change_id)`` key of ``cursor``, or None if invalid."""
+    try:
+        value = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        transaction_id, change_id = value.split('|')
+        return int(transaction_id), int(change_id)
+    except ValueError:
+        return None
+
+
+class ChangeFeedView(APIView):
+    """
+    List changes of ``sources`` after the ``?since=`` cursor.
+
+    Each change is ``{resource, id, action, changed_at, data}``: ``action``
+    is ``created`` for rows created after the cursor, ``updated`` for other
+    live rows and ``deleted`` for deleted rows, whose ``data`` is null. A
+    row changed several times since the cursor appears once, with its
+    current data. Clients store ``cursor`` and pass it back until
+    ``has_more`` is false; batches hold up to ``?limit=`` changes.
+    """
+    sources = ()
+    cursor_param = 'since'
+    limit_param = 'limit'
+    default_limit = 1000
+    max_limit = 10000
+
+    def get_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_param)
+        if not cursor:
+            return None
+        key = decode_cursor(cursor)
+        if key is None:
+            raise ValidationError({self.cursor_param: ['Invalid cursor.']})
+        return key
+
+    def get_limit(self, request):
+        limit = request.query_params.get(self.limit_param)
+        if not limit:
+            return self.default_limit
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= self.max_limit:
+            raise ValidationError({self.limit_param: [
+                f'Must be an integer between 1 and {self.max_limit}.'
+            ]})
+        return limit
+
+    def get_changes(self, cursor, limit):
+        """The first ``limit`` settled entries after ``cursor``."""
+        queryset = settled_changes().filter(resource__in=[source.resource for source in self.sources])
+        if cursor is not None:
+            transaction_id, change_id = cursor
+            queryset = queryset.filter(
+                Q(transaction_id__gt=transaction_id) | Q(transaction_id=transaction_id, id__gt=change_id)
+            )
+        return list(queryset.order_by('transaction_id', 'id').values(
+            'id', 'resource', 'object_id', 'action', 'transaction_id',
+            'created_transaction_id', 'created_change_id', 'changed_at',
+        )[:limit])
+
+    def get_rows(self, source, pks):
+        """Current ``(row, data)`` of the live rows ``pks`` of ``source``, by id."""
+        row_serializer = RowSerializer(source.serializer_class())
+        columns = row_serializer.columns | {'updated_at'}
+        rows = list(source.queryset.filter(pk__in=pks).values(*columns))
+        return {
+            row['id']: (row, data)
+            for row, data in zip(rows, row_serializer.to_representation(rows))
+        }
+
+    def get(self, request, *args, **kwargs):
+        cursor = self.get_cursor(request)
+        limit = self.get_limit(request)
+
+        # One more entry than requested tells whether more follow.
+        changes = self.get_changes(cursor, limit + 1)
+        page = changes[:limit]
+        live = {
+            source.resource: self.get_rows(source, [
+                change['object_id'] for change in page
+                if change['resource'] == source.resource and change['action'] != Change.DELETED
+            ])
+            for source in self.sources
+            if any(change['resource'] == source.resource for change in page)
+        }
+
+        results = []
+        for change in page:
+            if change['action'] == Change.DELETED:
+                results.append({
+                    'resource': change['resource'],
+                    'id': change['object_id'],
+                    'action': Change.DELETED,
+                    'changed_at': change['changed_at'],
+                    'data': None,
+                })
+                continue
+            found = live[change['resource']].get(change['object_id'])
+            if found is None:
+                # Deleted since the entry was read; its deletion follows.
+                continue
+            row, data = found
+            created_at = (change['created_transaction_id'], change['created_change_id'])
+            created = cursor is None or (created_at[1] is not None and created_at > cursor)
+            results.append({
+                'resource': change['resource'],
+                'id': change['object_id'],
+                'action': Change.CREATED if created else Change.UPDATED,
+                'changed_at': row['updated_at'],
+                'data': data,
+            })
+
+        if page:
+            cursor = (page[-1]['transaction_id'], page[-1]['id'])
+        return Response({
+            'results': results,
+            'cursor': encode_cursor(*cursor) if cursor else None,
+            'has_more': len(changes) > limit,
+        })
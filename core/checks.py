@@ -0,0 +1,101 @@
+"""
+System checks and startup self-check for the database and cache configuration.
+"""
+import logging
+
+from django.conf import settings
+from django.core.checks import Info, Tags, Warning, register
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+
+def describe_database(alias=DEFAULT_DB_ALIAS):
+    """
+    Connect to the database and describe the configuration actually in use.
+    """
+    connection = connections[alias]
+    connection.ensure_connection()
+    database = connection.settings_dict
+    return {
+        'alias': alias,
+        'vendor': connection.vendor,
+        'engine': database['ENGINE'],
+        'name': str(database['NAME']),
+        'host': database.get('HOST') or 'local',
+        'server_version': '.'.join(str(part) for part in connection.Database.sqlite_version_info)
+        if connection.vendor == 'sqlite' else str(getattr(connection, 'pg_version', '')),
+        'conn_max_age': database.get('CONN_MAX_AGE'),
+        'conn_health_checks': database.get('CONN_HEALTH_CHECKS'),
+        'pool_size': getattr(settings, 'DB_POOL_SIZE', None),
+    }
+
+
+def log_database_self_check(alias=DEFAULT_DB_ALIAS):
+    """Log the database in use at startup; meant for server start hooks."""
+    try:
+        description = describe_database(alias)
+    except Exception as e:
+        logger.error('Database self-check failed for %r: %s', alias, e)
+        raise
+    finally:
+        # Never hand a connection opened here down to forked workers.
+        connections.close_all()
+
+    logger.info(
+        'Database self-check: %(vendor)s (%(engine)s) %(name)s@%(host)s, '
+        'server %(server_version)s, CONN_MAX_AGE=%(conn_max_age)s, '
+        'CONN_HEALTH_CHECKS=%(conn_health_checks)s, pool size %(pool_size)s',
+        description
+    )
+    for warning in check_database_settings(None):
+        logger.warning('%s: %s', warning.id, warning.msg)
+    return description
+
+
+@register(Tags.database)
+def check_database_connection(app_configs, databases=None, **kwargs):
+    """Report the engine in use; runs with ``manage.py check --database default``."""
+    messages = []
+    for alias in databases or []:
+        description = describe_database(alias)
+        messages.append(Info(
+            f"Database '{alias}' uses {description['vendor']} "
+            f"{description['server_version']} ({description['name']}@{description['host']}).",
+            id='core.I001',
+        ))
+    return messages
+
+
+@register()
+def check_database_settings(app_configs, **kwargs):
+    messages = []
+    database = settings.DATABASES[DEFAULT_DB_ALIAS]
+    engine = database['ENGINE']
+    if engine.endswith('sqlite3') and not settings.DEBUG:
+        messages.append(Warning(
+            'SQLite is in use with DEBUG off.',
+            hint='Set DATABASE_URL (or USE_SQLITE=False and DB_*) for production.',
+            id='core.W001',
+        ))
+    if engine.endswith('postgresql') and not database.get('CONN_MAX_AGE'):
+        messages.append(Warning(
+            'CONN_MAX_AGE is 0; every request opens a new PostgreSQL connection.',
+            hint='Set DB_CONN_MAX_AGE to keep connections open between requests.',
+            id='core.W002',
+        ))
+    return messages
+
+
+@register(Tags.caches)
+def check_api_cache_settings(app_configs, **kwargs):
+    messages = []
+    backend = settings.CACHES.get('api', {}).get('BACKEND', '')
+    if backend.endswith('LocMemCache') and not settings.DEBUG:
+        messages.append(Warning(
+            "The 'api' response cache is local to each process; invalidations "
+            "made by one worker do not reach the others.",
+            hint='Set API_CACHE_URL to a file:// or redis:// cache shared by all workers.',
+            id='core.W003',
+        ))
+    return messages
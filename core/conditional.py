@@ -0,0 +1,123 @@
+"""
+Conditional GET (ETag / Last-Modified) for API viewsets.
+
+Validators are derived from one aggregate query over the rows a response
+shows: their count and latest ``updated_at``, plus the same for each related
+table nested in the payload. Any insert, update or delete changes at least
+one of them, so the body never has to be built to decide on a 304.
+
+The aggregate spans every matching row, not just the page. On views with
+``ResponseCacheMixin`` the validators are therefore cached next to the
+response, under the same generations, and recomputed only when those
+change. That holds only for the relations declared in
+``conditional_relations``, whose writes invalidate the view's own
+resource; validators over other relations (``?include=`` paths) are
+computed on every request.
+"""
+import hashlib
+import json
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .caching import get_cache
+
+
+class ConditionalGetMixin:
+    """
+    Add ``ETag`` and ``Last-Modified`` to ``conditional_actions`` responses
+    and answer ``If-None-Match``/``If-Modified-Since`` with 304.
+
+    ``conditional_relations`` maps each action to the related lookups whose
+    rows are part of its payload; every model involved needs ``updated_at``.
+    Writes to those rows must invalidate the view's ``cache_resource``.
+    """
+    conditional_actions = ('list', 'retrieve')
+    conditional_relations = {}
+
+    def get_conditional_relations(self):
+        return list(self.conditional_relations.get(self.action, ()))
+
+    def get_validator_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.detail:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_validator_cache_key(self, request):
+        """Cache key of the validators, when the response cache covers the request."""
+        is_cacheable = getattr(self, 'is_cacheable', None)
+        if is_cacheable is None or not is_cacheable(request):
+            return None
+        # Other relations may change without touching the view's generations.
+        declared = self.conditional_relations.get(self.action, ())
+        if any(relation not in declared for relation in self.get_conditional_relations()):
+            return None
+        return f'validators:{request.accepted_renderer.format}:{self.get_cache_key(request)}'
+
+    def get_validators(self, request):
+        """
+        Return ``(etag, last_modified)`` for the current request, or None
+        when a detail lookup matches nothing.
+        """
+        key = self.get_validator_cache_key(request)
+        if key is None:
+            return self.compute_validators(request)
+        cache = get_cache()
+        validators = cache.get(key)
+        if validators is None:
+            validators = self.compute_validators(request)
+            if validators is not None:
+                cache.set(key, validators, self.cache_timeout)
+        return validators
+
+    def compute_validators(self, request):
+        queryset = self.get_validator_queryset()
+        aggregates = {'count': Count('pk', distinct=True), 'updated': Max('updated_at')}
+        for relation in self.get_conditional_relations():
+            aggregates[f'{relation}_count'] = Count(relation, distinct=True)
+            aggregates[f'{relation}_updated'] = Max(f'{relation}__updated_at')
+        # Aggregated over the matching primary keys, so joins added by the
+        # filters and the ordering/annotations of the list do not interfere.
+        values = queryset.model._default_manager.filter(
+            pk__in=queryset.order_by().values('pk')
+        ).aggregate(**aggregates)
+        if self.detail and not values['count']:
+            return None
+
+        timestamps = [value for key, value in values.items() if key.endswith('updated') and value]
+        last_modified = max(timestamps) if timestamps else None
+        params = sorted(request.query_params.lists())
+        digest = hashlib.sha256(json.dumps(
+            [request.get_host(), request.path, params, request.accepted_renderer.format, values],
+            default=str,
+        ).encode()).hexdigest()
+        return f'"{digest[:32]}"', last_modified
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.conditional_actions or request.method not in ('GET', 'HEAD'):
+            return handler(request, *args, **kwargs)
+
+        validators = self.get_validators(request)
+        if validators is None:
+            return handler(request, *args, **kwargs)
+        etag, last_modified = validators
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,19 @@
+"""
+Query expressions shared by API viewsets and admin changelists.
+"""
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def related_count(model, field):
+    """
+    Count the ``model`` rows whose foreign key ``field`` points at the outer row.
+
+    A correlated subquery rather than a join with ``GROUP BY``: it is
+    evaluated for the rows of the page only.
+    """
+    return Coalesce(Subquery(
+        model._default_manager.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+            count=Count('pk')
+        ).values('count')
+    ), 0)
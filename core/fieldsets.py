@@ -0,0 +1,111 @@
+"""
+Sparse fieldsets (``?fields=`` / ``?omit=``) for API viewsets.
+
+The requested fields prune the serializer and are pushed down into the
+queryset: only the columns they read are selected, and viewsets skip the
+annotations and prefetches of fields that are not rendered.
+"""
+import re
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+# Serializer sources that render a choice field's label.
+DISPLAY_SOURCE_RE = re.compile(r'get_(\w+)_display')
+
+
+def split_param(value):
+    """Names of a comma-separated query parameter such as ``?fields=``."""
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    Let clients choose the fields of ``sparse_fieldset_actions`` responses.
+
+    ``?fields=a,b`` keeps only those fields and ``?omit=c`` drops fields.
+    ``field_dependencies`` names the model fields read by serializer fields
+    whose source is not a model field (properties and the like); fields
+    without a known source disable the column projection, never the pruning.
+    """
+    fields_param = 'fields'
+    omit_param = 'omit'
+    sparse_fieldset_actions = ('list', 'retrieve')
+    field_dependencies = {}
+
+    def get_serializer_fields(self):
+        if not hasattr(self, '_serializer_fields'):
+            self._serializer_fields = self.get_serializer_class()().fields
+        return self._serializer_fields
+
+    def get_requested_fields(self):
+        """Names of the serializer fields to render, or None for all of them."""
+        if hasattr(self, '_requested_fields'):
+            return self._requested_fields
+
+        requested = None
+        request = self.request
+        if self.action in self.sparse_fieldset_actions and request.method in SAFE_METHODS:
+            fields = split_param(request.query_params.get(self.fields_param))
+            omit = split_param(request.query_params.get(self.omit_param))
+            if fields or omit:
+                available = list(self.get_serializer_fields())
+                for param, names in ((self.fields_param, fields), (self.omit_param, omit)):
+                    unknown = [name for name in names if name not in available]
+                    if unknown:
+                        raise ValidationError({param: [f'Unknown field(s): {", ".join(unknown)}.']})
+                requested = [
+                    name for name in available
+                    if (not fields or name in fields) and name not in omit
+                ]
+        self._requested_fields = requested
+        return requested
+
+    def is_field_requested(self, name):
+        requested = self.get_requested_fields()
+        return requested is None or name in requested
+
+    def get_projection(self, model, requested):
+        """Return the model fields read by ``requested``, or None if unknown."""
+        serializer_fields = self.get_serializer_fields()
+        columns = {model._meta.pk.name}
+        for name in requested:
+            if name in self.field_dependencies:
+                columns.update(self.field_dependencies[name])
+                continue
+            source = serializer_fields[name].source
+            if source == '*':
+                return None
+            attribute = source.split('.')[0]
+            match = DISPLAY_SOURCE_RE.fullmatch(attribute)
+            if match:
+                attribute = match.group(1)
+            try:
+                model_field = model._meta.get_field(attribute)
+            except FieldDoesNotExist:
+                return None
+            # Reverse relations are prefetched rather than selected.
+            if model_field.concrete:
+                columns.add(model_field.name)
+        return columns
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        requested = self.get_requested_fields()
+        if requested is None:
+            return queryset
+        columns = self.get_projection(queryset.model, requested)
+        if columns is not None:
+            queryset = queryset.only(*columns)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        requested = self.get_requested_fields()
+        if requested is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in requested:
+                    target.fields.pop(name)
+        return serializer
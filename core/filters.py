@@ -0,0 +1,60 @@
+"""
+Filters on foreign keys that never load the related table.
+
+django-filter turns foreign keys into ``ModelChoiceFilter``s, which validate
+each value with its own query and make the browsable API render every row
+of the related table as a ``<select>`` option. ``RelatedIdFilter`` takes a
+plain integer instead; ``RelatedIdFilterSet`` checks that the ids given to
+all such filters exist with one query per related model.
+"""
+import django_filters
+from django import forms
+
+
+class RelatedIdFilter(django_filters.NumberFilter):
+    """Filter on a foreign key by id, rendered as a plain number input."""
+    field_class = forms.IntegerField
+
+
+class RelatedIdInFilter(django_filters.BaseInFilter, RelatedIdFilter):
+    """Filter on a foreign key by a comma-separated list of ids."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('lookup_expr', 'in')
+        super().__init__(*args, **kwargs)
+
+
+class RelatedIdFilterSet(django_filters.FilterSet):
+    """FilterSet rejecting ids of ``RelatedIdFilter``s that do not exist."""
+
+    def is_valid(self):
+        if not super().is_valid():
+            return False
+        if not getattr(self, '_related_ids_checked', False):
+            self._related_ids_checked = True
+            self.check_related_ids()
+        return not self.form.errors
+
+    def check_related_ids(self):
+        requested = {}
+        for name, filter_ in self.filters.items():
+            if not isinstance(filter_, RelatedIdFilter):
+                continue
+            value = self.form.cleaned_data.get(name)
+            values = value if isinstance(value, list) else [value]
+            ids = {pk for pk in values if pk is not None}
+            if ids:
+                related_model = filter_.model._meta.get_field(filter_.field_name).related_model
+                requested.setdefault(related_model, {})[name] = ids
+
+        for model, ids_by_filter in requested.items():
+            existing = set(model._default_manager.filter(
+                pk__in=set().union(*ids_by_filter.values())
+            ).order_by().values_list('pk', flat=True))
+            for name, ids in ids_by_filter.items():
+                missing = sorted(ids - existing)
+                if missing:
+                    self.form.add_error(name, (
+                        f'Select a valid choice. {", ".join(map(str, missing))} '
+                        f'is not one of the available choices.'
+                    ))
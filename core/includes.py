@@ -0,0 +1,89 @@
+"""
+Compound documents (``?include=``) for API viewsets.
+
+Related rows named by ``?include=`` are returned next to the primary data,
+under ``included``, grouped by resource. Each include path is loaded with
+one ``.values()`` query over the primary keys of its parent rows, so a
+compound response costs one query per path however many rows it holds.
+"""
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+from .fieldsets import split_param
+from .rows import RowSerializer
+
+
+class IncludeMixin:
+    """
+    Add ``included`` related rows to ``include_actions`` responses.
+
+    ``includes`` maps each include path (``parties``, ``parties.contacts``)
+    to ``(relation lookup, resource name, serializer class)``; the lookup
+    follows reverse foreign keys from the viewset's model. Including a
+    nested path includes its parents too. Placed before
+    ``ConditionalGetMixin`` so that included rows count in the ETag.
+    """
+    include_param = 'include'
+    include_actions = ('list', 'retrieve')
+    includes = {}
+
+    def get_includes(self):
+        """Include paths of the current request, parents first."""
+        if hasattr(self, '_includes'):
+            return self._includes
+
+        requested = set()
+        if self.action in self.include_actions and self.request.method in SAFE_METHODS:
+            paths = split_param(self.request.query_params.get(self.include_param))
+            unknown = [path for path in paths if path not in self.includes]
+            if unknown:
+                raise ValidationError({self.include_param: [f'Unknown include(s): {", ".join(unknown)}.']})
+            for path in paths:
+                parts = path.split('.')
+                requested.update('.'.join(parts[:depth]) for depth in range(1, len(parts) + 1))
+            if requested and hasattr(self, 'is_field_requested') and not self.is_field_requested('id'):
+                raise ValidationError({self.include_param: ['Included rows are matched by id; request the id field.']})
+        self._includes = [path for path in self.includes if path in requested]
+        return self._includes
+
+    def get_conditional_relations(self):
+        relations = super().get_conditional_relations()
+        for path in self.get_includes():
+            lookup = self.includes[path][0]
+            if lookup not in relations:
+                relations.append(lookup)
+        return relations
+
+    def get_included(self, pks):
+        """Return the included rows of the primary objects ``pks``, by resource."""
+        included = {}
+        parent_pks = {'': pks}
+        for path in self.get_includes():
+            lookup, resource, serializer_class = self.includes[path]
+            model = self.get_queryset().model
+            for name in lookup.split('__'):
+                relation = model._meta.get_field(name)
+                model = relation.related_model
+            row_serializer = RowSerializer(serializer_class())
+            rows = list(model._default_manager.filter(**{
+                f'{relation.field.attname}__in': parent_pks[path.rpartition('.')[0]]
+            }).values(*row_serializer.columns))
+            parent_pks[path] = [row[model._meta.pk.attname] for row in rows]
+            included.setdefault(resource, []).extend(row_serializer.to_representation(rows))
+        return included
+
+    def add_included(self, response):
+        if not self.get_includes() or response.status_code != 200:
+            return response
+        data = response.data
+        if isinstance(data, list):
+            data = response.data = {'results': data}
+        items = data['results'] if not self.detail else [data]
+        data['included'] = self.get_included([item['id'] for item in items])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.add_included(super().list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.add_included(super().retrieve(request, *args, **kwargs))
@@ -0,0 +1,37 @@
+"""
+Django management command to issue an API key for a service client.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from core.models import APIKey
+
+
+class Command(BaseCommand):
+    help = 'Create an API key for a user and print it once'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'username',
+            type=str,
+            help='User the key authenticates as'
+        )
+        parser.add_argument(
+            '--name',
+            type=str,
+            required=True,
+            help='Label identifying the client using the key'
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User not found: {options['username']}")
+
+        api_key, raw_key = APIKey.generate(user, options['name'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Created API key "{api_key.name}" for {user.username}')
+        )
+        self.stdout.write('Store it now, it will not be shown again:')
+        self.stdout.write(raw_key)
@@ -0,0 +1,27 @@
+"""
+Django management command to revoke API keys.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from core.models import APIKey
+
+
+class Command(BaseCommand):
+    help = 'Revoke the active API keys with the given prefix'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'prefix',
+            type=str,
+            help='Prefix of the key (the part before the dot)'
+        )
+
+    def handle(self, *args, **options):
+        keys = APIKey.objects.filter(prefix=options['prefix'], revoked_at__isnull=True)
+        if not keys.exists():
+            raise CommandError(f"No active API key with prefix {options['prefix']}")
+
+        for api_key in keys:
+            api_key.revoke()
+            self.stdout.write(
+                self.style.SUCCESS(f'Revoked API key "{api_key.name}" ({api_key.prefix})')
+            )
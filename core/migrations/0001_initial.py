@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='APIKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Name')),
+                ('prefix', models.CharField(db_index=True, editable=False, max_length=8, verbose_name='Prefix')),
+                ('hashed_key', models.CharField(editable=False, max_length=64, unique=True, verbose_name='Hashed Key')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('revoked_at', models.DateTimeField(blank=True, null=True, verbose_name='Revoked At')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='api_keys', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'API Key',
+                'verbose_name_plural': 'API Keys',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
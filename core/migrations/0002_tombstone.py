@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:50
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=50, verbose_name='Resource')),
+                ('object_id', models.BigIntegerField(verbose_name='Object ID')),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Deleted At')),
+            ],
+            options={
+                'verbose_name': 'Tombstone',
+                'verbose_name_plural': 'Tombstones',
+                'indexes': [models.Index(fields=['deleted_at', 'id'], name='tombstone_changes_idx')],
+            },
+        ),
+    ]
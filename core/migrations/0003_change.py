@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-19 19:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def copy_tombstones(apps, schema_editor):
+    """Keep the deletions already recorded, ahead of every later change."""
+    Change = apps.get_model('core', 'Change')
+    Tombstone = apps.get_model('core', 'Tombstone')
+    Change.objects.using(schema_editor.connection.alias).bulk_create([
+        Change(resource=tombstone.resource, object_id=tombstone.object_id,
+               action='deleted', changed_at=tombstone.deleted_at)
+        for tombstone in Tombstone.objects.using(schema_editor.connection.alias).order_by('deleted_at', 'id')
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_tombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=50, verbose_name='Resource')),
+                ('object_id', models.BigIntegerField(verbose_name='Object ID')),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=10, verbose_name='Action')),
+                ('transaction_id', models.BigIntegerField(default=0, verbose_name='Transaction ID')),
+                ('created_transaction_id', models.BigIntegerField(null=True, verbose_name='Created Transaction ID')),
+                ('created_change_id', models.BigIntegerField(null=True, verbose_name='Created Change ID')),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Changed At')),
+            ],
+            options={
+                'verbose_name': 'Change',
+                'verbose_name_plural': 'Changes',
+                'indexes': [
+                    models.Index(fields=['transaction_id', 'id'], name='change_feed_idx'),
+                    models.Index(fields=['resource', 'object_id', 'id'], name='change_object_idx'),
+                ],
+            },
+        ),
+        migrations.RunPython(copy_tombstones, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='Tombstone',
+        ),
+    ]
@@ -0,0 +1,151 @@
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+def hash_api_key(key):
+    """Return the stored hash of an API key."""
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class APIKey(models.Model):
+    """
+    API key used by service clients to authenticate.
+
+    Only a SHA-256 hash of the key is stored. Keys are long random strings,
+    so a fast hash is enough and keeps per-request verification cheap,
+    unlike the PBKDF2 password check done by Basic authentication.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='api_keys',
+        verbose_name="User"
+    )
+    name = models.CharField(
+        max_length=100,
+        verbose_name="Name"
+    )
+    prefix = models.CharField(
+        max_length=8,
+        db_index=True,
+        editable=False,
+        verbose_name="Prefix"
+    )
+    hashed_key = models.CharField(
+        max_length=64,
+        unique=True,
+        editable=False,
+        verbose_name="Hashed Key"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Created At"
+    )
+    revoked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Revoked At"
+    )
+
+    class Meta:
+        verbose_name = "API Key"
+        verbose_name_plural = "API Keys"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.name} ({self.prefix}...)"
+
+    @property
+    def is_active(self):
+        return self.revoked_at is None
+
+    @classmethod
+    def generate(cls, user, name):
+        """
+        Create a key for ``user``.
+
+        Returns ``(api_key, raw_key)``; the raw key is not stored and can
+        only be shown once.
+        """
+        prefix = secrets.token_hex(4)
+        raw_key = f"{prefix}.{secrets.token_urlsafe(32)}"
+        api_key = cls.objects.create(
+            user=user,
+            name=name,
+            prefix=prefix,
+            hashed_key=hash_api_key(raw_key)
+        )
+        return api_key, raw_key
+
+    def revoke(self):
+        """Revoke this key; cached lookups are invalidated by a signal receiver."""
+        self.revoked_at = timezone.now()
+        self.save(update_fields=['revoked_at'])
+
+
+class Change(models.Model):
+    """
+    Latest change of a row, read by the change feed (``core.changes``).
+
+    Written by database triggers (``core.changes.ChangeTrigger``), in the
+    transaction that changes the row, so every write path is covered. Each
+    row keeps a single entry: a new change replaces the previous one, and a
+    deleted row keeps its ``deleted`` entry as a tombstone.
+    """
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTION_CHOICES = [
+        (CREATED, 'Created'),
+        (UPDATED, 'Updated'),
+        (DELETED, 'Deleted'),
+    ]
+
+    resource = models.CharField(
+        max_length=50,
+        verbose_name="Resource"
+    )
+    object_id = models.BigIntegerField(
+        verbose_name="Object ID"
+    )
+    action = models.CharField(
+        max_length=10,
+        choices=ACTION_CHOICES,
+        verbose_name="Action"
+    )
+    # ID of the writing transaction on PostgreSQL, 0 on SQLite.
+    transaction_id = models.BigIntegerField(
+        default=0,
+        verbose_name="Transaction ID"
+    )
+    # Feed position of the entry that created the row, carried over by the
+    # entries replacing it; null when the row predates the log.
+    created_transaction_id = models.BigIntegerField(
+        null=True,
+        verbose_name="Created Transaction ID"
+    )
+    created_change_id = models.BigIntegerField(
+        null=True,
+        verbose_name="Created Change ID"
+    )
+    changed_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Changed At"
+    )
+
+    class Meta:
+        verbose_name = "Change"
+        verbose_name_plural = "Changes"
+        indexes = [
+            # Keyset scans of the change feed.
+            models.Index(fields=['transaction_id', 'id'], name='change_feed_idx'),
+            # Lookup of the entry a new change replaces.
+            models.Index(fields=['resource', 'object_id', 'id'], name='change_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.resource} {self.object_id} {self.action}"
@@ -0,0 +1,46 @@
+"""
+Custom list actions served by another viewset's list machinery.
+
+Actions such as ``/processes/{id}/parties/`` used to serialize every
+matching row in one response. Delegating them to the ``list`` (or export)
+action of the viewset owning those rows gives them its pagination, filter
+backends, sparse fieldsets, caching and conditional GET for free.
+"""
+from rest_framework.exceptions import ValidationError
+
+# ?stream= values and the export actions of StreamingExportMixin serving them.
+STREAM_ACTIONS = {
+    'ndjson': 'export_ndjson',
+    'csv': 'export_csv',
+}
+
+
+class NestedListMixin:
+    """
+    Let other viewsets delegate list actions to this one.
+
+    ``scope`` holds lookups applied on top of ``get_queryset()``; it is set
+    per request through ``as_view()`` by ``delegate_list()``.
+    """
+    scope = None
+    stream_param = 'stream'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.scope:
+            queryset = queryset.filter(**self.scope)
+        return queryset
+
+    def delegate_list(self, request, viewset_class, **scope):
+        """
+        Answer ``request`` with the list of ``viewset_class`` rows matching
+        ``scope``, or stream them all with ``?stream=ndjson`` or ``?stream=csv``.
+        """
+        stream = request.query_params.get(self.stream_param)
+        if stream and stream not in STREAM_ACTIONS:
+            raise ValidationError({self.stream_param: [
+                f'Must be one of: {", ".join(STREAM_ACTIONS)}.'
+            ]})
+        action = STREAM_ACTIONS[stream] if stream else 'list'
+        view = viewset_class.as_view({'get': action}, scope=scope, detail=False)
+        return view(request._request)
@@ -0,0 +1,146 @@
+"""
+Page number pagination without an exact ``COUNT(*)`` on every page.
+
+On PostgreSQL the planner's row estimate for the filtered query is read
+first; at or above ``COUNT_ESTIMATE_THRESHOLD`` rows it is reported instead
+of counting. Smaller results are counted exactly and the count is kept in
+the ``api`` cache for ``COUNT_CACHE_TIMEOUT`` seconds, keyed on the SQL and
+the list generations of the view's resource, so writes still show up at
+once. Responses say which kind of count they carry in ``count_exact``.
+"""
+import hashlib
+import json
+from functools import partial
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from .caching import get_cache, get_list_generations, has_pending_invalidations
+
+
+def estimate_count(queryset):
+    """Return the planner's row estimate for ``queryset``, or None if unavailable."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.get_compiler(queryset.db).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedPage(Page):
+    """Page telling whether more rows follow without relying on the count."""
+    has_more = None
+
+    def has_next(self):
+        if self.has_more is not None:
+            return self.has_more
+        return super().has_next()
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator counting through ``estimate_count()`` and the count cache.
+
+    With an estimated count, pages are not bounded by it: one extra row is
+    fetched to know whether a next page exists.
+    """
+    count_exact = True
+
+    def __init__(self, object_list, per_page, *args, resource=None, **kwargs):
+        self.resource = resource
+        super().__init__(object_list, per_page, *args, **kwargs)
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+        estimate = estimate_count(queryset)
+        if estimate is not None and estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+            self.count_exact = False
+            return estimate
+        return self.cached_count(queryset)
+
+    def cached_count(self, queryset):
+        timeout = settings.COUNT_CACHE_TIMEOUT
+        if not timeout or has_pending_invalidations(queryset.db):
+            return queryset.count()
+        sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+        digest = hashlib.sha256(json.dumps(
+            [queryset.db, sql, params, get_list_generations(self.resource)], default=str
+        ).encode()).hexdigest()
+        key = f'count:{digest}'
+        cache = get_cache()
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, timeout)
+        return count
+
+    def validate_number(self, number):
+        if self.count_exact:
+            return super().validate_number(number)
+        # The estimate may be below the real count: only the data can tell
+        # whether a page is past the end.
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        self.count  # Counting tells whether pages can be bounded by the count.
+        if self.count_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        page = self._get_page(rows[:self.per_page], number, self)
+        page.has_more = len(rows) > self.per_page
+        return page
+
+    def _get_page(self, *args, **kwargs):
+        return EstimatedPage(*args, **kwargs)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """PageNumberPagination reporting estimated or cached counts."""
+
+    @property
+    def django_paginator_class(self):
+        view = getattr(self, 'view', None)
+        return partial(EstimatedCountPaginator, resource=getattr(view, 'cache_resource', None))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_exact': self.page.paginator.count_exact,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['count_exact'] = {
+            'type': 'boolean',
+            'description': 'Whether count is exact rather than an estimate.',
+        }
+        return schema
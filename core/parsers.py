@@ -0,0 +1,34 @@
+"""
+Streaming request body parsers.
+"""
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parse newline-delimited JSON into a lazy iterator of values.
+
+    The body is read line by line as the iterator is consumed, so a large
+    upload is never held in memory at once. A malformed line raises
+    ``ParseError`` when it is reached; blank lines are skipped.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        return self.iter_values(codecs.getreader(encoding)(stream) if stream else [])
+
+    def iter_values(self, lines):
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                raise ParseError(f'NDJSON parse error on line {number}: {exc}')
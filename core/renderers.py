@@ -0,0 +1,40 @@
+"""
+JSON renderer backed by orjson when it is installed.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer producing the same bytes through orjson.
+
+    Used for the default compact, non-ASCII-escaping output. Indented output,
+    values orjson cannot encode (e.g. integers beyond 64 bits or non-string
+    keys) and installs without orjson fall back to the standard renderer.
+    Dates, decimals and other non-JSON types go through DRF's encoder.
+    Floats are the exception: orjson writes NaN as null and may format
+    exponents differently, which is fine for this API's payloads, which
+    carry none.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped by JSONRenderer too, as they are not valid in JavaScript strings.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,241 @@
+"""
+Full-text search indexes for API viewsets.
+
+On PostgreSQL each indexed table carries a ``search_vector`` tsvector column
+with a GIN index, built with Portuguese stemming. On SQLite, which is used
+for development, an FTS5 shadow table keyed by the row id plays the same
+role. Both are refreshed from the model signal receivers and through
+``SearchIndex.update()`` on bulk paths.
+
+Writes that bypass ``save()`` and ``delete()``, such as ``bulk_create()``,
+``bulk_update()``, ``QuerySet.update()`` or raw SQL, do not fire those
+receivers: they must call ``update()`` (or ``remove()``) on the index with
+the primary keys they touched, or the search keeps serving the old text.
+
+Full-text tokens only match whole words or their prefixes, so number-like
+searches (partial CNJ numbers, documents) skip the index and use an
+``icontains`` lookup over the view's ``search_number_fields`` instead.
+"""
+import operator
+import re
+from functools import reduce
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+SEARCH_CONFIG = 'portuguese'
+
+# Relative weight of each tsvector weight class, matching PostgreSQL's
+# ts_rank defaults so that both backends rank in the same order.
+WEIGHT_VALUES = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+# Rows refreshed per statement when updating the index in bulk.
+UPDATE_CHUNK_SIZE = 500
+
+TOKEN_RE = re.compile(r'\w+')
+
+# Search terms made of digits and number punctuation only.
+NUMBER_TERM_RE = re.compile(r'[\d.\-/]*\d[\d.\-/]*')
+
+
+class SearchIndex:
+    """
+    Full-text index over some text columns of a table.
+
+    ``columns`` is a list of ``(column, weight)`` pairs, weight being one of
+    the tsvector classes ``'A'`` to ``'D'``.
+    """
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = columns
+        self.fts_table = f'{table}_fts'
+
+    def _vector_sql(self, quote_name):
+        return ' || '.join(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({quote_name(column)}, '')), '{weight}')"
+            for column, weight in self.columns
+        )
+
+    def create(self, schema_editor):
+        """Create the GIN index or FTS5 table backing this index."""
+        connection = schema_editor.connection
+        quote_name = schema_editor.quote_name
+        if connection.vendor == 'postgresql':
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {quote_name(self.table + "_search_vector_gin")} '
+                f'ON {quote_name(self.table)} USING gin ({quote_name("search_vector")})'
+            )
+        elif connection.vendor == 'sqlite':
+            columns = ', '.join(quote_name(column) for column, _ in self.columns)
+            schema_editor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {quote_name(self.fts_table)} '
+                f"USING fts5({columns}, tokenize='unicode61 remove_diacritics 2')"
+            )
+
+    def drop(self, schema_editor):
+        """Drop the GIN index or FTS5 table backing this index."""
+        connection = schema_editor.connection
+        quote_name = schema_editor.quote_name
+        if connection.vendor == 'postgresql':
+            schema_editor.execute(
+                f'DROP INDEX IF EXISTS {quote_name(self.table + "_search_vector_gin")}'
+            )
+        elif connection.vendor == 'sqlite':
+            schema_editor.execute(f'DROP TABLE IF EXISTS {quote_name(self.fts_table)}')
+
+    def update(self, pks, using='default'):
+        """Refresh the index entries of the given primary keys."""
+        connection = connections[using]
+        quote_name = connection.ops.quote_name
+        pks = list(pks)
+        with connection.cursor() as cursor:
+            for start in range(0, len(pks), UPDATE_CHUNK_SIZE):
+                chunk = pks[start:start + UPDATE_CHUNK_SIZE]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                if connection.vendor == 'postgresql':
+                    cursor.execute(
+                        f'UPDATE {quote_name(self.table)} '
+                        f'SET {quote_name("search_vector")} = {self._vector_sql(quote_name)} '
+                        f'WHERE {quote_name("id")} IN ({placeholders})',
+                        chunk,
+                    )
+                elif connection.vendor == 'sqlite':
+                    columns = ', '.join(quote_name(column) for column, _ in self.columns)
+                    cursor.execute(
+                        f'DELETE FROM {quote_name(self.fts_table)} WHERE rowid IN ({placeholders})',
+                        chunk,
+                    )
+                    cursor.execute(
+                        f'INSERT INTO {quote_name(self.fts_table)} (rowid, {columns}) '
+                        f'SELECT {quote_name("id")}, {columns} FROM {quote_name(self.table)} '
+                        f'WHERE {quote_name("id")} IN ({placeholders})',
+                        chunk,
+                    )
+
+    def remove(self, pks, using='default'):
+        """Drop the index entries of deleted rows."""
+        connection = connections[using]
+        if connection.vendor != 'sqlite':
+            # The tsvector column goes away with the row itself.
+            return
+        pks = list(pks)
+        with connection.cursor() as cursor:
+            for start in range(0, len(pks), UPDATE_CHUNK_SIZE):
+                chunk = pks[start:start + UPDATE_CHUNK_SIZE]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f'DELETE FROM {connection.ops.quote_name(self.fts_table)} '
+                    f'WHERE rowid IN ({placeholders})',
+                    chunk,
+                )
+
+    def rebuild(self, using='default'):
+        """Rebuild the whole index from the base table."""
+        connection = connections[using]
+        quote_name = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    f'UPDATE {quote_name(self.table)} '
+                    f'SET {quote_name("search_vector")} = {self._vector_sql(quote_name)}'
+                )
+            elif connection.vendor == 'sqlite':
+                columns = ', '.join(quote_name(column) for column, _ in self.columns)
+                cursor.execute(f'DELETE FROM {quote_name(self.fts_table)}')
+                cursor.execute(
+                    f'INSERT INTO {quote_name(self.fts_table)} (rowid, {columns}) '
+                    f'SELECT {quote_name("id")}, {columns} FROM {quote_name(self.table)}'
+                )
+
+    def search(self, queryset, terms):
+        """
+        Filter ``queryset`` to rows matching ``terms`` and annotate ``search_rank``.
+
+        Returns None when the database has no full-text backend, so callers
+        can fall back to a plain ``icontains`` search.
+        """
+        vendor = connections[queryset.db].vendor
+        if vendor == 'postgresql':
+            query = SearchQuery(terms, config=SEARCH_CONFIG, search_type='websearch')
+            return queryset.filter(search_vector=query).annotate(
+                search_rank=SearchRank(F('search_vector'), query)
+            )
+        if vendor == 'sqlite':
+            tokens = TOKEN_RE.findall(terms)
+            if not tokens:
+                return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+            # Each token is quoted and prefix-matched; FTS5 ANDs them together.
+            match = ' '.join(f'"{token}"*' for token in tokens)
+            weights = ', '.join(str(WEIGHT_VALUES[weight]) for _, weight in self.columns)
+            return queryset.filter(
+                pk__in=RawSQL(
+                    f'SELECT rowid FROM "{self.fts_table}" WHERE "{self.fts_table}" MATCH %s',
+                    [match],
+                )
+            ).annotate(
+                # bm25() is lower-is-better; negate it so both backends sort descending.
+                search_rank=RawSQL(
+                    f'SELECT -bm25("{self.fts_table}", {weights}) FROM "{self.fts_table}" '
+                    f'WHERE "{self.fts_table}" MATCH %s AND rowid = "{self.table}"."id"',
+                    [match],
+                    output_field=FloatField(),
+                )
+            )
+        return None
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    SearchFilter backed by the view's ``search_index``.
+
+    Matches are annotated with ``search_rank`` and ordered by it. Views
+    without an index, and databases without a full-text backend, fall back
+    to the ``icontains`` search over ``search_fields``. When every term is
+    number-like, rows whose ``search_number_fields`` contain all of them
+    are returned in the view's default order.
+    """
+
+    def filter_number_terms(self, queryset, fields, terms):
+        for term in terms:
+            queryset = queryset.filter(reduce(operator.or_, (
+                Q(**{f'{field}__icontains': term}) for field in fields
+            )))
+        return queryset
+
+    def filter_queryset(self, request, queryset, view):
+        index = getattr(view, 'search_index', None)
+        if index is None:
+            return super().filter_queryset(request, queryset, view)
+
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        number_fields = getattr(view, 'search_number_fields', None)
+        if number_fields and all(NUMBER_TERM_RE.fullmatch(term) for term in search_terms):
+            return self.filter_number_terms(queryset, number_fields, search_terms)
+
+        terms = ' '.join(search_terms)
+
+        results = index.search(queryset, terms)
+        if results is None:
+            return super().filter_queryset(request, queryset, view)
+        return results.order_by('-search_rank', '-pk')
+
+
+class SearchRankOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that keeps the relevance order of a full-text search.
+
+    An explicit ``?ordering=`` still wins; only the view's default ordering
+    is skipped while a search term is active.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        if not request.query_params.get(self.ordering_param):
+            if 'search_rank' in queryset.query.annotations:
+                return None
+        return super().get_ordering(request, queryset, view)
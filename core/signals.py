@@ -0,0 +1,23 @@
+"""
+Signal receivers for the core app.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import principal_cache
+from .models import APIKey
+
+
+@receiver(post_save, sender=APIKey)
+@receiver(post_delete, sender=APIKey)
+def invalidate_api_key(sender, instance, **kwargs):
+    """Drop a cached key as soon as it is revoked, edited or deleted."""
+    principal_cache.invalidate(instance.hashed_key)
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_user_api_keys(sender, instance, **kwargs):
+    """Drop cached keys of a user whose account changed (e.g. deactivated)."""
+    principal_cache.invalidate_user(instance.pk)
@@ -0,0 +1,72 @@
+"""
+Test helpers shared by the app test suites.
+"""
+from unittest import mock
+
+from django.db import connections, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .caching import get_cache
+
+
+def filtered_queryset(viewset_class, params=None, action='list'):
+    """Return the queryset a viewset's filter backends build for ``params``."""
+    request = Request(APIRequestFactory().get('/', params or {}))
+    view = viewset_class(request=request, action=action, format_kwarg=None, kwargs={})
+    return view.filter_queryset(view.get_queryset())
+
+
+class QueryPlanAssertionsMixin:
+    """
+    Assertions on the query plan of a queryset.
+
+    Plans are read with EXPLAIN on SQLite and PostgreSQL. PostgreSQL picks
+    sequential scans on the tiny tables used in tests, so sequential scans are
+    discouraged for the duration of the EXPLAIN; a plan that still scans the
+    table means no usable index exists.
+    """
+
+    def get_query_plan(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql':
+            with transaction.atomic(using=queryset.db):
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+                return queryset.explain()
+        if connection.vendor == 'sqlite':
+            return queryset.explain()
+        self.skipTest(f'No query plan assertions for {connection.vendor}')
+
+    def assertUsesIndex(self, queryset, table, msg=None):
+        """Assert that ``table`` is read through an index, never fully scanned."""
+        plan = self.get_query_plan(queryset)
+        vendor = connections[queryset.db].vendor
+        if vendor == 'postgresql':
+            scans = [line for line in plan.splitlines() if f' on {table}' in line]
+            full_scans = [line for line in scans if 'Seq Scan' in line]
+        else:
+            scans = [line for line in plan.splitlines() if f' {table}' in line]
+            full_scans = [
+                line for line in scans
+                if 'SCAN' in line and 'INDEX' not in line and 'PRIMARY KEY' not in line
+            ]
+        self.assertTrue(scans, msg or f'{table} does not appear in plan:\n{plan}')
+        self.assertFalse(full_scans, msg or f'{table} is fully scanned:\n{plan}\n\n{queryset.query}')
+
+
+class FastListAssertionsMixin:
+    """Assertions comparing the row-based list path with the serializers."""
+
+    def assertListMatchesSerializer(self, viewset_class, url, params=None):
+        """Assert ``url`` renders the same bytes with and without the fast path."""
+        # Both responses must be rendered, not replayed from the response cache.
+        get_cache().clear()
+        fast = self.client.get(url, params or {})
+        get_cache().clear()
+        with mock.patch.object(viewset_class, 'get_row_serializer', return_value=None):
+            slow = self.client.get(url, params or {})
+        self.assertEqual(fast.status_code, 200, fast.content)
+        self.assertNotEqual(slow.get('X-Cache'), 'HIT')
+        self.assertEqual(fast.content, slow.content)
+        return fast
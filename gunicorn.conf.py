@@ -0,0 +1,40 @@
+"""
+Gunicorn configuration.
+
+By default workers are threaded and serve legal_system.wsgi; every thread
+keeps its own persistent database connection (CONN_MAX_AGE), so each worker
+holds up to DB_POOL_SIZE connections and the server up to
+WEB_CONCURRENCY * DB_POOL_SIZE.
+
+Set GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker and serve
+legal_system.asgi to handle many concurrent readers per worker on the
+async endpoints (/api/async/...).
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+if 'uvicorn' in worker_class:
+    # Matches the default applied by legal_system/asgi.py, so the self-check
+    # below reports what the workers actually use.
+    os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+threads = int(os.environ.get('DB_POOL_SIZE', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+accesslog = '-'
+
+
+def when_ready(server):
+    """Report the database actually in use before accepting requests."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'legal_system.settings')
+    import django
+    django.setup()
+
+    from core.checks import log_database_self_check
+    description = log_database_self_check()
+    server.log.info(
+        'Serving with %s database %s@%s using %s workers',
+        description['vendor'], description['name'], description['host'], worker_class
+    )
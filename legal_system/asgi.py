@@ -2,6 +2,10 @@
 ASGI config for legal_system project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with gunicorn and uvicorn workers:
+
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker \
+        gunicorn --config gunicorn.conf.py legal_system.asgi:application
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -12,5 +16,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'legal_system.settings')
+# Under ASGI, ORM calls run in executor threads that request_finished does
+# not clean up, so persistent connections would accumulate; open one per
+# request unless explicitly configured otherwise.
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -0,0 +1,44 @@
+"""
+Cache configuration helpers used by settings.py.
+"""
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from django.core.exceptions import ImproperlyConfigured
+
+BACKENDS = {
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+}
+
+
+def parse_cache_url(url):
+    """
+    Build a CACHES entry from a URL such as ``locmem://api``,
+    ``file:///var/tmp/legal_system_cache`` or ``redis://host:6379/1``.
+
+    Query parameters are passed through as cache OPTIONS.
+    """
+    parts = urlsplit(url)
+    backend = BACKENDS.get(parts.scheme)
+    if backend is None:
+        raise ImproperlyConfigured(f'Unsupported cache URL scheme: {parts.scheme!r}')
+
+    cache = {'BACKEND': backend}
+    if parts.scheme in ('redis', 'rediss'):
+        # redis-py parses the URL itself, including password and database.
+        cache['LOCATION'] = parts._replace(query='').geturl()
+    elif parts.scheme == 'file':
+        cache['LOCATION'] = unquote(parts.path)
+    elif parts.scheme == 'locmem':
+        cache['LOCATION'] = parts.netloc
+
+    options = {
+        key: int(value) if value.isdigit() else value
+        for key, value in parse_qsl(parts.query)
+    }
+    if options:
+        cache['OPTIONS'] = options
+    return cache
@@ -14,6 +14,9 @@ import os
 from pathlib import Path
 from decouple import config
 
+from .caches import parse_cache_url
+from .database import parse_database_url
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -40,7 +43,9 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
+    'django_filters',
     'corsheaders',
+    'core',
     'processes',
     'parties',
 ]
@@ -81,25 +86,59 @@ WSGI_APPLICATION = 'legal_system.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': config('DB_NAME', default='legal_system'),
-        'USER': config('DB_USER', default='postgres'),
-        'PASSWORD': config('DB_PASSWORD', default='postgres'),
-        'HOST': config('DB_HOST', default='localhost'),
-        'PORT': config('DB_PORT', default='5432'),
-    }
-}
+# DATABASE_URL (as passed by docker-compose) takes precedence over the
+# individual DB_* variables and the USE_SQLITE development fallback.
+DATABASE_URL = config('DATABASE_URL', default='')
 
-# Use SQLite for development if no PostgreSQL is available
-if config('USE_SQLITE', default=True, cast=bool):
+if DATABASE_URL:
+    DATABASES = {
+        'default': parse_database_url(DATABASE_URL)
+    }
+elif config('USE_SQLITE', default=True, cast=bool):
+    # Use SQLite for development if no PostgreSQL is available
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
         }
     }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='legal_system'),
+            'USER': config('DB_USER', default='postgres'),
+            'PASSWORD': config('DB_PASSWORD', default='postgres'),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+        }
+    }
+
+# Keep connections open between requests instead of reconnecting every time,
+# and check they are still usable before reusing them.
+DATABASES['default']['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=600, cast=int)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+
+# Persistent connections are held one per thread, so this is both the number
+# of gunicorn threads per worker and the connections each worker may hold.
+DB_POOL_SIZE = config('DB_POOL_SIZE', default=4, cast=int)
+
+
+# Caches
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+# The 'api' cache holds serialized API responses (see core/caching.py). It
+# must be shared by all workers (file or redis) for invalidations to reach
+# every process; the local-memory default only suits a single process.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': parse_cache_url(config('API_CACHE_URL', default='locmem://api')),
+}
+
+# Seconds a cached API response is kept; 0 disables the response cache.
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=300, cast=int)
 
 
 # Password validation
@@ -153,17 +192,41 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework settings
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'core.authentication.APIKeyAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # The browsable API builds forms with extra queries on every request;
+    # it is only offered while developing.
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+    ] + (['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
 }
 
+# API key authentication: resolved keys are cached in-process for this many seconds
+API_KEY_CACHE_TTL = config('API_KEY_CACHE_TTL', default=60, cast=int)
+API_KEY_CACHE_SIZE = config('API_KEY_CACHE_SIZE', default=1024, cast=int)
+
+# List counts: planner estimates are reported from this many rows on (PostgreSQL),
+# smaller exact counts are cached for COUNT_CACHE_TIMEOUT seconds (0 disables)
+COUNT_ESTIMATE_THRESHOLD = config('COUNT_ESTIMATE_THRESHOLD', default=100000, cast=int)
+COUNT_CACHE_TIMEOUT = config('COUNT_CACHE_TIMEOUT', default=60, cast=int)
+
+# Choices of admin filters listing every distinct value of a column are
+# cached for this many seconds (0 disables)
+ADMIN_FILTER_CACHE_TIMEOUT = config('ADMIN_FILTER_CACHE_TIMEOUT', default=600, cast=int)
+
+# Bulk process imports are validated and committed this many items at a time
+BULK_CREATE_CHUNK_SIZE = config('BULK_CREATE_CHUNK_SIZE', default=500, cast=int)
+
+# Bulk process deletes and purges remove this many processes per transaction
+DELETE_CHUNK_SIZE = config('DELETE_CHUNK_SIZE', default=500, cast=int)
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = config('CORS_ALLOW_ALL_ORIGINS', default=True, cast=bool)
 
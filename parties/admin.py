@@ -1,4 +1,6 @@
 from django.contrib import admin
+from core.changelists import EstimatedCountAdminMixin
+from core.expressions import related_count
 from .models import Party, PartyContact
 
 
@@ -10,17 +12,24 @@ class PartyContactInline(admin.TabularInline):
 
 
 @admin.register(Party)
-class PartyAdmin(admin.ModelAdmin):
-    """Admin interface for Party model."""
+class PartyAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    """
+    Admin interface for Party model.
+    
+    Processes are picked by id rather than from a select of every process.
+    """
     list_display = [
         'name', 'document', 'category', 'process', 
         'contacts_count', 'created_at'
     ]
-    list_filter = ['category', 'created_at', 'process']
+    list_filter = ['category', 'created_at']
+    list_select_related = ['process']
     search_fields = ['name', 'document', 'process__process_number']
     readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['process']
     ordering = ['name']
     inlines = [PartyContactInline]
+    cache_resource = 'parties'
     
     fieldsets = (
         ('Basic Information', {
@@ -32,21 +41,29 @@ class PartyAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(num_contacts=related_count(PartyContact, 'party'))
+    
     def contacts_count(self, obj):
         """Display contacts count."""
-        return obj.contacts.count()
+        return obj.num_contacts
     contacts_count.short_description = 'Contacts Count'
+    contacts_count.admin_order_field = 'num_contacts'
 
 
 @admin.register(PartyContact)
-class PartyContactAdmin(admin.ModelAdmin):
+class PartyContactAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     """Admin interface for PartyContact model."""
     list_display = [
         'party', 'contact_type', 'value', 'is_primary', 'created_at'
     ]
     list_filter = ['contact_type', 'is_primary', 'created_at', 'party__category']
+    list_select_related = ['party']
     search_fields = ['value', 'party__name']
     readonly_fields = ['created_at']
+    raw_id_fields = ['party']
+    # Contact changes invalidate the lists of their parties.
+    cache_resource = 'parties'
     ordering = ['-is_primary', 'contact_type']
     
     fieldsets = (
@@ -0,0 +1,14 @@
+"""
+Async read endpoints for parties.
+"""
+from core.async_views import AsyncReadOnlyView
+from .views import PartyViewSet
+
+
+class AsyncPartyView(AsyncReadOnlyView):
+    """
+    Async list and retrieve of parties, same payloads as PartyViewSet.
+
+    The viewset's queryset already prefetches the contacts it renders.
+    """
+    viewset_class = PartyViewSet
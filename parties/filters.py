@@ -0,0 +1,50 @@
+"""
+Filter sets for the parties API.
+"""
+import django_filters
+from core.filters import RelatedIdFilter, RelatedIdFilterSet, RelatedIdInFilter
+from .models import Party, PartyContact, normalize_document
+
+
+class PartyFilter(RelatedIdFilterSet):
+    """
+    Filters for parties.
+
+    ``document`` matches a CPF/CNPJ exactly and ``document_prefix`` matches
+    its leading digits; both accept any punctuation and are resolved against
+    the indexed ``document_normalized`` column.
+    """
+    process = RelatedIdFilter()
+    process__in = RelatedIdInFilter(field_name='process')
+    document = django_filters.CharFilter(method='filter_document')
+    document_prefix = django_filters.CharFilter(method='filter_document_prefix')
+    created_at = django_filters.IsoDateTimeFromToRangeFilter()
+    updated_at = django_filters.IsoDateTimeFromToRangeFilter()
+
+    class Meta:
+        model = Party
+        fields = ['category']
+
+    def filter_document(self, queryset, name, value):
+        digits = normalize_document(value)
+        if not digits:
+            return queryset.none()
+        return queryset.filter(document_normalized=digits)
+
+    def filter_document_prefix(self, queryset, name, value):
+        digits = normalize_document(value)
+        if not digits:
+            return queryset.none()
+        return queryset.filter(document_normalized__startswith=digits)
+
+
+class PartyContactFilter(RelatedIdFilterSet):
+    """Filters for party contacts."""
+    party = RelatedIdFilter()
+    party__in = RelatedIdInFilter(field_name='party')
+    created_at = django_filters.IsoDateTimeFromToRangeFilter()
+    updated_at = django_filters.IsoDateTimeFromToRangeFilter()
+
+    class Meta:
+        model = PartyContact
+        fields = ['contact_type', 'is_primary']
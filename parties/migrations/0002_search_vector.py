@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:59
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from core.search import SearchIndex
+
+# Frozen copy of the index definition at the time of this migration.
+party_search_index = SearchIndex('parties_party', [
+    ('name', 'A'),
+    ('document', 'B'),
+])
+
+
+def create_search_index(apps, schema_editor):
+    party_search_index.create(schema_editor)
+    party_search_index.rebuild(using=schema_editor.connection.alias)
+
+
+def drop_search_index(apps, schema_editor):
+    party_search_index.drop(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parties', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='party',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Search Vector'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
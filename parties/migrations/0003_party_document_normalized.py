@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:01
+
+import re
+
+from django.db import migrations, models
+
+from core.search import SearchIndex
+
+BACKFILL_CHUNK_SIZE = 2000
+
+old_search_index = SearchIndex('parties_party', [
+    ('name', 'A'),
+    ('document', 'B'),
+])
+new_search_index = SearchIndex('parties_party', [
+    ('name', 'A'),
+    ('document', 'B'),
+    ('document_normalized', 'B'),
+])
+
+
+def backfill_document_normalized(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "UPDATE parties_party SET document_normalized = regexp_replace(document, '[^0-9]', '', 'g')"
+        )
+        return
+
+    Party = apps.get_model('parties', 'Party')
+    batch = []
+    for party in Party.objects.only('id', 'document').iterator(chunk_size=BACKFILL_CHUNK_SIZE):
+        party.document_normalized = re.sub(r'[^\d]', '', party.document or '')
+        batch.append(party)
+        if len(batch) >= BACKFILL_CHUNK_SIZE:
+            Party.objects.bulk_update(batch, ['document_normalized'])
+            batch = []
+    if batch:
+        Party.objects.bulk_update(batch, ['document_normalized'])
+
+
+def add_document_to_search_index(apps, schema_editor):
+    old_search_index.drop(schema_editor)
+    new_search_index.create(schema_editor)
+    new_search_index.rebuild(using=schema_editor.connection.alias)
+
+
+def remove_document_from_search_index(apps, schema_editor):
+    new_search_index.drop(schema_editor)
+    old_search_index.create(schema_editor)
+    old_search_index.rebuild(using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parties', '0002_search_vector'),
+    ]
+
+    operations = [
+        # Backfill before indexing so the index is built once over final values.
+        migrations.AddField(
+            model_name='party',
+            name='document_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=20, verbose_name='Normalized Document'),
+        ),
+        migrations.RunPython(backfill_document_normalized, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='party',
+            name='document_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20, verbose_name='Normalized Document'),
+        ),
+        migrations.RunPython(add_document_to_search_index, remove_document_from_search_index),
+    ]
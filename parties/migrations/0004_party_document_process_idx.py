@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parties', '0003_party_document_normalized'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='party',
+            index=models.Index(fields=['document_normalized', 'process'], name='party_document_process_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parties', '0004_party_document_process_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='party',
+            index=models.Index(fields=['name'], name='party_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='party',
+            index=models.Index(fields=['category', 'name'], name='party_category_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='party',
+            index=models.Index(fields=['created_at'], name='party_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='party',
+            index=models.Index(fields=['updated_at'], name='party_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partycontact',
+            index=models.Index(fields=['party', '-is_primary', 'contact_type'], name='contact_party_primary_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partycontact',
+            index=models.Index(fields=['contact_type', '-is_primary'], name='contact_type_primary_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partycontact',
+            index=models.Index(fields=['-is_primary', 'contact_type'], name='contact_primary_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partycontact',
+            index=models.Index(fields=['created_at'], name='contact_created_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:20
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def backfill_updated_at(apps, schema_editor):
+    PartyContact = apps.get_model('parties', 'PartyContact')
+    PartyContact.objects.update(updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parties', '0005_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partycontact',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Updated At'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
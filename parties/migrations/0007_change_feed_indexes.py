@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parties', '0006_partycontact_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='party',
+            name='party_updated_idx',
+        ),
+        migrations.AddIndex(
+            model_name='party',
+            index=models.Index(fields=['updated_at', 'id'], name='party_changes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partycontact',
+            index=models.Index(fields=['updated_at', 'id'], name='contact_changes_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-19 19:40
+
+from django.db import migrations
+
+from core.changes import ChangeTrigger
+
+# Frozen copies of the trigger definitions at the time of this migration.
+party_changes = ChangeTrigger('parties', 'parties_party')
+contact_changes = ChangeTrigger('contacts', 'parties_partycontact')
+
+
+def create_change_triggers(apps, schema_editor):
+    # Backfilled after processes, and parties before their contacts.
+    for changes in (party_changes, contact_changes):
+        changes.create(schema_editor)
+        changes.backfill(using=schema_editor.connection.alias)
+
+
+def drop_change_triggers(apps, schema_editor):
+    Change = apps.get_model('core', 'Change')
+    for changes in (party_changes, contact_changes):
+        changes.drop(schema_editor)
+        Change.objects.using(schema_editor.connection.alias).filter(resource=changes.resource).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_change'),
+        ('parties', '0007_change_feed_indexes'),
+        ('processes', '0009_change_triggers'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_change_triggers, drop_change_triggers),
+    ]
@@ -1,8 +1,16 @@
+import re
+
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.validators import EmailValidator
 from processes.models import Process
 
 
+def normalize_document(value):
+    """Return the digits of a CPF/CNPJ, dropping any punctuation."""
+    return re.sub(r'[^\d]', '', value or '')
+
+
 class Party(models.Model):
     """
     Model to store party information in legal processes.
@@ -31,6 +39,13 @@ class Party(models.Model):
         max_length=20,
         verbose_name="Document (CPF/CNPJ)"
     )
+    document_normalized = models.CharField(
+        max_length=20,
+        blank=True,
+        db_index=True,
+        editable=False,
+        verbose_name="Normalized Document"
+    )
     category = models.CharField(
         max_length=20,
         choices=PARTY_CATEGORY_CHOICES,
@@ -44,16 +59,41 @@ class Party(models.Model):
         auto_now=True,
         verbose_name="Updated At"
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name="Search Vector"
+    )
 
     class Meta:
         verbose_name = "Party"
         verbose_name_plural = "Parties"
         ordering = ['name']
         unique_together = ['process', 'name', 'document']
+        indexes = [
+            models.Index(
+                fields=['document_normalized', 'process'],
+                name='party_document_process_idx'
+            ),
+            # Filtering by process and ordering by name is served by the
+            # unique (process, name, document) index.
+            models.Index(fields=['name'], name='party_name_idx'),
+            models.Index(fields=['category', 'name'], name='party_category_name_idx'),
+            models.Index(fields=['created_at'], name='party_created_idx'),
+            # Keyset scans of the change feed, and updated_at ordering.
+            models.Index(fields=['updated_at', 'id'], name='party_changes_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_category_display()})"
 
+    def save(self, *args, **kwargs):
+        self.document_normalized = normalize_document(self.document)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'document' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'document_normalized'}
+        super().save(*args, **kwargs)
+
 
 class PartyContact(models.Model):
     """
@@ -87,11 +127,32 @@ class PartyContact(models.Model):
         auto_now_add=True,
         verbose_name="Created At"
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Updated At"
+    )
 
     class Meta:
         verbose_name = "Party Contact"
         verbose_name_plural = "Party Contacts"
         ordering = ['-is_primary', 'contact_type', 'value']
+        indexes = [
+            models.Index(
+                fields=['party', '-is_primary', 'contact_type'],
+                name='contact_party_primary_idx'
+            ),
+            models.Index(
+                fields=['contact_type', '-is_primary'],
+                name='contact_type_primary_idx'
+            ),
+            models.Index(
+                fields=['-is_primary', 'contact_type'],
+                name='contact_primary_type_idx'
+            ),
+            models.Index(fields=['created_at'], name='contact_created_idx'),
+            # Keyset scans of the change feed.
+            models.Index(fields=['updated_at', 'id'], name='contact_changes_idx'),
+        ]
 
     def __str__(self):
         return f"{self.party.name} - {self.get_contact_type_display()}: {self.value}"
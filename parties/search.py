@@ -0,0 +1,10 @@
+"""
+Full-text search index for parties.
+"""
+from core.search import SearchIndex
+
+party_search_index = SearchIndex('parties_party', [
+    ('name', 'A'),
+    ('document', 'B'),
+    ('document_normalized', 'B'),
+])
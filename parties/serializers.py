@@ -45,6 +45,26 @@ class PartySerializer(serializers.ModelSerializer):
         ]
 
 
+class PartyIncludeSerializer(serializers.ModelSerializer):
+    """Serializer for parties included alongside their processes."""
+    category_display = serializers.CharField(source='get_category_display', read_only=True)
+    
+    class Meta:
+        model = Party
+        fields = [
+            'id', 'process', 'name', 'document', 'category', 'category_display',
+            'created_at', 'updated_at'
+        ]
+
+
+class PartyContactIncludeSerializer(serializers.ModelSerializer):
+    """Serializer for contacts included alongside their parties."""
+    
+    class Meta:
+        model = PartyContact
+        fields = ['id', 'party', 'contact_type', 'value', 'is_primary']
+
+
 class PartyCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating and updating parties."""
     
@@ -66,6 +86,14 @@ class PartyCreateUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
+class PartyNestedCreateSerializer(PartyCreateUpdateSerializer):
+    """Serializer for parties created together with their process."""
+    contacts = PartyContactSerializer(many=True, required=False)
+    
+    class Meta(PartyCreateUpdateSerializer.Meta):
+        fields = ['name', 'document', 'category', 'contacts']
+
+
 class PartyContactCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating and updating party contacts."""
     
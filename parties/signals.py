@@ -0,0 +1,107 @@
+"""
+Signal receivers keeping derived party data in sync.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core import caching
+from processes import stats
+
+from .models import Party, PartyContact
+from .search import party_search_index
+
+
+@receiver(post_save, sender=Party)
+def index_party(sender, instance, raw=False, using='default', **kwargs):
+    """Refresh the search index entry of a saved party."""
+    if raw:
+        return
+    party_search_index.update([instance.pk], using=using)
+
+
+@receiver(post_delete, sender=Party)
+def unindex_party(sender, instance, using='default', **kwargs):
+    """Drop the search index entry of a deleted party."""
+    party_search_index.remove([instance.pk], using=using)
+
+
+def _previous_parent_id(model, instance, field, raw, update_fields, using):
+    if raw or instance.pk is None:
+        return None
+    if update_fields is not None and field not in update_fields:
+        return None
+    return model.objects.using(using).filter(pk=instance.pk).values_list(
+        f'{field}_id', flat=True
+    ).first()
+
+
+@receiver(pre_save, sender=Party)
+def remember_previous_process(sender, instance, raw=False, update_fields=None, using='default', **kwargs):
+    """Note the process a party may be moved away from."""
+    instance._previous_process_id = _previous_parent_id(
+        Party, instance, 'process', raw, update_fields, using
+    )
+
+
+@receiver(post_save, sender=Party)
+@receiver(post_delete, sender=Party)
+def invalidate_party_responses(sender, instance, using='default', **kwargs):
+    """Drop cached responses showing a party, including its processes."""
+    caching.invalidate('parties', [instance.pk], using=using)
+    # Process lists show the number of parties, process details the parties.
+    process_ids = {instance.process_id, getattr(instance, '_previous_process_id', None)}
+    caching.invalidate('processes', process_ids, using=using)
+
+
+@receiver(pre_save, sender=PartyContact)
+def remember_previous_party(sender, instance, raw=False, update_fields=None, using='default', **kwargs):
+    """Note the party a contact may be moved away from."""
+    instance._previous_party_id = _previous_parent_id(
+        PartyContact, instance, 'party', raw, update_fields, using
+    )
+
+
+@receiver(post_save, sender=PartyContact)
+@receiver(post_delete, sender=PartyContact)
+def invalidate_contact_responses(sender, instance, using='default', **kwargs):
+    """Drop cached party and process responses nesting a contact."""
+    party_ids = {instance.party_id, getattr(instance, '_previous_party_id', None)}
+    caching.invalidate('parties', party_ids, using=using)
+    # Evaluated only when invalidating row by row, not during bulk work.
+    process_ids = Party.objects.using(using).filter(pk__in=party_ids).values_list('process_id', flat=True)
+    caching.invalidate('processes', process_ids, lists=False, using=using)
+
+
+@receiver(pre_save, sender=Party)
+def remember_previous_stats_key(sender, instance, raw=False, using='default', **kwargs):
+    """Note the process and category a party is counted under before saving."""
+    instance._previous_stats_key = None
+    if not raw and instance.pk is not None:
+        instance._previous_stats_key = Party.objects.using(using).filter(pk=instance.pk).values_list(
+            'process_id', 'category'
+        ).first()
+
+
+def _count_party(process_id, category, sign, using):
+    key = stats.stored_process_key(process_id, using=using)
+    if key is not None:
+        stats.apply({key + (category,): 1}, sign=sign, using=using)
+
+
+@receiver(post_save, sender=Party)
+def count_party(sender, instance, created, raw=False, using='default', **kwargs):
+    """Count a new party, or move an edited one to its new process or category."""
+    if raw:
+        return
+    previous = getattr(instance, '_previous_stats_key', None)
+    if previous == (instance.process_id, instance.category):
+        return
+    if previous is not None:
+        _count_party(*previous, -1, using)
+    _count_party(instance.process_id, instance.category, 1, using)
+
+
+@receiver(post_delete, sender=Party)
+def uncount_party(sender, instance, using='default', **kwargs):
+    """Stop counting a deleted party."""
+    _count_party(instance.process_id, instance.category, -1, using)
@@ -1,12 +1,18 @@
 """
 Tests for parties app.
 """
+from unittest import mock
+
+from django.db import IntegrityError
 from django.test import TestCase
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from core.testing import FastListAssertionsMixin, QueryPlanAssertionsMixin, filtered_queryset
 from processes.models import Process
+from .filters import PartyContactFilter, PartyFilter
 from .models import Party, PartyContact
+from .views import PartyViewSet, PartyContactViewSet
 
 
 class PartyModelTest(TestCase):
@@ -50,6 +56,21 @@ class PartyModelTest(TestCase):
         with self.assertRaises(Exception):
             Party.objects.create(**self.party_data)
 
+    
+    def test_document_normalized_on_save(self):
+        """Test the digits-only document is kept in sync on save."""
+        party = Party.objects.create(
+            process=self.process,
+            name='Empresa LTDA',
+            document='10.261.482/0001-97',
+            category='EXECUTADA'
+        )
+        self.assertEqual(party.document_normalized, '10261482000197')
+        
+        party.document = '564.406.360-73'
+        party.save(update_fields=['document'])
+        party.refresh_from_db()
+        self.assertEqual(party.document_normalized, '56440636073')
 
 class PartyContactModelTest(TestCase):
     """Test cases for PartyContact model."""
@@ -108,7 +129,7 @@ class PartyContactModelTest(TestCase):
         self.assertEqual(str(contact), expected)
 
 
-class PartyAPITest(APITestCase):
+class PartyAPITest(FastListAssertionsMixin, APITestCase):
     """Test cases for Party API."""
     
     def setUp(self):
@@ -215,8 +236,31 @@ class PartyAPITest(APITestCase):
         
         response = self.client.get(f'/api/parties/{party.id}/contacts/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['value'], contact.value)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['value'], contact.value)
+    
+    def test_party_contacts_endpoint_filters_contacts(self):
+        """Test contact filters apply to the contacts, not to the party."""
+        party = Party.objects.create(
+            process=self.process,
+            name='João da Silva',
+            document='12345678901',
+            category='EXEQUENTE'
+        )
+        PartyContact.objects.create(party=party, contact_type='EMAIL', value='joao@example.com')
+        PartyContact.objects.create(party=party, contact_type='PHONE', value='5511999999999')
+        
+        for params, values in [
+            ({'contact_type': 'PHONE'}, ['5511999999999']),
+            ({'search': 'example'}, ['joao@example.com']),
+            ({'document': '999'}, ['5511999999999', 'joao@example.com']),
+        ]:
+            with self.subTest(**params):
+                response = self.client.get(f'/api/parties/{party.id}/contacts/', params)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    sorted(contact['value'] for contact in response.data['results']), values
+                )
     
     def test_add_contact_to_party(self):
         """Test adding contact to party via API."""
@@ -236,6 +280,156 @@ class PartyAPITest(APITestCase):
         response = self.client.post(f'/api/parties/{party.id}/add_contact/', contact_data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(PartyContact.objects.count(), 1)
+    
+    def test_export_csv_endpoint(self):
+        """Test streaming parties as CSV."""
+        Party.objects.create(
+            process=self.process,
+            name='João da Silva',
+            document='12345678901',
+            category='EXEQUENTE'
+        )
+        
+        response = self.client.get('/api/parties/export_csv/', {'category': 'EXEQUENTE'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('João da Silva', lines[1])
+
+    
+    def test_search_parties_by_name(self):
+        """Test full-text search on party names."""
+        Party.objects.create(
+            process=self.process,
+            name='João da Silva',
+            document='12345678901',
+            category='EXEQUENTE'
+        )
+        Party.objects.create(
+            process=self.process,
+            name='Maria Santos',
+            document='12345678000190',
+            category='EXECUTADA'
+        )
+        
+        response = self.client.get('/api/parties/', {'search': 'joao silva'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['name'], 'João da Silva')
+    
+    def test_filter_by_document_any_formatting(self):
+        """Test exact document filter ignores punctuation."""
+        Party.objects.create(
+            process=self.process,
+            name='Maria Santos',
+            document='564.406.360-73',
+            category='EXECUTADA'
+        )
+        Party.objects.create(
+            process=self.process,
+            name='João da Silva',
+            document='12345678901',
+            category='EXEQUENTE'
+        )
+        
+        for value in ['56440636073', '564.406.360-73', '564 406 360 73']:
+            response = self.client.get('/api/parties/', {'document': value})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['results']), 1)
+            self.assertEqual(response.data['results'][0]['name'], 'Maria Santos')
+    
+    def test_filter_by_document_prefix(self):
+        """Test partial document filter matches leading digits."""
+        Party.objects.create(
+            process=self.process,
+            name='Empresa LTDA',
+            document='10.261.482/0001-97',
+            category='EXECUTADA'
+        )
+        
+        response = self.client.get('/api/parties/', {'document_prefix': '10.261.482'})
+        self.assertEqual(len(response.data['results']), 1)
+        response = self.client.get('/api/parties/', {'document_prefix': '0001'})
+        self.assertEqual(len(response.data['results']), 0)
+    
+    def test_async_list_and_detail_match_sync(self):
+        """Test the async party endpoints return the same payloads."""
+        party = Party.objects.create(
+            process=self.process,
+            name='João da Silva',
+            document='12345678901',
+            category='EXEQUENTE'
+        )
+        PartyContact.objects.create(party=party, contact_type='EMAIL', value='joao@example.com')
+        
+        self.assertEqual(
+            self.client.get('/api/async/parties/').json(),
+            self.client.get('/api/parties/').json()
+        )
+        self.assertEqual(
+            self.client.get(f'/api/async/parties/{party.id}/').json(),
+            self.client.get(f'/api/parties/{party.id}/').json()
+        )
+    
+    def test_list_matches_serializer_output(self):
+        """Test the fast party list renders byte-identical pages, contacts included."""
+        for index, category in enumerate(['EXEQUENTE', 'EXECUTADA', 'ADVOGADO']):
+            party = Party.objects.create(
+                process=self.process,
+                name=f'José Ñúñez {index}',
+                document=f'1234567890{index}',
+                category=category
+            )
+            for value in ['b@example.com', 'a@example.com'][:index]:
+                PartyContact.objects.create(party=party, contact_type='EMAIL', value=value)
+            PartyContact.objects.create(party=party, contact_type='PHONE', value='(11) 98765-4321', is_primary=True)
+        
+        response = self.assertListMatchesSerializer(PartyViewSet, '/api/parties/')
+        self.assertEqual(len(response.data['results'][2]['contacts']), 3)
+        self.assertListMatchesSerializer(PartyViewSet, '/api/parties/', {'category': 'EXECUTADA'})
+        self.assertListMatchesSerializer(PartyViewSet, '/api/parties/', {'fields': 'id,category_display,contacts'})
+    
+    def test_sparse_fieldset_skips_contacts(self):
+        """Test ?fields= without contacts drops the contacts prefetch."""
+        party = Party.objects.create(**{**self.party_data, 'process': self.process})
+        PartyContact.objects.create(party=party, contact_type='EMAIL', value='joao@example.com')
+        
+        response = self.client.get('/api/parties/', {'fields': 'id,name,category_display'})
+        self.assertEqual(response.data['results'], [
+            {'id': party.id, 'name': 'João da Silva', 'category_display': 'Exequente'}
+        ])
+        response = self.client.get('/api/party-contacts/', {'omit': 'value'})
+        self.assertNotIn('value', response.data['results'][0])
+    
+    def test_conditional_get_tracks_contacts(self):
+        """Test party validators change when a nested contact is edited."""
+        party = Party.objects.create(
+            process=self.process,
+            name='João da Silva',
+            document='12345678901',
+            category='EXEQUENTE'
+        )
+        contact = PartyContact.objects.create(party=party, contact_type='EMAIL', value='joao@example.com')
+        etag = self.client.get(f'/api/parties/{party.id}/')['ETag']
+        
+        response = self.client.get(f'/api/parties/{party.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        contact.value = 'silva@example.com'
+        contact.save()
+        response = self.client.get(f'/api/parties/{party.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['contacts'][0]['value'], 'silva@example.com')
+    
+    def test_include_contacts(self):
+        """Test parties can include their contacts in the same response."""
+        party = Party.objects.create(**{**self.party_data, 'process': self.process})
+        PartyContact.objects.create(party=party, contact_type='EMAIL', value='joao@example.com')
+        
+        response = self.client.get('/api/parties/', {'include': 'contacts', 'omit': 'contacts'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['included']['contacts'][0]['party'], party.id)
 
 
 class PartyContactAPITest(APITestCase):
@@ -305,8 +499,8 @@ class PartyContactAPITest(APITestCase):
         
         response = self.client.get('/api/party-contacts/emails/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['contact_type'], 'EMAIL')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['contact_type'], 'EMAIL')
     
     def test_phones_endpoint(self):
         """Test getting phone contacts via API."""
@@ -324,8 +518,284 @@ class PartyContactAPITest(APITestCase):
         
         response = self.client.get('/api/party-contacts/phones/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['contact_type'], 'PHONE')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['contact_type'], 'PHONE')
+
+
+class PartyListActionTest(APITestCase):
+    """Test cases for the paginated custom list actions."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        
+        self.process = Process.objects.create(
+            process_number='1234567-89.2023.1.02.0001',
+            process_class='Test',
+            subject='Test',
+            judge='Test'
+        )
+        for index in range(25):
+            party = Party.objects.create(
+                process=self.process,
+                name=f'Parte {index:02d}',
+                document='12345678901',
+                category='AUTOR' if index % 2 else 'REU'
+            )
+            PartyContact.objects.create(party=party, contact_type='EMAIL', value=f'parte{index}@example.com')
+            PartyContact.objects.create(party=party, contact_type='PHONE', value=f'(11) 9999-00{index:02d}')
+        self.party = party
+    
+    def test_emails_are_paginated(self):
+        """Test the email list is paginated in a fixed number of queries."""
+        with self.assertNumQueries(2):  # count, page
+            response = self.client.get('/api/party-contacts/emails/')
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertEqual({item['contact_type'] for item in response.data['results']}, {'EMAIL'})
+        
+        response = self.client.get('/api/party-contacts/phones/', {'page': 2})
+        self.assertEqual(len(response.data['results']), 5)
+    
+    def test_actions_accept_list_filters(self):
+        """Test the list filters, ordering and sparse fields apply to the actions."""
+        response = self.client.get(
+            f'/api/processes/{self.process.id}/parties/',
+            {'category': 'AUTOR', 'ordering': '-name', 'fields': 'id,name'}
+        )
+        self.assertEqual(response.data['count'], 12)
+        self.assertEqual(list(response.data['results'][0]), ['id', 'name'])
+        self.assertEqual(response.data['results'][0]['name'], 'Parte 23')
+        
+        response = self.client.get(f'/api/parties/{self.party.id}/contacts/', {'contact_type': 'PHONE'})
+        self.assertEqual(response.data['count'], 1)
+    
+    def test_stream_returns_every_row(self):
+        """Test ?stream=ndjson streams all matching rows instead of a page."""
+        response = self.client.get('/api/party-contacts/emails/', {'stream': 'ndjson'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 25)
+        
+        response = self.client.get('/api/party-contacts/emails/', {'stream': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_missing_parent_not_found(self):
+        """Test nested actions of a missing object are 404."""
+        response = self.client.get('/api/parties/999999/contacts/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PartyFilterTest(APITestCase):
+    """Test cases for the id, batch and date range filters."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        
+        self.processes = [
+            Process.objects.create(
+                process_number=f'{number:07d}-89.2023.1.02.0001',
+                process_class='Test',
+                subject='Test',
+                judge='Test'
+            )
+            for number in range(3)
+        ]
+        self.parties = [
+            Party.objects.create(process=process, name='Parte', document='12345678901', category='AUTOR')
+            for process in self.processes
+        ]
+    
+    def test_form_does_not_load_related_rows(self):
+        """Test rendering the filter forms runs no query."""
+        with self.assertNumQueries(0):
+            str(PartyFilter(queryset=Party.objects.all()).form)
+            str(PartyContactFilter(queryset=PartyContact.objects.all()).form)
+    
+    def test_in_filter_checks_ids_with_one_query(self):
+        """Test process__in filters by several processes after one existence query."""
+        PartyContact.objects.create(party=self.parties[0], contact_type='EMAIL', value='parte@example.com')
+        with self.assertNumQueries(3):  # existence, count, page
+            response = self.client.get('/api/party-contacts/', {'party__in': f'{self.parties[0].id},{self.parties[1].id}'})
+        self.assertEqual(response.data['count'], 1)
+        
+        ids = f'{self.processes[0].id},{self.processes[2].id}'
+        response = self.client.get('/api/parties/', {'process__in': ids})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {item['process'] for item in response.data['results']},
+            {self.processes[0].id, self.processes[2].id}
+        )
+    
+    def test_unknown_ids_rejected(self):
+        """Test ids that do not exist are reported like an invalid choice."""
+        response = self.client.get('/api/parties/', {'process__in': f'{self.processes[0].id},999999'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('999999', str(response.data['process__in']))
+        response = self.client.get('/api/parties/', {'process': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_date_range_filters(self):
+        """Test created_at and updated_at ranges."""
+        Party.objects.filter(pk=self.parties[0].pk).update(created_at='2020-01-01T00:00:00Z')
+        response = self.client.get('/api/parties/', {'created_at_before': '2021-01-01T00:00:00Z'})
+        self.assertEqual([item['id'] for item in response.data['results']], [self.parties[0].id])
+        response = self.client.get('/api/parties/', {'created_at_after': '2021-01-01T00:00:00Z'})
+        self.assertEqual(response.data['count'], 2)
+
+
+class PartyBulkWriteTest(APITestCase):
+    """Test cases for the bulk party and contact endpoints."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        
+        self.process = Process.objects.create(
+            process_number='1234567-89.2023.1.02.0001',
+            process_class='Test',
+            subject='Test',
+            judge='Test'
+        )
+        self.party = Party.objects.create(
+            process=self.process,
+            name='João da Silva',
+            document='12345678901',
+            category='EXEQUENTE'
+        )
+    
+    def party_item(self, name, document='98765432100', **extra):
+        item = {'process': self.process.id, 'name': name, 'document': document, 'category': 'EXECUTADA'}
+        item.update(extra)
+        return item
+    
+    def test_bulk_create_in_constant_queries(self):
+        """Test creating many parties runs a fixed number of queries."""
+        items = [self.party_item(f'Parte {number}') for number in range(30)]
+        # processes, uniqueness, savepoint, insert, statistics x2, index x2, release
+        with self.assertNumQueries(9):
+            response = self.client.post('/api/parties/bulk/', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['ids']), 30)
+        self.assertEqual(
+            set(Party.objects.filter(pk__in=response.data['ids']).values_list('document_normalized', flat=True)),
+            {'98765432100'}
+        )
+        
+        response = self.client.get('/api/parties/', {'search': 'parte'})
+        self.assertEqual(response.data['count'], 30)
+    
+    def test_atomic_mode_writes_nothing_on_error(self):
+        """Test one invalid item rejects the whole batch by default."""
+        items = [
+            self.party_item('Nova Parte'),
+            self.party_item('Sem Documento', document='123'),
+            self.party_item('Sem Processo', process=999999),
+            self.party_item(self.party.name, document=self.party.document),
+        ]
+        response = self.client.post('/api/parties/bulk/', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2, 3])
+        self.assertIn('document', response.data['errors'][0]['errors'])
+        self.assertIn('process', response.data['errors'][1]['errors'])
+        self.assertEqual(Party.objects.count(), 1)
+    
+    def test_best_effort_mode_writes_valid_items(self):
+        """Test best-effort mode creates the valid items and reports the rest."""
+        items = [
+            self.party_item('Nova Parte'),
+            self.party_item('Nova Parte'),
+            self.party_item('Sem Documento', document='123'),
+        ]
+        response = self.client.post('/api/parties/bulk/?mode=best_effort', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(len(response.data['ids']), 1)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+    
+    def test_bulk_update(self):
+        """Test partial items update only the given fields and refresh derived ones."""
+        other = Party.objects.create(
+            process=self.process, name='Empresa X', document='11222333000181', category='EXECUTADA'
+        )
+        items = [
+            {'id': self.party.id, 'document': '111.222.333-44'},
+            {'id': other.id, 'category': 'REU'},
+        ]
+        response = self.client.patch('/api/parties/bulk/', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.party.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.party.document_normalized, '11122233344')
+        self.assertEqual(self.party.category, 'EXEQUENTE')
+        self.assertEqual(other.category, 'REU')
+        self.assertGreater(other.updated_at, other.created_at)
+    
+    def test_bulk_delete(self):
+        """Test deleting by ids reports ids that do not exist."""
+        ids = {'ids': [self.party.id, 999999]}
+        response = self.client.post('/api/parties/bulk_delete/', ids, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Party.objects.count(), 1)
+        
+        response = self.client.post('/api/parties/bulk_delete/?mode=best_effort', ids, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['deleted'], 1)
+        self.assertEqual(Party.objects.count(), 0)
+        
+        response = self.client.post('/api/parties/bulk_delete/', [self.party.id], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_bulk_delete_integrity_error(self):
+        """Test a delete refused by the database is reported per item, not as a 500."""
+        with mock.patch('django.db.models.query.QuerySet.delete', side_effect=IntegrityError):
+            response = self.client.post(
+                '/api/parties/bulk_delete/?mode=best_effort', {'ids': [self.party.id]}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['deleted'], 0)
+        self.assertEqual(response.data['errors'][0]['index'], 0)
+        self.assertEqual(Party.objects.count(), 1)
+    
+    def test_bulk_contacts_apply_serializer_rules(self):
+        """Test contact email and phone rules are applied to every item."""
+        items = [
+            {'party': self.party.id, 'contact_type': 'EMAIL', 'value': 'joao@example.com'},
+            {'party': self.party.id, 'contact_type': 'EMAIL', 'value': 'not-an-email'},
+            {'party': self.party.id, 'contact_type': 'PHONE', 'value': '55 (11) 99999-9999'},
+        ]
+        response = self.client.post('/api/party-contacts/bulk/?mode=best_effort', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['errors'][0]['index'], 1)
+        self.assertEqual(self.party.contacts.count(), 2)
+        
+        contact = self.party.contacts.get(contact_type='PHONE')
+        response = self.client.patch(
+            '/api/party-contacts/bulk/', [{'id': contact.id, 'value': 'invalid'}], format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('value', response.data['errors'][0]['errors'])
+    
+    def test_rejects_unknown_mode(self):
+        """Test an unknown mode is a validation error."""
+        response = self.client.post('/api/parties/bulk/?mode=sometimes', [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
 class PartyValidationTest(TestCase):
@@ -369,3 +839,60 @@ class PartyValidationTest(TestCase):
                 document='123456789',  # Too short
                 category='EXEQUENTE'
             )
+
+
+class PartyQueryPlanTest(QueryPlanAssertionsMixin, TestCase):
+    """Test every filter/ordering path of the party lists is index-backed."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.process = Process.objects.create(
+            process_number='1234567-89.2023.1.02.0001',
+            process_class='Test',
+            subject='Test',
+            judge='Test'
+        )
+        self.party = Party.objects.create(
+            process=self.process,
+            name='João da Silva',
+            document='12345678901',
+            category='EXEQUENTE'
+        )
+    
+    def assertPathsUseIndexes(self, viewset_class, table, filters, orderings):
+        for filter_params in filters:
+            for ordering in orderings:
+                params = dict(filter_params)
+                if ordering:
+                    params['ordering'] = ordering
+                with self.subTest(**params):
+                    queryset = filtered_queryset(viewset_class, params)
+                    self.assertUsesIndex(queryset, table)
+    
+    def test_party_paths_use_indexes(self):
+        """Test EXPLAIN shows an index for each party filter/ordering combination."""
+        self.assertPathsUseIndexes(
+            PartyViewSet,
+            'parties_party',
+            [
+                {},
+                {'category': 'EXEQUENTE'},
+                {'process': self.process.id},
+                {'document': '123.456.789-01'},
+            ],
+            [None, 'name', '-name', 'created_at', 'updated_at'],
+        )
+    
+    def test_contact_paths_use_indexes(self):
+        """Test EXPLAIN shows an index for each contact filter/ordering combination."""
+        self.assertPathsUseIndexes(
+            PartyContactViewSet,
+            'parties_partycontact',
+            [
+                {},
+                {'contact_type': 'EMAIL'},
+                {'party': self.party.id},
+                {'is_primary': 'true'},
+            ],
+            [None, 'contact_type', 'is_primary', '-is_primary', 'created_at'],
+        )
@@ -1,5 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .async_views import AsyncPartyView
 from .views import PartyViewSet, PartyContactViewSet
 
 router = DefaultRouter()
@@ -7,5 +8,7 @@ router.register(r'parties', PartyViewSet)
 router.register(r'party-contacts', PartyContactViewSet)
 
 urlpatterns = [
+    path('api/async/parties/', AsyncPartyView.as_view()),
+    path('api/async/parties/<int:pk>/', AsyncPartyView.as_view()),
     path('api/', include(router.urls)),
 ] 
\ No newline at end of file
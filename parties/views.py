@@ -2,28 +2,68 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.generics import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from .models import Party, PartyContact
+from core.bulk import BulkWriteMixin
+from core.caching import ResponseCacheMixin
+from core.conditional import ConditionalGetMixin
+from core.exports import StreamingExportMixin
+from core.fieldsets import SparseFieldsetMixin
+from core.includes import IncludeMixin
+from core.nested import NestedListMixin
+from core.rows import FastListMixin
+from core.search import FullTextSearchFilter, SearchRankOrderingFilter
+from processes import stats as process_stats
+from .filters import PartyContactFilter, PartyFilter
+from .models import Party, PartyContact, normalize_document
+from .search import party_search_index
 from .serializers import (
     PartySerializer,
     PartyCreateUpdateSerializer,
     PartyContactSerializer,
-    PartyContactCreateUpdateSerializer
+    PartyContactCreateUpdateSerializer,
+    PartyContactIncludeSerializer
 )
 
 
-class PartyViewSet(viewsets.ModelViewSet):
+class PartyViewSet(
+    IncludeMixin, ConditionalGetMixin, ResponseCacheMixin, FastListMixin, SparseFieldsetMixin,
+    BulkWriteMixin, StreamingExportMixin, NestedListMixin, viewsets.ModelViewSet
+):
     """
     ViewSet for managing parties in legal processes.
     """
     queryset = Party.objects.all()
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['category', 'process']
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, SearchRankOrderingFilter]
+    filterset_class = PartyFilter
     search_fields = ['name', 'document']
+    search_number_fields = ['document', 'document_normalized']
+    search_index = party_search_index
     ordering_fields = ['name', 'created_at', 'updated_at']
     ordering = ['name']
+    export_fields = [
+        'id', 'process_id', 'name', 'document', 'category',
+        'created_at', 'updated_at'
+    ]
+    export_filename = 'parties'
+    cache_resource = 'parties'
+    conditional_relations = {
+        'list': ['contacts'],
+        'retrieve': ['contacts'],
+    }
+    includes = {
+        'contacts': ('contacts', 'contacts', PartyContactIncludeSerializer),
+    }
+    bulk_derived_fields = ['document_normalized']
+
+    def get_queryset(self):
+        """Prefetch contacts when the current action renders them."""
+        queryset = super().get_queryset()
+        if self.action in self.sparse_fieldset_actions and self.is_field_requested('contacts'):
+            queryset = queryset.prefetch_related('contacts')
+        return queryset
 
     def get_serializer_class(self):
         """Return appropriate serializer class based on action."""
@@ -31,13 +71,26 @@ class PartyViewSet(viewsets.ModelViewSet):
             return PartyCreateUpdateSerializer
         return PartySerializer
 
+    def prepare_bulk_instance(self, instance):
+        """Normalize the document as Party.save() does."""
+        instance.document_normalized = normalize_document(instance.document)
+
+    def bulk_save(self, model, instances, fields=None):
+        """Keep the process statistics counting the saved parties."""
+        if fields is not None:
+            before = Party.objects.filter(pk__in=[instance.pk for instance in instances])
+            process_stats.apply(process_stats.party_counts(before), sign=-1)
+        super().bulk_save(model, instances, fields)
+        after = Party.objects.filter(pk__in=[instance.pk for instance in instances])
+        process_stats.apply(process_stats.party_counts(after))
+
     @action(detail=True, methods=['get'])
     def contacts(self, request, pk=None):
-        """Get all contacts for a specific party."""
-        party = self.get_object()
-        contacts = PartyContact.objects.filter(party=party)
-        serializer = PartyContactSerializer(contacts, many=True)
-        return Response(serializer.data)
+        """List the contacts of a party, as the contact list does."""
+        # The query parameters filter the contacts, not the party.
+        party = get_object_or_404(self.get_queryset(), pk=pk)
+        self.check_object_permissions(request, party)
+        return self.delegate_list(request, PartyContactViewSet, party_id=party.pk)
 
     @action(detail=True, methods=['post'])
     def add_contact(self, request, pk=None):
@@ -53,17 +106,28 @@ class PartyViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PartyContactViewSet(viewsets.ModelViewSet):
+class PartyContactViewSet(
+    FastListMixin, SparseFieldsetMixin, BulkWriteMixin, StreamingExportMixin, NestedListMixin,
+    viewsets.ModelViewSet
+):
     """
     ViewSet for managing party contacts.
     """
     queryset = PartyContact.objects.all()
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['contact_type', 'party', 'is_primary']
+    filterset_class = PartyContactFilter
     search_fields = ['value']
     ordering_fields = ['contact_type', 'is_primary', 'created_at']
     ordering = ['-is_primary', 'contact_type']
+    export_fields = [
+        'id', 'party_id', 'contact_type', 'value', 'is_primary',
+        'created_at', 'updated_at'
+    ]
+    export_filename = 'party_contacts'
+    # Contact writes invalidate the party generations, so cached list counts
+    # follow them.
+    cache_resource = 'parties'
 
     def get_serializer_class(self):
         """Return appropriate serializer class based on action."""
@@ -73,14 +137,10 @@ class PartyContactViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def emails(self, request):
-        """Get all email contacts."""
-        emails = self.get_queryset().filter(contact_type='EMAIL')
-        serializer = self.get_serializer(emails, many=True)
-        return Response(serializer.data)
+        """List email contacts, as the contact list does."""
+        return self.delegate_list(request, PartyContactViewSet, contact_type='EMAIL')
 
     @action(detail=False, methods=['get'])
     def phones(self, request):
-        """Get all phone contacts."""
-        phones = self.get_queryset().filter(contact_type='PHONE')
-        serializer = self.get_serializer(phones, many=True)
-        return Response(serializer.data)
+        """List phone contacts, as the contact list does."""
+        return self.delegate_list(request, PartyContactViewSet, contact_type='PHONE')
@@ -1,30 +1,77 @@
 from django.contrib import admin
+from django.contrib.auth import get_permission_codename
+from core.changelists import CachedAllValuesFieldListFilter, EstimatedCountAdminMixin
+from core.expressions import related_count
+from parties.models import Party, PartyContact
 from .models import Process
+from .purge import ProcessPurger
 
 
 @admin.register(Process)
-class ProcessAdmin(admin.ModelAdmin):
+class ProcessAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     """Admin interface for Process model."""
     list_display = [
-        'process_number', 'process_class', 'judge', 
+        'process_number', 'process_class', 'judge', 'court', 'status',
         'parties_count', 'created_at'
     ]
-    list_filter = ['process_class', 'judge', 'created_at']
+    list_filter = [
+        ('process_class', CachedAllValuesFieldListFilter),
+        ('judge', CachedAllValuesFieldListFilter),
+        ('court', CachedAllValuesFieldListFilter),
+        ('status', CachedAllValuesFieldListFilter),
+        'distributed_on',
+        'created_at',
+    ]
     search_fields = ['process_number', 'subject', 'judge']
     readonly_fields = ['created_at', 'updated_at']
     ordering = ['-created_at']
+    cache_resource = 'processes'
     
     fieldsets = (
         ('Basic Information', {
             'fields': ('process_number', 'process_class', 'subject', 'judge')
         }),
+        ('Details', {
+            'fields': (
+                'court', 'court_division', 'status', 'is_suspended', 'is_digital',
+                'distributed_on', 'claim_value', 'movement_count'
+            )
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(num_parties=related_count(Party, 'process'))
+    
     def parties_count(self, obj):
         """Display parties count."""
         return obj.parties_count
     parties_count.short_description = 'Parties Count'
+    parties_count.admin_order_field = 'num_parties'
+
+    def get_deleted_objects(self, objs, request):
+        """Count the parties and contacts to delete instead of collecting them."""
+        processes = list(objs)
+        deleted = ProcessPurger(dry_run=True).run(
+            Process.objects.filter(pk__in=[process.pk for process in processes])
+        )
+        model_count = {
+            Process._meta.verbose_name_plural: deleted['processes'],
+            Party._meta.verbose_name_plural: deleted['parties'],
+            PartyContact._meta.verbose_name_plural: deleted['contacts'],
+        }
+        perms_needed = set()
+        for model in (Process, Party, PartyContact):
+            opts = model._meta
+            if not request.user.has_perm(f'{opts.app_label}.{get_permission_codename("delete", opts)}'):
+                perms_needed.add(opts.verbose_name)
+        return [str(process) for process in processes], model_count, perms_needed, []
+    
+    def delete_model(self, request, obj):
+        ProcessPurger().delete_chunk([obj.pk])
+    
+    def delete_queryset(self, request, queryset):
+        ProcessPurger().run(queryset)
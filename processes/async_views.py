@@ -0,0 +1,15 @@
+"""
+Async read endpoints for processes.
+"""
+from core.async_views import AsyncReadOnlyView
+from .views import ProcessViewSet
+
+
+class AsyncProcessView(AsyncReadOnlyView):
+    """
+    Async list and retrieve of processes, same payloads as ProcessViewSet.
+
+    The viewset's queryset already annotates parties_count and prefetches
+    the nested parties and contacts that the payload renders.
+    """
+    viewset_class = ProcessViewSet
@@ -0,0 +1,153 @@
+"""
+Bulk import of processes with their parties and contacts.
+
+Items are validated a chunk at a time, checked against existing process
+numbers in any punctuation with one query per chunk, and inserted with
+``bulk_create`` in one transaction per chunk. Model signals do not fire for ``bulk_create``, so
+the search index, the statistics and the response cache are refreshed
+explicitly.
+"""
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+
+from core.caching import bulk_invalidation
+from parties.models import Party, PartyContact, normalize_document
+from parties.search import party_search_index
+from . import stats
+from .models import Process, normalize_process_number, process_number_taken_message
+from .search import process_search_index
+from .serializers import ProcessBulkCreateSerializer
+
+
+def duplicate_number_error():
+    """The error reported for a process number that is already taken."""
+    return {'process_number': [process_number_taken_message()]}
+
+
+class ProcessBulkCreator:
+    """
+    Create processes, with nested parties and contacts, from item dicts.
+
+    Chunks are committed independently: the valid items of a chunk are
+    created even when other items are rejected, and the chunks already
+    committed stay created when a streamed body turns out to be malformed.
+    """
+
+    def __init__(self, chunk_size=None, using='default'):
+        self.chunk_size = chunk_size or settings.BULK_CREATE_CHUNK_SIZE
+        self.using = using
+        self.created_ids = []
+        self.errors = []
+        self.seen_numbers = set()
+
+    def run(self, items):
+        """Import ``items`` and return a summary of what was created."""
+        chunk = []
+        read = 0
+        parse_error = None
+        with bulk_invalidation(using=self.using):
+            try:
+                for item in items:
+                    chunk.append(item)
+                    read += 1
+                    if len(chunk) == self.chunk_size:
+                        self.create_chunk(chunk, read - len(chunk))
+                        chunk = []
+            except ParseError as exc:
+                # Items read before the malformed line are still imported.
+                parse_error = exc
+            self.create_chunk(chunk, read - len(chunk))
+        if parse_error is not None:
+            self.errors.append({'index': read, 'errors': {'non_field_errors': [parse_error.detail]}})
+        return {
+            'created': len(self.created_ids),
+            'ids': self.created_ids,
+            'errors': self.errors,
+        }
+
+    def validate_chunk(self, chunk, offset):
+        """Return ``(index, validated_data)`` pairs for the valid items."""
+        valid = []
+        for position, item in enumerate(chunk):
+            serializer = ProcessBulkCreateSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((offset + position, serializer.validated_data))
+            else:
+                self.errors.append({'index': offset + position, 'errors': serializer.errors})
+        return valid
+
+    @staticmethod
+    def number_key(number):
+        """CNJ numbers are the same number in any punctuation; others only as written."""
+        return normalize_process_number(number) or number
+
+    def reject_duplicates(self, valid):
+        """Drop items whose process number is taken, in the database or earlier in the body."""
+        numbers = [data['process_number'] for _, data in valid]
+        digits = [key for key in map(normalize_process_number, numbers) if key]
+        existing = set()
+        for number, cnj_digits in (
+            Process.objects.using(self.using)
+            .filter(Q(process_number__in=numbers) | Q(cnj_digits__in=digits))
+            .values_list('process_number', 'cnj_digits')
+        ):
+            existing.add(cnj_digits or number)
+        accepted = []
+        for index, data in valid:
+            key = self.number_key(data['process_number'])
+            if key in existing or key in self.seen_numbers:
+                self.errors.append({'index': index, 'errors': duplicate_number_error()})
+                continue
+            self.seen_numbers.add(key)
+            accepted.append((index, data))
+        return accepted
+
+    def create_chunk(self, chunk, offset):
+        if not chunk:
+            return
+        accepted = self.reject_duplicates(self.validate_chunk(chunk, offset))
+        if not accepted:
+            return
+        try:
+            self.insert(accepted)
+        except IntegrityError:
+            # A concurrent writer took some of the numbers since they were
+            # checked: check again and retry once without them.
+            self.seen_numbers.difference_update(self.number_key(data['process_number']) for _, data in accepted)
+            accepted = self.reject_duplicates(accepted)
+            if accepted:
+                self.insert(accepted)
+
+    def insert(self, accepted):
+        processes = []
+        parties = []
+        contacts = []
+        for _, data in accepted:
+            data = dict(data)
+            party_items = data.pop('parties', [])
+            process = Process(**data)
+            process.set_cnj_components()
+            processes.append(process)
+            for party_data in party_items:
+                party_data = dict(party_data)
+                contact_items = party_data.pop('contacts', [])
+                party = Party(
+                    process=process,
+                    document_normalized=normalize_document(party_data['document']),
+                    **party_data
+                )
+                parties.append(party)
+                contacts.extend(PartyContact(party=party, **contact) for contact in contact_items)
+
+        with transaction.atomic(using=self.using):
+            Process.objects.using(self.using).bulk_create(processes)
+            Party.objects.using(self.using).bulk_create(parties)
+            PartyContact.objects.using(self.using).bulk_create(contacts)
+            process_search_index.update([process.pk for process in processes], using=self.using)
+            party_search_index.update([party.pk for party in parties], using=self.using)
+            stats.apply(stats.process_counts(
+                Process.objects.using(self.using).filter(pk__in=[process.pk for process in processes])
+            ), using=self.using)
+        self.created_ids.extend(process.pk for process in processes)
@@ -0,0 +1,34 @@
+"""
+Filter sets for the processes API.
+"""
+import django_filters
+from .models import Process, normalize_process_number
+
+
+class ProcessFilter(django_filters.FilterSet):
+    """
+    Filters for processes.
+
+    ``distributed_on`` takes ``_after``/``_before`` dates and
+    ``claim_value`` takes ``_min``/``_max`` amounts. ``process_number``
+    accepts any punctuation and, like ``year``, ``segment`` and
+    ``tribunal``, is resolved against the indexed ``cnj_*`` columns.
+    """
+    process_number = django_filters.CharFilter(method='filter_process_number')
+    year = django_filters.NumberFilter(field_name='cnj_year')
+    segment = django_filters.NumberFilter(field_name='cnj_segment')
+    tribunal = django_filters.NumberFilter(field_name='cnj_tribunal')
+    created_at = django_filters.IsoDateTimeFromToRangeFilter()
+    updated_at = django_filters.IsoDateTimeFromToRangeFilter()
+    distributed_on = django_filters.DateFromToRangeFilter()
+    claim_value = django_filters.RangeFilter()
+
+    class Meta:
+        model = Process
+        fields = ['process_class', 'judge', 'court', 'court_division', 'status']
+
+    def filter_process_number(self, queryset, name, value):
+        digits = normalize_process_number(value)
+        if digits is None:
+            return queryset.filter(process_number=value)
+        return queryset.filter(cnj_digits=digits)
@@ -4,6 +4,7 @@ Django management command to import legal processes from HTML files.
 import os
 from django.core.management.base import BaseCommand
 from django.conf import settings
+from core.caching import bulk_invalidation
 from processes.scrapers import extract_and_save_process
 
 
@@ -23,14 +24,18 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        if options['file']:
-            self.process_single_file(options['file'])
-        elif options['directory']:
-            self.process_directory(options['directory'])
-        else:
+        if not options['file'] and not options['directory']:
             self.stdout.write(
                 self.style.ERROR('Please provide either --file or --directory argument')
             )
+            return
+
+        # Cached API responses are invalidated once, after the whole import.
+        with bulk_invalidation():
+            if options['file']:
+                self.process_single_file(options['file'])
+            else:
+                self.process_directory(options['directory'])
 
     def process_single_file(self, file_path):
         """Process a single HTML file."""
@@ -0,0 +1,99 @@
+"""
+Django management command to purge processes past their retention period.
+"""
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from processes.models import Process
+from processes.purge import ProcessPurger
+
+
+class Command(BaseCommand):
+    help = 'Delete processes, with their parties and contacts, matching retention criteria'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            metavar='DAYS',
+            help='Purge processes not updated in this many days'
+        )
+        parser.add_argument(
+            '--created-before',
+            type=str,
+            metavar='YYYY-MM-DD',
+            help='Purge processes created before this date'
+        )
+        parser.add_argument(
+            '--process-class',
+            type=str,
+            help='Only purge processes of this class'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Processes deleted per transaction (default: DELETE_CHUNK_SIZE)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report what would be deleted'
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database to purge'
+        )
+
+    def get_queryset(self, options):
+        queryset = Process.objects.all()
+        if options['older_than'] is None and not options['created_before']:
+            raise CommandError('Provide a retention criterion: --older-than and/or --created-before')
+        if options['older_than'] is not None:
+            if options['older_than'] < 0:
+                raise CommandError('--older-than must not be negative')
+            queryset = queryset.filter(
+                updated_at__lt=timezone.now() - timedelta(days=options['older_than'])
+            )
+        if options['created_before']:
+            try:
+                created_before = parse_date(options['created_before'])
+            except ValueError:
+                created_before = None
+            if created_before is None:
+                raise CommandError(f'Invalid date: {options["created_before"]}')
+            queryset = queryset.filter(
+                created_at__lt=timezone.make_aware(datetime.combine(created_before, time.min))
+            )
+        if options['process_class']:
+            queryset = queryset.filter(process_class=options['process_class'])
+        return queryset
+
+    def handle(self, *args, **options):
+        queryset = self.get_queryset(options)
+        if options['chunk_size'] is not None and options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive')
+        dry_run = options['dry_run']
+        verb = 'Would delete' if dry_run else 'Deleted'
+
+        def progress(deleted):
+            self.stdout.write(
+                f'{verb} {deleted["processes"]} processes, '
+                f'{deleted["parties"]} parties, {deleted["contacts"]} contacts so far'
+            )
+
+        purger = ProcessPurger(
+            chunk_size=options['chunk_size'],
+            using=options['database'],
+            dry_run=dry_run,
+        )
+        deleted = purger.run(queryset, progress=progress)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{verb} {deleted["processes"]} processes, '
+                f'{deleted["parties"]} parties and {deleted["contacts"]} contacts'
+            )
+        )
@@ -0,0 +1,27 @@
+"""
+Django management command to rebuild the full-text search indexes.
+"""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+from processes.search import process_search_index
+from parties.search import party_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search indexes of processes and parties'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database to rebuild the indexes on'
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        for name, index in [('processes', process_search_index), ('parties', party_search_index)]:
+            with transaction.atomic(using=using):
+                index.rebuild(using=using)
+            self.stdout.write(
+                self.style.SUCCESS(f'Rebuilt search index for {name}')
+            )
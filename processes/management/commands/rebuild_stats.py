@@ -0,0 +1,23 @@
+"""
+Django management command to rebuild the process statistics summary.
+"""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from processes import stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the process statistics served by /api/stats/'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database to rebuild the statistics on'
+        )
+
+    def handle(self, *args, **options):
+        stats.rebuild(using=options['database'])
+        self.stdout.write(
+            self.style.SUCCESS('Rebuilt process statistics')
+        )
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:59
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from core.search import SearchIndex
+
+# Frozen copy of the index definition at the time of this migration.
+process_search_index = SearchIndex('processes_process', [
+    ('process_number', 'A'),
+    ('subject', 'B'),
+    ('judge', 'C'),
+])
+
+
+def create_search_index(apps, schema_editor):
+    process_search_index.create(schema_editor)
+    process_search_index.rebuild(using=schema_editor.connection.alias)
+
+
+def drop_search_index(apps, schema_editor):
+    process_search_index.drop(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='process',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Search Vector'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0002_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['-created_at'], name='process_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['-updated_at'], name='process_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['process_class', '-created_at'], name='process_class_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['judge', '-created_at'], name='process_judge_created_idx'),
+        ),
+    ]
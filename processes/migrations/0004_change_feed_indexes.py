@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0003_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='process',
+            name='process_updated_idx',
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['updated_at', 'id'], name='process_changes_idx'),
+        ),
+    ]
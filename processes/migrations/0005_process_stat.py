@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:00
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+
+def fill_process_stats(apps, schema_editor):
+    using = schema_editor.connection.alias
+    Process = apps.get_model('processes', 'Process')
+    Party = apps.get_model('parties', 'Party')
+    ProcessStat = apps.get_model('processes', 'ProcessStat')
+    stats = []
+    for row in Process.objects.using(using).annotate(month=TruncMonth('created_at')).values(
+        'process_class', 'judge', 'month'
+    ).annotate(count=Count('pk')).order_by():
+        stats.append(ProcessStat(
+            process_class=row['process_class'], judge=row['judge'],
+            month=row['month'].date(), category='', count=row['count'],
+        ))
+    for row in Party.objects.using(using).annotate(month=TruncMonth('process__created_at')).values(
+        'process__process_class', 'process__judge', 'month', 'category'
+    ).annotate(count=Count('pk')).order_by():
+        stats.append(ProcessStat(
+            process_class=row['process__process_class'], judge=row['process__judge'],
+            month=row['month'].date(), category=row['category'], count=row['count'],
+        ))
+    ProcessStat.objects.using(using).bulk_create(stats, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0004_change_feed_indexes'),
+        ('parties', '0007_change_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('process_class', models.CharField(max_length=100, verbose_name='Process Class')),
+                ('judge', models.CharField(max_length=200, verbose_name='Judge')),
+                ('month', models.DateField(verbose_name='Month')),
+                ('category', models.CharField(blank=True, max_length=20, verbose_name='Party Category')),
+                ('count', models.IntegerField(default=0, verbose_name='Count')),
+            ],
+            options={
+                'verbose_name': 'Process Statistic',
+                'verbose_name_plural': 'Process Statistics',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='processstat',
+            constraint=models.UniqueConstraint(fields=('process_class', 'judge', 'month', 'category'), name='process_stat_key'),
+        ),
+        migrations.RunPython(fill_process_stats, migrations.RunPython.noop),
+    ]
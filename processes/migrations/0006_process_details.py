@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0005_process_stat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='process',
+            name='claim_value',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True, verbose_name='Claim Value'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='court',
+            field=models.CharField(blank=True, max_length=200, verbose_name='Court'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='court_division',
+            field=models.CharField(blank=True, max_length=200, verbose_name='Court Division'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='distributed_on',
+            field=models.DateField(blank=True, null=True, verbose_name='Distributed On'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='is_digital',
+            field=models.BooleanField(default=False, verbose_name='Digital'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='is_suspended',
+            field=models.BooleanField(default=False, verbose_name='Suspended'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='movement_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Movement Count'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='status',
+            field=models.CharField(blank=True, max_length=50, verbose_name='Status'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['court', '-created_at'], name='process_court_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['court_division', '-created_at'], name='process_division_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['status', '-created_at'], name='process_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['distributed_on'], name='process_distributed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['claim_value'], name='process_claim_value_idx'),
+        ),
+    ]
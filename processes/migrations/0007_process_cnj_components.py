@@ -0,0 +1,118 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:11
+
+import re
+
+from django.db import migrations, models
+import processes.models
+
+BACKFILL_CHUNK_SIZE = 2000
+
+COMPONENTS = [
+    # (column, first digit, length)
+    ('cnj_sequence', 1, 7),
+    ('cnj_check_digits', 8, 2),
+    ('cnj_year', 10, 4),
+    ('cnj_segment', 14, 1),
+    ('cnj_tribunal', 15, 2),
+    ('cnj_origin', 17, 4),
+]
+
+
+def backfill_cnj_components(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "UPDATE processes_process SET cnj_digits = digits FROM ("
+            "SELECT id, regexp_replace(process_number, '[^0-9]', '', 'g') AS digits FROM processes_process"
+            ") AS numbers WHERE numbers.id = processes_process.id AND length(numbers.digits) = 20"
+        )
+        schema_editor.execute('UPDATE processes_process SET ' + ', '.join(
+            f'{column} = substr(cnj_digits, {start}, {length})::integer'
+            for column, start, length in COMPONENTS
+        ) + ' WHERE cnj_digits IS NOT NULL')
+        return
+
+    Process = apps.get_model('processes', 'Process')
+    fields = ['cnj_digits'] + [column for column, _, _ in COMPONENTS]
+    batch = []
+    for process in Process.objects.only('id', 'process_number').iterator(chunk_size=BACKFILL_CHUNK_SIZE):
+        digits = re.sub(r'[^\d]', '', process.process_number or '')
+        if len(digits) != 20:
+            continue
+        process.cnj_digits = digits
+        for column, start, length in COMPONENTS:
+            setattr(process, column, int(digits[start - 1:start - 1 + length]))
+        batch.append(process)
+        if len(batch) >= BACKFILL_CHUNK_SIZE:
+            Process.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        Process.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0006_process_details'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='process',
+            name='cnj_check_digits',
+            field=models.PositiveSmallIntegerField(editable=False, null=True, verbose_name='CNJ Check Digits'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='cnj_digits',
+            field=models.CharField(editable=False, max_length=20, null=True, verbose_name='CNJ Digits'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='cnj_origin',
+            field=models.PositiveSmallIntegerField(editable=False, null=True, verbose_name='CNJ Origin'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='cnj_segment',
+            field=models.PositiveSmallIntegerField(editable=False, null=True, verbose_name='CNJ Justice Segment'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='cnj_sequence',
+            field=models.IntegerField(editable=False, null=True, verbose_name='CNJ Sequence'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='cnj_tribunal',
+            field=models.PositiveSmallIntegerField(editable=False, null=True, verbose_name='CNJ Tribunal'),
+        ),
+        migrations.AddField(
+            model_name='process',
+            name='cnj_year',
+            field=models.PositiveSmallIntegerField(editable=False, null=True, verbose_name='CNJ Year'),
+        ),
+        migrations.AlterField(
+            model_name='process',
+            name='process_number',
+            field=models.CharField(max_length=50, unique=True, validators=[processes.models.validate_process_number], verbose_name='Process Number'),
+        ),
+        # Backfill before indexing so the indexes are built once over final values.
+        migrations.RunPython(backfill_cnj_components, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='process',
+            name='cnj_digits',
+            field=models.CharField(db_index=True, editable=False, max_length=20, null=True, verbose_name='CNJ Digits'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['cnj_year', '-created_at'], name='process_cnj_year_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['cnj_tribunal', 'cnj_year'], name='process_cnj_tribunal_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['cnj_segment', 'cnj_tribunal'], name='process_cnj_segment_idx'),
+        ),
+    ]
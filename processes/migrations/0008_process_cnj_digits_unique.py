@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:26
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+COMPONENT_FIELDS = [
+    'cnj_digits', 'cnj_sequence', 'cnj_check_digits', 'cnj_year',
+    'cnj_segment', 'cnj_tribunal', 'cnj_origin',
+]
+
+
+def dedupe_cnj_digits(apps, schema_editor):
+    """
+    Keep the digits on the oldest process of each number stored in several
+    punctuations. The others keep their rows and process_number, out of the
+    digit lookups, until they are merged by hand.
+    """
+    Process = apps.get_model('processes', 'Process')
+    duplicates = (
+        Process.objects.filter(cnj_digits__isnull=False).order_by()
+        .values('cnj_digits').annotate(count=Count('id'), first=Min('id')).filter(count__gt=1)
+    )
+    for row in list(duplicates):
+        Process.objects.filter(cnj_digits=row['cnj_digits']).exclude(pk=row['first']).update(
+            **{field: None for field in COMPONENT_FIELDS}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0007_process_cnj_components'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_cnj_digits, migrations.RunPython.noop),
+        # The unique constraint's index replaces the plain one.
+        migrations.AddConstraint(
+            model_name='process',
+            constraint=models.UniqueConstraint(condition=models.Q(('cnj_digits__isnull', False)), fields=('cnj_digits',), name='process_cnj_digits_unique'),
+        ),
+        migrations.AlterField(
+            model_name='process',
+            name='cnj_digits',
+            field=models.CharField(editable=False, max_length=20, null=True, verbose_name='CNJ Digits'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-19 19:40
+
+from django.db import migrations
+
+from core.changes import ChangeTrigger
+
+# Frozen copy of the trigger definition at the time of this migration.
+process_changes = ChangeTrigger('processes', 'processes_process')
+
+
+def create_change_triggers(apps, schema_editor):
+    process_changes.create(schema_editor)
+    process_changes.backfill(using=schema_editor.connection.alias)
+
+
+def drop_change_triggers(apps, schema_editor):
+    process_changes.drop(schema_editor)
+    Change = apps.get_model('core', 'Change')
+    Change.objects.using(schema_editor.connection.alias).filter(resource='processes').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_change'),
+        ('processes', '0008_process_cnj_digits_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_change_triggers, drop_change_triggers),
+    ]
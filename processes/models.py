@@ -1,7 +1,90 @@
+import re
+
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
 
+def normalize_process_number(value):
+    """
+    Return the 20 digits of a CNJ number, whatever its punctuation, or None
+    when it does not have them.
+    """
+    digits = re.sub(r'[^\d]', '', value or '')
+    return digits if len(digits) == 20 else None
+
+
+def format_process_number(value):
+    """
+    Return a CNJ number as NNNNNNN-DD.AAAA.J.TR.OOOO, whatever its
+    punctuation, or None when it does not have the 20 CNJ digits.
+    """
+    digits = normalize_process_number(value)
+    if digits is None:
+        return None
+    return f'{digits[:7]}-{digits[7:9]}.{digits[9:13]}.{digits[13]}.{digits[14:16]}.{digits[16:]}'
+
+
+def parse_process_number(value):
+    """
+    Split a CNJ number NNNNNNN-DD.AAAA.J.TR.OOOO into its ``sequence``,
+    ``check_digits``, ``year``, ``segment`` (J), ``tribunal`` (TR) and
+    ``origin`` numbers, or return None when it does not have the 20 digits.
+    """
+    digits = normalize_process_number(value)
+    if digits is None:
+        return None
+    return {
+        'sequence': int(digits[:7]),
+        'check_digits': int(digits[7:9]),
+        'year': int(digits[9:13]),
+        'segment': int(digits[13]),
+        'tribunal': int(digits[14:16]),
+        'origin': int(digits[16:]),
+    }
+
+
+def cnj_check_digits(sequence, year, segment, tribunal, origin):
+    """Return the mod-97 check digits (ISO 7064) of a CNJ number's components."""
+    return 98 - int(f'{sequence:07d}{year:04d}{segment:01d}{tribunal:02d}{origin:04d}00') % 97
+
+
+def validate_process_number(value):
+    """
+    Reject process numbers that are not CNJ numbers with matching check
+    digits. Only arithmetic, so it is as cheap per item in a bulk import.
+    """
+    parts = parse_process_number(value)
+    if parts is None:
+        raise ValidationError(
+            'Process number must have the 20 digits of a CNJ number (NNNNNNN-DD.AAAA.J.TR.OOOO).',
+            code='invalid_length'
+        )
+    expected = cnj_check_digits(
+        parts['sequence'], parts['year'], parts['segment'], parts['tribunal'], parts['origin']
+    )
+    if parts['check_digits'] != expected:
+        raise ValidationError(
+            'Process number check digits do not match (expected %(expected)02d).',
+            code='invalid_check_digits',
+            params={'expected': expected}
+        )
+
+
+def process_number_taken_message():
+    """The error for a process number stored already, maybe in other punctuation."""
+    field = Process._meta.get_field('process_number')
+    return field.error_messages['unique'] % {
+        'model_name': Process._meta.verbose_name,
+        'field_label': field.verbose_name,
+    }
+
+
+CNJ_COMPONENTS = ('sequence', 'check_digits', 'year', 'segment', 'tribunal', 'origin')
+CNJ_COMPONENT_FIELDS = ('cnj_digits', *(f'cnj_{name}' for name in CNJ_COMPONENTS))
+
+
 class Process(models.Model):
     """
     Model to store legal process information.
@@ -9,8 +92,48 @@ class Process(models.Model):
     process_number = models.CharField(
         max_length=50,
         unique=True,
+        validators=[validate_process_number],
         verbose_name="Process Number"
     )
+    # Canonical digits and components of process_number, set on save; null
+    # for numbers that are not CNJ numbers. The digits are unique, so one
+    # number cannot be stored twice in different punctuation.
+    cnj_digits = models.CharField(
+        max_length=20,
+        null=True,
+        editable=False,
+        verbose_name="CNJ Digits"
+    )
+    cnj_sequence = models.IntegerField(
+        null=True,
+        editable=False,
+        verbose_name="CNJ Sequence"
+    )
+    cnj_check_digits = models.PositiveSmallIntegerField(
+        null=True,
+        editable=False,
+        verbose_name="CNJ Check Digits"
+    )
+    cnj_year = models.PositiveSmallIntegerField(
+        null=True,
+        editable=False,
+        verbose_name="CNJ Year"
+    )
+    cnj_segment = models.PositiveSmallIntegerField(
+        null=True,
+        editable=False,
+        verbose_name="CNJ Justice Segment"
+    )
+    cnj_tribunal = models.PositiveSmallIntegerField(
+        null=True,
+        editable=False,
+        verbose_name="CNJ Tribunal"
+    )
+    cnj_origin = models.PositiveSmallIntegerField(
+        null=True,
+        editable=False,
+        verbose_name="CNJ Origin"
+    )
     process_class = models.CharField(
         max_length=100,
         verbose_name="Process Class"
@@ -22,6 +145,45 @@ class Process(models.Model):
         max_length=200,
         verbose_name="Judge"
     )
+    court = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name="Court"
+    )
+    court_division = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name="Court Division"
+    )
+    status = models.CharField(
+        max_length=50,
+        blank=True,
+        verbose_name="Status"
+    )
+    is_suspended = models.BooleanField(
+        default=False,
+        verbose_name="Suspended"
+    )
+    is_digital = models.BooleanField(
+        default=False,
+        verbose_name="Digital"
+    )
+    distributed_on = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name="Distributed On"
+    )
+    claim_value = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name="Claim Value"
+    )
+    movement_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Movement Count"
+    )
     created_at = models.DateTimeField(
         default=timezone.now,
         verbose_name="Created At"
@@ -30,16 +192,119 @@ class Process(models.Model):
         auto_now=True,
         verbose_name="Updated At"
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name="Search Vector"
+    )
 
     class Meta:
         verbose_name = "Process"
         verbose_name_plural = "Processes"
         ordering = ['-created_at']
+        indexes = [
+            # Default list ordering, and the filter + ordering paths of the API.
+            models.Index(fields=['-created_at'], name='process_created_idx'),
+            # Keyset scans of the change feed; read backwards for -updated_at.
+            models.Index(fields=['updated_at', 'id'], name='process_changes_idx'),
+            models.Index(fields=['process_class', '-created_at'], name='process_class_created_idx'),
+            models.Index(fields=['judge', '-created_at'], name='process_judge_created_idx'),
+            models.Index(fields=['court', '-created_at'], name='process_court_created_idx'),
+            models.Index(fields=['court_division', '-created_at'], name='process_division_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='process_status_created_idx'),
+            # Range filters and ordering on the page details.
+            models.Index(fields=['distributed_on'], name='process_distributed_idx'),
+            models.Index(fields=['claim_value'], name='process_claim_value_idx'),
+            # Year and court filters on the CNJ number components.
+            models.Index(fields=['cnj_year', '-created_at'], name='process_cnj_year_created_idx'),
+            models.Index(fields=['cnj_tribunal', 'cnj_year'], name='process_cnj_tribunal_idx'),
+            models.Index(fields=['cnj_segment', 'cnj_tribunal'], name='process_cnj_segment_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['cnj_digits'],
+                condition=models.Q(cnj_digits__isnull=False),
+                name='process_cnj_digits_unique'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.process_number} - {self.process_class}"
 
+    def clean_fields(self, exclude=None):
+        # Imported pages are saved as published, check digits included, so
+        # only a new or changed number has to pass validate_process_number.
+        if self.pk and Process.objects.filter(pk=self.pk, process_number=self.process_number).exists():
+            exclude = {*(exclude or ()), 'process_number'}
+        super().clean_fields(exclude=exclude)
+
+    def clean(self):
+        super().clean()
+        digits = normalize_process_number(self.process_number)
+        if digits and Process.objects.filter(cnj_digits=digits).exclude(pk=self.pk).exists():
+            raise ValidationError({'process_number': process_number_taken_message()})
+
+    def save(self, *args, **kwargs):
+        self.set_cnj_components()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'process_number' in update_fields:
+            kwargs['update_fields'] = {*update_fields, *CNJ_COMPONENT_FIELDS}
+        super().save(*args, **kwargs)
+
+    def set_cnj_components(self):
+        """Fill the cnj_* columns from process_number; bulk paths call this themselves."""
+        parts = parse_process_number(self.process_number) or {}
+        self.cnj_digits = normalize_process_number(self.process_number)
+        for name in CNJ_COMPONENTS:
+            setattr(self, f'cnj_{name}', parts.get(name))
+
     @property
     def parties_count(self):
         """Return the number of parties in this process."""
+        if hasattr(self, 'num_parties'):
+            # Annotated by querysets that list many processes at once.
+            return self.num_parties
         return self.parties.count()
+
+
+class ProcessStat(models.Model):
+    """
+    Precomputed counts served by ``/api/stats/`` (see ``processes.stats``).
+
+    One row per process class, judge, month of creation and party category:
+    rows with an empty category count processes, the others count the
+    parties of that category in those processes.
+    """
+    process_class = models.CharField(
+        max_length=100,
+        verbose_name="Process Class"
+    )
+    judge = models.CharField(
+        max_length=200,
+        verbose_name="Judge"
+    )
+    month = models.DateField(
+        verbose_name="Month"
+    )
+    category = models.CharField(
+        max_length=20,
+        blank=True,
+        verbose_name="Party Category"
+    )
+    count = models.IntegerField(
+        default=0,
+        verbose_name="Count"
+    )
+
+    class Meta:
+        verbose_name = "Process Statistic"
+        verbose_name_plural = "Process Statistics"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['process_class', 'judge', 'month', 'category'],
+                name='process_stat_key'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.process_class} / {self.judge} / {self.month:%Y-%m} / {self.category or 'processes'}: {self.count}"
@@ -0,0 +1,97 @@
+"""
+Chunked deletion of processes with their parties and contacts.
+
+``QuerySet.delete()`` runs Django's cascade collector, which loads every
+party and contact of the deleted processes and sends signals row by row.
+Here processes are taken a chunk at a time in primary key order, and each
+chunk is deleted in its own transaction with one ``DELETE ... WHERE id IN``
+per table, children first. Model signals do not fire, so the search index,
+the statistics and the response cache are updated explicitly; the change
+feed is logged by database triggers.
+"""
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.db import transaction
+
+from core import caching
+from parties.models import Party, PartyContact
+from parties.search import party_search_index
+from . import stats
+from .models import Process
+from .search import process_search_index
+
+
+class ProcessPurger:
+    """
+    Delete processes, or with ``dry_run`` only count what would be deleted.
+
+    Totals are kept in ``deleted`` as ``{'processes', 'parties', 'contacts'}``.
+    """
+
+    def __init__(self, chunk_size=None, using='default', dry_run=False):
+        self.chunk_size = chunk_size or settings.DELETE_CHUNK_SIZE
+        self.using = using
+        self.dry_run = dry_run
+        self.deleted = {'processes': 0, 'parties': 0, 'contacts': 0}
+
+    def chunks(self, queryset):
+        """Yield the primary keys of ``queryset`` a chunk at a time."""
+        queryset = queryset.using(self.using).order_by('pk')
+        last = None
+        while True:
+            page = queryset if last is None else queryset.filter(pk__gt=last)
+            pks = list(page.values_list('pk', flat=True)[:self.chunk_size])
+            if not pks:
+                return
+            yield pks
+            last = pks[-1]
+
+    def run(self, queryset, progress=None):
+        """
+        Delete the processes of ``queryset`` and return the totals.
+
+        ``progress`` is called with the running totals after each chunk.
+        Chunks already deleted stay deleted if a later one fails. A dry run
+        changes nothing, so it leaves the response cache alone.
+        """
+        invalidation = nullcontext() if self.dry_run else caching.bulk_invalidation(using=self.using)
+        with invalidation:
+            for pks in self.chunks(queryset):
+                self.delete_chunk(pks)
+                if progress is not None:
+                    progress(dict(self.deleted))
+        return self.deleted
+
+    def delete_chunk(self, pks):
+        """Delete the processes ``pks`` in one transaction, children first."""
+        with transaction.atomic(using=self.using):
+            processes = Process.objects.using(self.using).filter(pk__in=pks)
+            process_ids = list(processes.values_list('pk', flat=True))
+            parties = Party.objects.using(self.using).filter(process_id__in=process_ids)
+            party_ids = list(parties.values_list('pk', flat=True))
+            contacts = PartyContact.objects.using(self.using).filter(party_id__in=party_ids)
+
+            if self.dry_run:
+                contact_count = contacts.count()
+            else:
+                contact_ids = list(contacts.values_list('pk', flat=True))
+                contact_count = len(contact_ids)
+                stats.apply(stats.process_counts(
+                    Process.objects.using(self.using).filter(pk__in=process_ids)
+                ), sign=-1, using=self.using)
+                PartyContact.objects.using(self.using).filter(pk__in=contact_ids)._raw_delete(self.using)
+                Party.objects.using(self.using).filter(pk__in=party_ids)._raw_delete(self.using)
+                Process.objects.using(self.using).filter(pk__in=process_ids)._raw_delete(self.using)
+                self.forget(process_ids, party_ids)
+
+        self.deleted['processes'] += len(process_ids)
+        self.deleted['parties'] += len(party_ids)
+        self.deleted['contacts'] += contact_count
+
+    def forget(self, process_ids, party_ids):
+        """Do what the delete signal receivers would have done for these rows."""
+        party_search_index.remove(party_ids, using=self.using)
+        process_search_index.remove(process_ids, using=self.using)
+        caching.invalidate('parties', party_ids, using=self.using)
+        caching.invalidate('processes', process_ids, using=self.using)
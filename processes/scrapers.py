@@ -2,9 +2,12 @@
 Script to extract legal process data from HTML files.
 """
 import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
 from bs4 import BeautifulSoup
 from django.core.management.base import BaseCommand
-from .models import Process
+from django.core.exceptions import ValidationError
+from .models import Process, normalize_process_number, validate_process_number
 from parties.models import Party, PartyContact
 
 
@@ -110,6 +113,101 @@ class ProcessDataExtractor:
                 return match.group(1).strip()
         return "Não informado"
     
+    def extract_labelled_value(self, label):
+        """
+        Extract the value shown under a ``label`` heading, such as
+        ``Foro:``. Returns None when the label is absent or its value is
+        a ``---`` placeholder.
+        """
+        value = None
+        for heading in self.soup.find_all('h6'):
+            if heading.get_text().strip() == label:
+                element = heading.find_next_sibling()
+                if element:
+                    value = element.get_text().strip()
+                break
+        else:
+            # Fallback to text search
+            match = re.search(rf'{re.escape(label)}[ \t]*([^\n]+)', self.soup.get_text())
+            if match:
+                value = match.group(1).strip()
+        
+        if not value or set(value) == {'-'}:
+            return None
+        return value
+    
+    def extract_court(self):
+        """Extract the court (Foro) from HTML."""
+        return self.extract_labelled_value('Foro:') or ''
+    
+    def extract_court_division(self):
+        """Extract the court division (Vara) from HTML."""
+        return self.extract_labelled_value('Vara:') or ''
+    
+    def extract_distribution_date(self):
+        """Extract the distribution date (Distribuição) from HTML."""
+        value = self.extract_labelled_value('Distribuição:')
+        match = re.search(r'([0-9]{2}/[0-9]{2}/[0-9]{4})', value or '')
+        if not match:
+            return None
+        try:
+            return datetime.strptime(match.group(1), '%d/%m/%Y').date()
+        except ValueError:
+            return None
+    
+    def extract_claim_value(self):
+        """Extract the claim value (Valor da ação) from HTML, as a Decimal."""
+        value = self.extract_labelled_value('Valor da ação:')
+        match = re.search(r'([0-9][0-9.]*(?:,[0-9]{1,2})?)', value or '')
+        if not match:
+            return None
+        try:
+            return Decimal(match.group(1).replace('.', '').replace(',', '.'))
+        except InvalidOperation:
+            return None
+    
+    def extract_badges(self):
+        """
+        Extract the badges of the page header: the status next to the
+        process number, and the flags shown beside it.
+        """
+        status = ''
+        flags = set()
+        for h4 in self.soup.find_all('h4'):
+            for badge in h4.find_all('span', class_='badge'):
+                text = badge.get_text().strip()
+                if re.search(r'[0-9]{7}-[0-9]{2}\.', h4.get_text()):
+                    status = status or text
+                else:
+                    flags.add(text.lower())
+        return {
+            'status': status,
+            'is_suspended': 'suspenso' in flags,
+            'is_digital': 'digital' in flags,
+        }
+    
+    def extract_movement_count(self):
+        """Count the rows of the movements (Movimentações) table."""
+        for h4 in self.soup.find_all('h4'):
+            if h4.get_text().strip() == 'Movimentações':
+                table = h4.find_next('table')
+                if table is None:
+                    return 0
+                body = table.find('tbody') or table
+                return len(body.find_all('tr'))
+        return 0
+    
+    def extract_details(self):
+        """Extract the typed details stored in the Process columns."""
+        return {
+            'court': self.extract_court(),
+            'court_division': self.extract_court_division(),
+            'distributed_on': self.extract_distribution_date(),
+            'claim_value': self.extract_claim_value(),
+            'movement_count': self.extract_movement_count(),
+            **self.extract_badges(),
+        }
+    
     def extract_parties(self):
         """Extract parties information from HTML."""
         parties = []
@@ -203,6 +301,7 @@ class ProcessDataExtractor:
             'process_class': self.extract_process_class(),
             'subject': self.extract_subject(),
             'judge': self.extract_judge(),
+            'details': self.extract_details(),
             'parties': self.extract_parties()
         }
 
@@ -225,13 +324,23 @@ def extract_and_save_process(html_content):
             print("Could not extract process number from HTML")
             return None
         
-        # Check if process already exists
+        # Pages are imported as published; flag numbers the API would reject
+        try:
+            validate_process_number(data['process_number'])
+        except ValidationError as e:
+            print(f"Warning: {data['process_number']}: {' '.join(e.messages)}")
+        
+        # Check if process already exists, in any punctuation
+        digits = normalize_process_number(data['process_number'])
+        lookup = {'cnj_digits': digits} if digits else {'process_number': data['process_number']}
         process, created = Process.objects.get_or_create(
-            process_number=data['process_number'],
+            **lookup,
             defaults={
+                'process_number': data['process_number'],
                 'process_class': data['process_class'],
                 'subject': data['subject'],
-                'judge': data['judge']
+                'judge': data['judge'],
+                **data['details']
             }
         )
         
@@ -239,6 +348,10 @@ def extract_and_save_process(html_content):
             print(f"Created new process: {process.process_number}")
         else:
             print(f"Process already exists: {process.process_number}")
+            # Re-importing a page refreshes its details
+            for field, value in data['details'].items():
+                setattr(process, field, value)
+            process.save(update_fields=[*data['details'], 'updated_at'])
         
         # Create parties
         for party_data in data['parties']:
@@ -0,0 +1,10 @@
+"""
+Full-text search index for processes.
+"""
+from core.search import SearchIndex
+
+process_search_index = SearchIndex('processes_process', [
+    ('process_number', 'A'),
+    ('subject', 'B'),
+    ('judge', 'C'),
+])
@@ -1,6 +1,8 @@
 from rest_framework import serializers
-from .models import Process
+from rest_framework.validators import UniqueValidator
+from .models import Process, normalize_process_number, process_number_taken_message, validate_process_number
 from parties.models import Party, PartyContact
+from parties.serializers import PartyNestedCreateSerializer
 
 
 class PartyContactSerializer(serializers.ModelSerializer):
@@ -33,6 +35,8 @@ class ProcessSerializer(serializers.ModelSerializer):
         model = Process
         fields = [
             'id', 'process_number', 'process_class', 'subject', 'judge',
+            'court', 'court_division', 'status', 'is_suspended', 'is_digital',
+            'distributed_on', 'claim_value', 'movement_count',
             'parties', 'parties_count', 'created_at', 'updated_at'
         ]
 
@@ -45,27 +49,101 @@ class ProcessListSerializer(serializers.ModelSerializer):
         model = Process
         fields = [
             'id', 'process_number', 'process_class', 'subject', 'judge',
+            'court', 'status', 'distributed_on', 'claim_value',
             'parties_count', 'created_at'
         ]
 
 
+class ProcessChangeSerializer(serializers.ModelSerializer):
+    """Serializer for processes in the change feed."""
+    
+    class Meta:
+        model = Process
+        fields = [
+            'id', 'process_number', 'process_class', 'subject', 'judge',
+            'court', 'court_division', 'status', 'is_suspended', 'is_digital',
+            'distributed_on', 'claim_value', 'movement_count',
+            'created_at', 'updated_at'
+        ]
+
+
+class PartyRoleSerializer(serializers.ModelSerializer):
+    """Serializer for the role a party plays in a process."""
+    category_display = serializers.CharField(source='get_category_display', read_only=True)
+    
+    class Meta:
+        model = Party
+        fields = ['id', 'name', 'category', 'category_display']
+
+
+class ProcessByDocumentSerializer(ProcessListSerializer):
+    """Process listing with the roles of the looked-up document in each process."""
+    roles = PartyRoleSerializer(source='matched_parties', many=True, read_only=True)
+    
+    class Meta(ProcessListSerializer.Meta):
+        fields = ProcessListSerializer.Meta.fields + ['roles']
+
+
 class ProcessCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating and updating processes."""
     
     class Meta:
         model = Process
-        fields = ['process_number', 'process_class', 'subject', 'judge']
+        fields = [
+            'process_number', 'process_class', 'subject', 'judge',
+            'court', 'court_division', 'status', 'is_suspended', 'is_digital',
+            'distributed_on', 'claim_value', 'movement_count'
+        ]
+        # Check digits are checked in validate_process_number instead.
+        extra_kwargs = {
+            'process_number': {'validators': [UniqueValidator(queryset=Process.objects.all())]}
+        }
     
     def validate_process_number(self, value):
-        """Validate process number format."""
-        # Basic validation for Brazilian process number format
-        import re
-        # Remove common separators
-        clean_number = re.sub(r'[^\d]', '', value)
-        
-        if len(clean_number) < 10:
-            raise serializers.ValidationError(
-                "Process number must have at least 10 digits."
-            )
+        """
+        Check the digits of a new or changed number, and reject a number
+        stored already for another process, in any punctuation.
         
-        return value 
\ No newline at end of file
+        Imported pages are saved as published, so a process can be updated
+        with its number unchanged even if its check digits do not match.
+        """
+        if self.instance is None or value != self.instance.process_number:
+            validate_process_number(value)
+        digits = normalize_process_number(value)
+        if digits:
+            others = Process.objects.filter(cnj_digits=digits)
+            if self.instance is not None:
+                others = others.exclude(pk=self.instance.pk)
+            if others.exists():
+                raise serializers.ValidationError(process_number_taken_message())
+        return value
+
+
+class ProcessBulkCreateSerializer(ProcessCreateUpdateSerializer):
+    """
+    Serializer for one item of a bulk process import, parties included.
+    
+    Uniqueness of process_number is checked for a whole batch at once by
+    processes.bulk, not with a query per item.
+    """
+    process_number = serializers.CharField(max_length=50, validators=[validate_process_number])
+    parties = PartyNestedCreateSerializer(many=True, required=False)
+    
+    class Meta(ProcessCreateUpdateSerializer.Meta):
+        fields = ProcessCreateUpdateSerializer.Meta.fields + ['parties']
+    
+    def validate_process_number(self, value):
+        # Checked for the whole chunk by ProcessBulkCreator.reject_duplicates.
+        return value
+    
+    def validate_parties(self, value):
+        """Reject parties that would break the (process, name, document) constraint."""
+        seen = set()
+        for party in value:
+            key = (party['name'], party['document'])
+            if key in seen:
+                raise serializers.ValidationError(
+                    f"Duplicate party {party['name']} ({party['document']})."
+                )
+            seen.add(key)
+        return value
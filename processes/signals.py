@@ -0,0 +1,71 @@
+"""
+Signal receivers keeping derived process data in sync.
+"""
+from collections import Counter
+
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core import caching
+
+from . import stats
+from .models import Process
+from .search import process_search_index
+
+
+@receiver(post_save, sender=Process)
+def index_process(sender, instance, raw=False, using='default', **kwargs):
+    """Refresh the search index entry of a saved process."""
+    if raw:
+        return
+    process_search_index.update([instance.pk], using=using)
+
+
+@receiver(post_delete, sender=Process)
+def unindex_process(sender, instance, using='default', **kwargs):
+    """Drop the search index entry of a deleted process."""
+    process_search_index.remove([instance.pk], using=using)
+
+
+@receiver(post_save, sender=Process)
+@receiver(post_delete, sender=Process)
+def invalidate_process_responses(sender, instance, using='default', **kwargs):
+    """Drop cached responses showing a saved or deleted process."""
+    caching.invalidate('processes', [instance.pk], using=using)
+
+
+@receiver(pre_save, sender=Process)
+def remember_previous_stats_key(sender, instance, raw=False, using='default', **kwargs):
+    """Note the summary key a process may be moved away from."""
+    instance._previous_stats_key = None
+    if not raw and instance.pk is not None:
+        instance._previous_stats_key = stats.stored_process_key(instance.pk, using=using)
+
+
+@receiver(post_save, sender=Process)
+def count_process(sender, instance, created, raw=False, using='default', **kwargs):
+    """Count a new process, or move an edited one and its parties to its new key."""
+    if raw:
+        return
+    key = stats.process_key(instance.process_class, instance.judge, instance.created_at)
+    previous = getattr(instance, '_previous_stats_key', None)
+    if previous is None:
+        stats.apply({key + (stats.PROCESSES,): 1}, using=using)
+        return
+    if previous == key:
+        return
+    counts = Counter({previous + (stats.PROCESSES,): -1, key + (stats.PROCESSES,): 1})
+    for category, count in instance.parties.using(using).order_by().values_list('category').annotate(
+        count=Count('pk')
+    ):
+        counts[previous + (category,)] -= count
+        counts[key + (category,)] += count
+    stats.apply(counts, using=using)
+
+
+@receiver(post_delete, sender=Process)
+def uncount_process(sender, instance, using='default', **kwargs):
+    """Stop counting a deleted process; its parties are uncounted as they go."""
+    key = stats.process_key(instance.process_class, instance.judge, instance.created_at)
+    stats.apply({key + (stats.PROCESSES,): -1}, using=using)
@@ -0,0 +1,99 @@
+"""
+Summary counts of processes and parties behind ``/api/stats/``.
+
+``ProcessStat`` holds one count per process class, judge, month of creation
+and party category. It is kept up to date incrementally: signal receivers
+apply the change of a single saved or deleted row, bulk paths apply the
+grouped counts of what they write, and ``rebuild_stats`` recomputes it
+from scratch. Deltas are applied with one ``INSERT ... ON CONFLICT DO
+UPDATE`` statement, supported by both PostgreSQL and SQLite.
+"""
+from collections import Counter
+
+from django.db import connections, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from parties.models import Party
+from .models import Process, ProcessStat
+
+# Category of the rows counting processes rather than parties.
+PROCESSES = ''
+
+# Summary rows written per statement.
+APPLY_CHUNK_SIZE = 500
+
+
+def month_of(value):
+    """First day of the (local) month of the datetime ``value``."""
+    if hasattr(value, 'hour'):
+        value = timezone.localtime(value) if timezone.is_aware(value) else value
+        value = value.date()
+    return value.replace(day=1)
+
+
+def process_key(process_class, judge, created_at):
+    return (process_class, judge, month_of(created_at))
+
+
+def stored_process_key(process_id, using='default'):
+    """Key of a stored process, or None if it does not exist."""
+    row = Process.objects.using(using).filter(pk=process_id).values_list(
+        'process_class', 'judge', 'created_at'
+    ).first()
+    return process_key(*row) if row else None
+
+
+def apply(counts, sign=1, using='default'):
+    """
+    Add ``counts``, mapping ``(class, judge, month, category)`` to a number
+    of rows, to the summary; ``sign=-1`` subtracts them.
+    """
+    rows = [(*key, sign * count) for key, count in counts.items() if count]
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    table = quote_name(ProcessStat._meta.db_table)
+    columns = ', '.join(quote_name(column) for column in ('process_class', 'judge', 'month', 'category'))
+    count = quote_name('count')
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), APPLY_CHUNK_SIZE):
+            chunk = rows[start:start + APPLY_CHUNK_SIZE]
+            params = []
+            for process_class, judge, month, category, delta in chunk:
+                params.extend([process_class, judge, connection.ops.adapt_datefield_value(month), category, delta])
+            placeholders = ', '.join(['(%s, %s, %s, %s, %s)'] * len(chunk))
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}, {count}) VALUES {placeholders} '
+                f'ON CONFLICT ({columns}) DO UPDATE SET {count} = {table}.{count} + excluded.{count}',
+                params,
+            )
+
+
+def process_counts(processes):
+    """Grouped summary counts of the ``processes`` queryset and of their parties."""
+    counts = Counter()
+    for row in processes.order_by().annotate(month=TruncMonth('created_at')).values(
+        'process_class', 'judge', 'month'
+    ).annotate(count=Count('pk')):
+        counts[process_key(row['process_class'], row['judge'], row['month']) + (PROCESSES,)] += row['count']
+    counts.update(party_counts(Party.objects.using(processes.db).filter(process__in=processes.values('pk'))))
+    return counts
+
+
+def party_counts(parties):
+    """Grouped summary counts of the ``parties`` queryset."""
+    counts = Counter()
+    for row in parties.order_by().annotate(month=TruncMonth('process__created_at')).values(
+        'process__process_class', 'process__judge', 'month', 'category'
+    ).annotate(count=Count('pk')):
+        key = process_key(row['process__process_class'], row['process__judge'], row['month'])
+        counts[key + (row['category'],)] += row['count']
+    return counts
+
+
+def rebuild(using='default'):
+    """Recompute the whole summary from the process and party tables."""
+    with transaction.atomic(using=using):
+        ProcessStat.objects.using(using).all().delete()
+        apply(process_counts(Process.objects.using(using).all()), using=using)
@@ -1,14 +1,37 @@
 """
 Tests for processes app.
 """
+import contextlib
+import datetime
+import io
+import json
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
+from django.utils import timezone
+from core import caching
+from core.models import Change
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
-from .models import Process
+from core.testing import FastListAssertionsMixin, QueryPlanAssertionsMixin, filtered_queryset
+from . import stats
+from .models import Process, ProcessStat, cnj_check_digits
+from .views import ProcessViewSet
 from parties.models import Party, PartyContact
 
 
+def cnj_number(sequence, year=2023, segment=1, tribunal=2, origin=1):
+    """Return a formatted CNJ number with valid check digits."""
+    check_digits = cnj_check_digits(sequence, year, segment, tribunal, origin)
+    return f'{sequence:07d}-{check_digits:02d}.{year:04d}.{segment}.{tribunal:02d}.{origin:04d}'
+
+
 class ProcessModelTest(TestCase):
     """Test cases for Process model."""
     
@@ -63,7 +86,7 @@ class ProcessAPITest(APITestCase):
         self.client.force_authenticate(user=self.user)
         
         self.process_data = {
-            'process_number': '1234567-89.2023.1.02.0001',
+            'process_number': cnj_number(1234567),
             'process_class': 'Execução de Título Extrajudicial',
             'subject': 'Cobrança de dívida',
             'judge': 'Dr. João Silva'
@@ -125,8 +148,27 @@ class ProcessAPITest(APITestCase):
         
         response = self.client.get(f'/api/processes/{process.id}/parties/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['name'], party.name)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['name'], party.name)
+    
+    def test_process_parties_endpoint_filters_parties(self):
+        """Test party filters apply to the parties, not to the process."""
+        process = Process.objects.create(**self.process_data)
+        Party.objects.create(process=process, name='João da Silva', document='12345678901', category='EXEQUENTE')
+        Party.objects.create(process=process, name='Maria Santos', document='98765432100', category='EXECUTADA')
+        
+        for params, names in [
+            ({'search': 'maria'}, ['Maria Santos']),
+            ({'category': 'EXEQUENTE'}, ['João da Silva']),
+            ({'document': '999'}, []),
+        ]:
+            with self.subTest(**params):
+                response = self.client.get(f'/api/processes/{process.id}/parties/', params)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual([party['name'] for party in response.data['results']], names)
+        
+        response = self.client.get(f'/api/processes/{process.id + 1}/parties/', {'search': 'joao'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
     
     def test_export_excel_endpoint(self):
         """Test exporting processes to Excel."""
@@ -138,6 +180,1139 @@ class ProcessAPITest(APITestCase):
             response['Content-Type'],
             'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
         )
+    
+    def test_export_csv_endpoint(self):
+        """Test streaming processes as CSV."""
+        Process.objects.create(**self.process_data)
+        
+        response = self.client.get('/api/processes/export_csv/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(lines[0].split(',')[:2], ['id', 'process_number'])
+        self.assertEqual(len(lines), 2)
+        self.assertIn(self.process_data['process_number'], lines[1])
+    
+    def test_export_ndjson_respects_filters(self):
+        """Test NDJSON export applies the list filters."""
+        import json
+        Process.objects.create(**self.process_data)
+        Process.objects.create(
+            process_number='7654321-00.2022.8.26.0100',
+            process_class='Procedimento Comum',
+            subject='Outro assunto',
+            judge='Dra. Ana Souza'
+        )
+        
+        response = self.client.get(
+            '/api/processes/export_ndjson/', {'judge': 'Dra. Ana Souza'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).decode('utf-8').splitlines()
+        ]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['process_number'], '7654321-00.2022.8.26.0100')
+    
+    def test_export_csv_gzip(self):
+        """Test CSV export is compressed when the client accepts gzip."""
+        import gzip
+        Process.objects.create(**self.process_data)
+        
+        response = self.client.get(
+            '/api/processes/export_csv/', HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        content = gzip.decompress(b''.join(response.streaming_content)).decode('utf-8')
+        self.assertIn(self.process_data['process_number'], content)
+    
+    def test_export_csv_gzip_refused(self):
+        """Test CSV export is not compressed when gzip is refused with q=0."""
+        Process.objects.create(**self.process_data)
+        
+        for accept_encoding in ('gzip;q=0, deflate', '*;q=0', 'br, *;q=1, gzip; q=0.0'):
+            response = self.client.get(
+                '/api/processes/export_csv/', HTTP_ACCEPT_ENCODING=accept_encoding
+            )
+            self.assertNotIn('Content-Encoding', response)
+            content = b''.join(response.streaming_content).decode('utf-8')
+            self.assertIn(self.process_data['process_number'], content)
+
+    
+    def test_processes_by_document(self):
+        """Test cross-process lookup by party document."""
+        first = Process.objects.create(**self.process_data)
+        second = Process.objects.create(
+            process_number='7654321-00.2022.8.26.0100',
+            process_class='Procedimento Comum',
+            subject='Outro assunto',
+            judge='Dra. Ana Souza'
+        )
+        other = Process.objects.create(
+            process_number='1111111-11.2021.8.26.0100',
+            process_class='Procedimento Comum',
+            subject='Sem relação',
+            judge='Dra. Ana Souza'
+        )
+        Party.objects.create(
+            process=first, name='Maria Santos',
+            document='564.406.360-73', category='EXECUTADA'
+        )
+        Party.objects.create(
+            process=first, name='Banco S.A.',
+            document='10.261.482/0001-97', category='EXEQUENTE'
+        )
+        Party.objects.create(
+            process=second, name='Maria Santos',
+            document='56440636073', category='AUTOR'
+        )
+        Party.objects.create(
+            process=other, name='João da Silva',
+            document='12345678901', category='REU'
+        )
+        
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/processes/by-document/564.406.360-73/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        
+        results = {item['process_number']: item for item in response.data['results']}
+        self.assertEqual(set(results), {first.process_number, second.process_number})
+        self.assertEqual(results[first.process_number]['parties_count'], 2)
+        self.assertEqual(
+            [role['category'] for role in results[first.process_number]['roles']],
+            ['EXECUTADA']
+        )
+        self.assertEqual(
+            results[second.process_number]['roles'][0]['category_display'], 'Autor'
+        )
+    
+    def test_processes_by_document_without_digits(self):
+        """Test a document without digits is rejected rather than matching undocumented parties."""
+        process = Process.objects.create(**self.process_data)
+        Party.objects.create(process=process, name='Sem Documento', document='', category='REU')
+        
+        response = self.client.get('/api/processes/by-document/---/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('document', response.data)
+    
+    def test_async_list_matches_sync_list(self):
+        """Test the async list endpoint returns the same payload."""
+        process = Process.objects.create(**self.process_data)
+        Party.objects.create(
+            process=process, name='João da Silva',
+            document='12345678901', category='EXEQUENTE'
+        )
+        
+        sync_response = self.client.get('/api/processes/', {'judge': 'Dr. João Silva'})
+        async_response = self.client.get('/api/async/processes/', {'judge': 'Dr. João Silva'})
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json(), sync_response.json())
+    
+    def test_async_detail_matches_sync_detail(self):
+        """Test the async detail endpoint returns the same payload."""
+        process = Process.objects.create(**self.process_data)
+        party = Party.objects.create(
+            process=process, name='João da Silva',
+            document='12345678901', category='EXEQUENTE'
+        )
+        PartyContact.objects.create(party=party, contact_type='EMAIL', value='joao@example.com')
+        
+        sync_response = self.client.get(f'/api/processes/{process.id}/')
+        async_response = self.client.get(f'/api/async/processes/{process.id}/')
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json(), sync_response.json())
+        
+        response = self.client.get('/api/async/processes/999999/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_sparse_fieldset_prunes_payload_and_columns(self):
+        """Test ?fields= limits both the payload and the selected columns."""
+        Process.objects.create(**self.process_data)
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/processes/', {'fields': 'id,process_number,created_at'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(response.data['results'][0]),
+            ['id', 'process_number', 'created_at']
+        )
+        page_query = queries.captured_queries[-1]['sql']
+        self.assertIn('process_number', page_query)
+        self.assertNotIn('subject', page_query)
+        self.assertNotIn('parties_party', page_query)
+    
+    def test_omit_skips_nested_prefetch(self):
+        """Test ?omit= on the detail skips the parties and contacts prefetch."""
+        process = Process.objects.create(**self.process_data)
+        Party.objects.create(
+            process=process,
+            name='João da Silva',
+            document='12345678901',
+            category='EXEQUENTE'
+        )
+        
+        with CaptureQueriesContext(connection) as full:
+            self.client.get(f'/api/processes/{process.id}/')
+        with CaptureQueriesContext(connection) as sparse:
+            response = self.client.get(f'/api/processes/{process.id}/', {'omit': 'parties,subject'})
+        self.assertNotIn('parties', response.data)
+        self.assertNotIn('subject', response.data)
+        self.assertEqual(response.data['parties_count'], 1)
+        self.assertEqual(len(full) - len(sparse), 2)  # parties and contacts prefetches
+    
+    def test_list_counts_parties_without_extra_queries(self):
+        """Test parties_count does not cost a query per listed process."""
+        for number in range(3):
+            process = Process.objects.create(process_number=f'000000{number}-89.2023.1.02.0001')
+            Party.objects.create(process=process, name='Parte', document='12345678901', category='AUTOR')
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/processes/')
+        self.assertEqual([row['parties_count'] for row in response.data['results']], [1, 1, 1])
+        self.assertEqual(len(queries), 3)  # validators, count, page
+    
+    def test_unknown_sparse_field_rejected(self):
+        """Test unknown field names are reported instead of ignored."""
+        response = self.client.get('/api/processes/', {'fields': 'id,secret'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', response.data)
+    
+    def test_async_endpoints_require_authentication(self):
+        """Test the async endpoints enforce the viewset permissions."""
+        self.client.force_authenticate(user=None)
+        response = self.client.get('/api/async/processes/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ProcessConditionalGetTest(APITestCase):
+    """Test cases for ETag/Last-Modified validators on processes."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        
+        self.process = Process.objects.create(
+            process_number='1234567-89.2023.1.02.0001',
+            process_class='Execução de Título Extrajudicial',
+            subject='Cobrança de dívida',
+            judge='Dr. João Silva'
+        )
+        self.party = Party.objects.create(
+            process=self.process,
+            name='João da Silva',
+            document='12345678901',
+            category='EXEQUENTE'
+        )
+    
+    def test_list_not_modified(self):
+        """Test a matching If-None-Match gets a 304 from one aggregate query."""
+        response = self.client.get('/api/processes/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+        etag = response['ETag']
+        
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/processes/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+    
+    def test_if_modified_since(self):
+        """Test If-Modified-Since at the Last-Modified date gets a 304."""
+        response = self.client.get(f'/api/processes/{self.process.id}/')
+        response = self.client.get(
+            f'/api/processes/{self.process.id}/',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_etag_depends_on_query(self):
+        """Test different filters and pages get different validators."""
+        etag = self.client.get('/api/processes/')['ETag']
+        self.assertNotEqual(self.client.get('/api/processes/?judge=Other')['ETag'], etag)
+        self.assertNotEqual(self.client.get('/api/processes/?search=dívida')['ETag'], etag)
+    
+    def test_party_changes_change_validators(self):
+        """Test nested party and contact changes produce new validators."""
+        list_etag = self.client.get('/api/processes/')['ETag']
+        detail_etag = self.client.get(f'/api/processes/{self.process.id}/')['ETag']
+        
+        contact = PartyContact.objects.create(party=self.party, contact_type='EMAIL', value='joao@example.com')
+        self.assertEqual(self.client.get('/api/processes/')['ETag'], list_etag)
+        response = self.client.get(f'/api/processes/{self.process.id}/', HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        detail_etag = response['ETag']
+        
+        contact.delete()
+        response = self.client.get(f'/api/processes/{self.process.id}/', HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.party.delete()
+        response = self.client.get('/api/processes/', HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['parties_count'], 0)
+    
+    def test_missing_process_not_found(self):
+        """Test validators are not produced for unknown ids."""
+        response = self.client.get('/api/processes/999/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response)
+
+
+class ProcessFastListTest(FastListAssertionsMixin, APITestCase):
+    """Test cases for the row-based process list."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        
+        for number in range(25):
+            process = Process.objects.create(
+                process_number=f'{number:07d}-89.2023.1.02.0001',
+                process_class='Execução de Título Extrajudicial',
+                subject='Cobrança de dívida\u2028"citação" <São Paulo>' if number % 2 else '',
+                judge='Dr. João Silva'
+            )
+            for index in range(number % 3):
+                Party.objects.create(
+                    process=process,
+                    name=f'Parte {index}',
+                    document='12345678901',
+                    category='EXEQUENTE'
+                )
+    
+    def test_list_matches_serializer_output(self):
+        """Test the fast path renders byte-identical pages."""
+        self.assertListMatchesSerializer(ProcessViewSet, '/api/processes/')
+        self.assertListMatchesSerializer(ProcessViewSet, '/api/processes/', {'page': 2})
+        self.assertListMatchesSerializer(ProcessViewSet, '/api/processes/', {'ordering': 'process_number'})
+        self.assertListMatchesSerializer(ProcessViewSet, '/api/processes/', {'search': 'dívida'})
+        self.assertListMatchesSerializer(ProcessViewSet, '/api/processes/', {'fields': 'id,parties_count'})
+        self.assertListMatchesSerializer(ProcessViewSet, '/api/processes/', {'omit': 'subject'})
+    
+    def test_list_does_not_build_instances(self):
+        """Test the page is read with values() in a fixed number of queries."""
+        with self.assertNumQueries(3):  # validators, count, page
+            response = self.client.get('/api/processes/')
+        self.assertEqual(len(response.data['results']), 20)
+
+
+class ProcessBulkCreateTest(APITestCase):
+    """Test cases for bulk process creation."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        
+        Process.objects.create(
+            process_number=cnj_number(1),
+            process_class='Procedimento Comum',
+            subject='Existente',
+            judge='Dr. João Silva'
+        )
+    
+    def make_item(self, number, **extra):
+        item = {
+            'process_number': cnj_number(number),
+            'process_class': 'Execução de Título Extrajudicial',
+            'subject': 'Cobrança de dívida',
+            'judge': 'Dr. João Silva',
+        }
+        item.update(extra)
+        return item
+    
+    def test_creates_nested_parties_and_contacts(self):
+        """Test processes are created with their parties and contacts."""
+        items = [
+            self.make_item(10, parties=[{
+                'name': 'João da Silva',
+                'document': '123.456.789-01',
+                'category': 'EXEQUENTE',
+                'contacts': [{'contact_type': 'EMAIL', 'value': 'joao@example.com', 'is_primary': True}],
+            }]),
+            self.make_item(11),
+        ]
+        response = self.client.post('/api/processes/bulk_create/', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        
+        process = Process.objects.get(pk=response.data['ids'][0])
+        party = process.parties.get()
+        self.assertEqual(party.document_normalized, '12345678901')
+        self.assertEqual(party.contacts.get().value, 'joao@example.com')
+        
+        response = self.client.get('/api/parties/', {'search': 'joao'})
+        self.assertEqual(len(response.data['results']), 1)
+    
+    def test_reports_invalid_and_duplicate_items(self):
+        """Test rejected items are reported by index and the rest created."""
+        items = [
+            self.make_item(1),
+            self.make_item(20),
+            self.make_item(20),
+            self.make_item(21, process_number='123'),
+            self.make_item(22),
+        ]
+        response = self.client.post('/api/processes/bulk_create/', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(
+            sorted(error['index'] for error in response.data['errors']), [0, 2, 3]
+        )
+        self.assertEqual(Process.objects.count(), 3)
+    
+    def test_checks_existing_numbers_once_per_chunk(self):
+        """Test the query count does not grow with the number of items."""
+        with self.settings(BULK_CREATE_CHUNK_SIZE=50):
+            items = [self.make_item(number) for number in range(100, 150)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post('/api/processes/bulk_create/', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        lookups = [query for query in queries if 'SELECT "processes_process"."process_number"' in query['sql']]
+        self.assertEqual(len(lookups), 1)
+        self.assertLess(len(queries), 15)
+    
+    def test_ndjson_body_in_chunks(self):
+        """Test a streamed NDJSON body is imported chunk by chunk."""
+        lines = '\n'.join(json.dumps(self.make_item(number)) for number in range(200, 205))
+        with self.settings(BULK_CREATE_CHUNK_SIZE=2):
+            response = self.client.post(
+                '/api/processes/bulk_create/', lines, content_type='application/x-ndjson'
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 5)
+    
+    def test_malformed_ndjson_keeps_earlier_items(self):
+        """Test items before a malformed line are created and the error reported."""
+        lines = json.dumps(self.make_item(300)) + '\n{not json\n' + json.dumps(self.make_item(301))
+        response = self.client.post(
+            '/api/processes/bulk_create/', lines, content_type='application/x-ndjson'
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['index'], 1)
+        self.assertIn('line 2', str(response.data['errors'][0]['errors']))
+    
+    def test_rejects_non_list_body(self):
+        """Test a single object is not accepted as a batch."""
+        response = self.client.post('/api/processes/bulk_create/', self.make_item(400), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ProcessBatchLookupTest(APITestCase):
+    """Test cases for looking up processes by CNJ number in batches."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        
+        self.processes = []
+        for number in range(5):
+            process = Process.objects.create(
+                process_number=f'{number:07d}-89.2023.1.02.0001',
+                process_class='Procedimento Comum',
+                subject='Test',
+                judge='Test'
+            )
+            party = Party.objects.create(
+                process=process, name='Parte', document='12345678901', category='AUTOR'
+            )
+            PartyContact.objects.create(party=party, contact_type='EMAIL', value='parte@example.com')
+            self.processes.append(process)
+    
+    def test_get_returns_input_order_and_missing(self):
+        """Test found processes follow the input order and the rest are listed as missing."""
+        numbers = ['0000003-89.2023.1.02.0001', '9999999-99.2023.1.02.0001', '0000001-89.2023.1.02.0001']
+        response = self.client.get('/api/processes/batch/', {'numbers': ','.join(numbers)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['id'] for item in response.data['results']],
+            [self.processes[3].id, self.processes[1].id]
+        )
+        self.assertEqual(response.data['missing'], ['9999999-99.2023.1.02.0001'])
+        self.assertEqual(response.data['results'][0]['parties'][0]['contacts'][0]['value'], 'parte@example.com')
+    
+    def test_post_normalizes_formatting(self):
+        """Test numbers match whatever their punctuation."""
+        response = self.client.post(
+            '/api/processes/batch/',
+            {'numbers': ['00000028920231020001', ' 0000004 89 2023 1 02 0001 ']},
+            format='json'
+        )
+        self.assertEqual(
+            [item['id'] for item in response.data['results']],
+            [self.processes[2].id, self.processes[4].id]
+        )
+        self.assertEqual(response.data['missing'], [])
+    
+    def test_constant_number_of_queries(self):
+        """Test a batch is served by the process, party and contact queries."""
+        numbers = [process.process_number for process in self.processes]
+        with self.assertNumQueries(3):
+            response = self.client.post('/api/processes/batch/', {'numbers': numbers}, format='json')
+        self.assertEqual(len(response.data['results']), 5)
+    
+    def test_rejects_oversized_batch(self):
+        """Test batches beyond the size limit are rejected."""
+        numbers = [f'{number:020d}' for number in range(ProcessViewSet.batch_max_size + 1)]
+        response = self.client.post('/api/processes/batch/', {'numbers': numbers}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ProcessStatsTest(APITestCase):
+    """Test cases for the statistics endpoint and its summary table."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        
+        self.processes = []
+        for number, (process_class, judge, month) in enumerate([
+            ('Procedimento Comum', 'Dr. João Silva', 1),
+            ('Procedimento Comum', 'Dra. Maria Santos', 1),
+            ('Execução Fiscal', 'Dr. João Silva', 2),
+        ]):
+            process = Process.objects.create(
+                process_number=f'{number:07d}-89.2023.1.02.0001',
+                process_class=process_class,
+                subject='Test',
+                judge=judge,
+                created_at=timezone.make_aware(datetime.datetime(2023, month, 15))
+            )
+            Party.objects.create(process=process, name='Autor', document='12345678901', category='AUTOR')
+            Party.objects.create(process=process, name='Réu', document='12345678000190', category='REU')
+            self.processes.append(process)
+    
+    def summary(self):
+        return set(ProcessStat.objects.exclude(count=0).values_list(
+            'process_class', 'judge', 'month', 'category', 'count'
+        ))
+    
+    def assertSummaryConsistent(self):
+        """Assert the incrementally maintained summary matches a rebuild."""
+        incremental = self.summary()
+        stats.rebuild()
+        self.assertEqual(incremental, self.summary())
+    
+    def test_distributions_from_summary(self):
+        """Test the distributions are read from the summary table."""
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['source'], 'summary')
+        self.assertEqual(response.data['processes'], 3)
+        self.assertEqual(response.data['parties'], 6)
+        self.assertEqual(response.data['by_process_class'], [
+            {'process_class': 'Procedimento Comum', 'count': 2},
+            {'process_class': 'Execução Fiscal', 'count': 1},
+        ])
+        self.assertEqual(response.data['by_judge'][0], {'judge': 'Dr. João Silva', 'count': 2})
+        self.assertEqual(response.data['by_month'], [
+            {'month': '2023-01', 'count': 2},
+            {'month': '2023-02', 'count': 1},
+        ])
+        self.assertEqual(response.data['parties_by_category'], [
+            {'category': 'AUTOR', 'category_display': 'Autor', 'count': 3},
+            {'category': 'REU', 'category_display': 'Réu', 'count': 3},
+        ])
+    
+    def test_filters_match_live_counts(self):
+        """Test summary-backed and live filters give the same answer."""
+        response = self.client.get('/api/stats/', {'judge': 'Dr. João Silva'})
+        self.assertEqual(response.data['source'], 'summary')
+        self.assertEqual(response.data['processes'], 2)
+        self.assertEqual(response.data['parties'], 4)
+        
+        live = self.client.get('/api/stats/', {
+            'judge': 'Dr. João Silva', 'created_at_after': '2023-01-01T00:00:00Z'
+        })
+        self.assertEqual(live.data['source'], 'live')
+        self.assertEqual({**live.data, 'source': 'summary'}, response.data)
+        
+        response = self.client.get('/api/stats/', {'created_at_after': '2023-02-01T00:00:00Z'})
+        self.assertEqual(response.data['by_month'], [{'month': '2023-02', 'count': 1}])
+        
+        response = self.client.get('/api/stats/', {'created_at_after': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_search_counts_match_the_list(self):
+        """Test a searched distribution counts exactly the processes the list returns."""
+        self.processes[1].subject = 'Cobrança de aluguel'
+        self.processes[1].save()
+        for search in ('cobranca', 'joao', '0000002', '89.2023', 'inexistente'):
+            with self.subTest(search=search):
+                listed = self.client.get('/api/processes/', {'search': search}).data['count']
+                response = self.client.get('/api/stats/', {'search': search})
+                self.assertEqual(response.data['source'], 'live')
+                self.assertEqual(response.data['processes'], listed)
+    
+    def test_summary_follows_saves_and_deletes(self):
+        """Test edits, moves and deletes keep the summary in sync."""
+        process = self.processes[0]
+        process.judge = 'Dra. Maria Santos'
+        process.save()
+        party = process.parties.get(category='REU')
+        party.category = 'TERCEIRO'
+        party.save()
+        other = self.processes[1].parties.get(category='AUTOR')
+        other.process = self.processes[2]
+        other.name = 'Outro Autor'
+        other.save()
+        self.processes[1].parties.get(category='REU').delete()
+        self.processes[2].delete()
+        self.assertSummaryConsistent()
+    
+    def test_summary_follows_bulk_writes(self):
+        """Test bulk creates, bulk updates and purges keep the summary in sync."""
+        response = self.client.post('/api/processes/bulk_create/', [{
+            'process_number': cnj_number(9),
+            'process_class': 'Execução Fiscal',
+            'subject': 'Test',
+            'judge': 'Dr. Pedro Lima',
+            'parties': [{'name': 'Fazenda', 'document': '12345678000190', 'category': 'EXEQUENTE'}],
+        }], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        
+        party = self.processes[0].parties.get(category='AUTOR')
+        response = self.client.patch('/api/parties/bulk/', [
+            {'id': party.id, 'name': 'Terceiro', 'category': 'TERCEIRO', 'process': self.processes[1].id},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        response = self.client.post('/api/processes/bulk_delete/', {'ids': [self.processes[2].id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertSummaryConsistent()
+        
+        response = self.client.get('/api/stats/', {'judge': 'Dr. Pedro Lima'})
+        self.assertEqual(response.data['parties_by_category'][0]['category'], 'EXEQUENTE')
+    
+    def test_rebuild_command(self):
+        """Test the rebuild command restores a lost summary."""
+        expected = self.summary()
+        ProcessStat.objects.all().delete()
+        out = io.StringIO()
+        call_command('rebuild_stats', stdout=out)
+        self.assertIn('Rebuilt process statistics', out.getvalue())
+        self.assertEqual(self.summary(), expected)
+
+
+class ProcessAdminTest(TestCase):
+    """Test cases for the process admin changelist."""
+    
+    def setUp(self):
+        """Set up test data."""
+        caching.get_cache().clear()
+        self.user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123'
+        )
+        self.client.force_login(self.user)
+    
+    def tearDown(self):
+        caching.get_cache().clear()
+    
+    def create_processes(self, count, start=0):
+        for number in range(start, start + count):
+            process = Process.objects.create(
+                process_number=f'{number:07d}-89.2023.1.02.0001',
+                process_class='Procedimento Comum',
+                subject='Test',
+                judge=f'Juiz {number}'
+            )
+            Party.objects.create(process=process, name='Parte', document='12345678901', category='AUTOR')
+    
+    def changelist_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/admin/processes/process/')
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries)
+    
+    def test_queries_do_not_grow_with_rows(self):
+        """Test party counts are annotated instead of queried per row."""
+        self.create_processes(2)
+        self.changelist_queries()
+        few = self.changelist_queries()
+        self.create_processes(10, start=2)
+        self.assertEqual(self.changelist_queries(), few)
+    
+    def test_filter_choices_are_cached(self):
+        """Test the distinct process classes, judges, courts and statuses are read once."""
+        self.create_processes(3)
+        first = self.changelist_queries()
+        self.assertEqual(self.changelist_queries(), first - 4)
+        response = self.client.get('/admin/processes/process/')
+        self.assertContains(response, 'Juiz 2')
+    
+    def test_party_form_picks_process_by_id(self):
+        """Test the party form does not list every process."""
+        self.create_processes(3)
+        response = self.client.get('/admin/parties/party/add/')
+        self.assertContains(response, 'vForeignKeyRawIdAdminField')
+        self.assertNotContains(response, '0000002-89.2023.1.02.0001')
+
+
+class ProcessPurgeTest(APITestCase):
+    """Test cases for chunked process deletion."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        
+        self.processes = [self.create_process(number, parties=number + 1) for number in range(4)]
+    
+    def create_process(self, number, parties=1):
+        process = Process.objects.create(
+            process_number=f'{number:07d}-89.2023.1.02.0001',
+            process_class='Procedimento Comum',
+            subject='Cobrança',
+            judge='Test'
+        )
+        for index in range(parties):
+            party = Party.objects.create(
+                process=process, name=f'Parte {index}', document='12345678901', category='AUTOR'
+            )
+            PartyContact.objects.create(party=party, contact_type='EMAIL', value='parte@example.com')
+        return process
+    
+    def test_destroy_deletes_children_and_leaves_tombstones(self):
+        """Test deleting a process removes its parties and contacts, leaving tombstones."""
+        process = self.processes[1]
+        party_ids = list(process.parties.values_list('id', flat=True))
+        response = self.client.delete(f'/api/processes/{process.id}/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Process.objects.filter(id=process.id).exists())
+        self.assertFalse(Party.objects.filter(id__in=party_ids).exists())
+        self.assertFalse(PartyContact.objects.filter(party_id__in=party_ids).exists())
+        deleted = Change.objects.filter(action=Change.DELETED)
+        self.assertEqual(
+            deleted.filter(resource='processes').get().object_id, process.id
+        )
+        self.assertEqual(
+            set(deleted.filter(resource='parties').values_list('object_id', flat=True)),
+            set(party_ids)
+        )
+        self.assertEqual(deleted.filter(resource='contacts').count(), 2)
+        
+        response = self.client.get('/api/processes/', {'search': 'cobrança'})
+        self.assertEqual(response.data['count'], 3)
+    
+    def test_queries_do_not_grow_with_children(self):
+        """Test a chunk is deleted in the same number of queries however many children it has."""
+        with CaptureQueriesContext(connection) as small:
+            self.client.delete(f'/api/processes/{self.processes[0].id}/')
+        with CaptureQueriesContext(connection) as large:
+            self.client.delete(f'/api/processes/{self.processes[3].id}/')
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+    
+    def test_bulk_delete(self):
+        """Test bulk delete reports counts and missing ids."""
+        ids = [self.processes[0].id, self.processes[2].id, 999999]
+        response = self.client.post('/api/processes/bulk_delete/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['deleted'], {'processes': 2, 'parties': 4, 'contacts': 4})
+        self.assertEqual(response.data['missing'], [999999])
+        self.assertEqual(Process.objects.count(), 2)
+        self.assertEqual(Party.objects.count(), 6)
+    
+    def test_bulk_delete_dry_run(self):
+        """Test a dry run counts without deleting."""
+        ids = [process.id for process in self.processes]
+        response = self.client.post('/api/processes/bulk_delete/?dry_run=true', {'ids': ids}, format='json')
+        self.assertEqual(response.data['deleted'], {'processes': 4, 'parties': 10, 'contacts': 10})
+        self.assertTrue(response.data['dry_run'])
+        self.assertEqual(Process.objects.count(), 4)
+        self.assertFalse(Change.objects.filter(action=Change.DELETED).exists())
+    
+    def test_bulk_delete_rejects_invalid_ids(self):
+        """Test bulk delete requires a list of integer ids."""
+        for data in ({'ids': 'all'}, {'ids': ['1']}, [1, 2]):
+            with self.subTest(data=data):
+                response = self.client.post('/api/processes/bulk_delete/', data, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_purge_command_applies_retention_in_chunks(self):
+        """Test the purge command deletes stale processes a chunk at a time."""
+        stale = timezone.now() - datetime.timedelta(days=400)
+        Process.objects.filter(id__in=[self.processes[0].id, self.processes[1].id]).update(updated_at=stale)
+        
+        out = io.StringIO()
+        call_command('purge_processes', '--older-than', '365', '--dry-run', '--chunk-size', '1', stdout=out)
+        self.assertEqual(Process.objects.count(), 4)
+        self.assertIn('Would delete 2 processes, 3 parties and 3 contacts', out.getvalue())
+        
+        out = io.StringIO()
+        call_command('purge_processes', '--older-than', '365', '--chunk-size', '1', stdout=out)
+        self.assertEqual(out.getvalue().count('so far'), 2)
+        self.assertIn('Deleted 2 processes, 3 parties and 3 contacts', out.getvalue())
+        self.assertEqual(
+            set(Process.objects.values_list('id', flat=True)),
+            {self.processes[2].id, self.processes[3].id}
+        )
+    
+    def test_purge_command_requires_criteria(self):
+        """Test the purge command refuses to run without a retention criterion."""
+        with self.assertRaises(CommandError):
+            call_command('purge_processes', stdout=io.StringIO())
+        with self.assertRaises(CommandError):
+            call_command('purge_processes', '--created-before', '2023-02-30', stdout=io.StringIO())
+        self.assertEqual(Process.objects.count(), 4)
+
+
+class ChangeFeedTest(APITestCase):
+    """Test cases for the incremental change feed."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        
+        self.process = Process.objects.create(
+            process_number='0000001-89.2023.1.02.0001',
+            process_class='Procedimento Comum',
+            subject='Test',
+            judge='Test'
+        )
+        self.party = Party.objects.create(
+            process=self.process, name='Parte', document='12345678901', category='AUTOR'
+        )
+        self.contact = PartyContact.objects.create(
+            party=self.party, contact_type='EMAIL', value='parte@example.com'
+        )
+    
+    def changes(self, response):
+        return [(item['resource'], item['id'], item['action']) for item in response.data['results']]
+    
+    def test_initial_sync_lists_every_row(self):
+        """Test a feed without cursor lists every row as created, in change order."""
+        response = self.client.get('/api/changes/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.changes(response), [
+            ('processes', self.process.id, 'created'),
+            ('parties', self.party.id, 'created'),
+            ('contacts', self.contact.id, 'created'),
+        ])
+        self.assertEqual(response.data['results'][0]['data']['process_number'], self.process.process_number)
+        self.assertEqual(response.data['results'][2]['data']['party'], self.party.id)
+        self.assertFalse(response.data['has_more'])
+    
+    def test_cursor_returns_later_changes_only(self):
+        """Test updates and deletes after the cursor, with deleted rows carrying no data."""
+        cursor = self.client.get('/api/changes/').data['cursor']
+        
+        response = self.client.get('/api/changes/', {'since': cursor})
+        self.assertEqual(response.data['results'], [])
+        self.assertEqual(response.data['cursor'], cursor)
+        
+        self.process.subject = 'Updated'
+        self.process.save()
+        party_id, contact_id = self.party.id, self.contact.id
+        self.party.delete()
+        new_process = Process.objects.create(
+            process_number='0000002-89.2023.1.02.0001',
+            process_class='Procedimento Comum',
+            subject='Test',
+            judge='Test'
+        )
+        response = self.client.get('/api/changes/', {'since': cursor})
+        self.assertEqual(sorted(self.changes(response)), sorted([
+            ('processes', self.process.id, 'updated'),
+            ('processes', new_process.id, 'created'),
+            ('parties', party_id, 'deleted'),
+            ('contacts', contact_id, 'deleted'),
+        ]))
+        deleted = [item for item in response.data['results'] if item['action'] == 'deleted']
+        self.assertEqual([item['data'] for item in deleted], [None, None])
+    
+    def test_batches_cover_every_change_once(self):
+        """Test following the cursor in small batches yields each change once."""
+        for number in range(2, 6):
+            Process.objects.create(
+                process_number=f'{number:07d}-89.2023.1.02.0001',
+                process_class='Procedimento Comum',
+                subject='Test',
+                judge='Test'
+            )
+        contact_id = self.contact.id
+        self.contact.delete()
+        
+        seen = []
+        cursor = None
+        for _ in range(10):
+            params = {'limit': 2}
+            if cursor:
+                params['since'] = cursor
+            response = self.client.get('/api/changes/', params)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(self.changes(response))
+            cursor = response.data['cursor']
+            if not response.data['has_more']:
+                break
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+        self.assertEqual(seen[-1], ('contacts', contact_id, 'deleted'))
+    
+    def test_constant_number_of_queries(self):
+        """Test a batch costs one query for the log plus one per source."""
+        with self.assertNumQueries(4):
+            self.client.get('/api/changes/')
+    
+    def test_changes_follow_the_log_not_save_times(self):
+        """Test a change stamped before the cursor, as by a late commit, is still listed."""
+        cursor = self.client.get('/api/changes/').data['cursor']
+        
+        stamped = self.process.updated_at - datetime.timedelta(hours=1)
+        Process.objects.filter(pk=self.process.pk).update(subject='Late', updated_at=stamped)
+        response = self.client.get('/api/changes/', {'since': cursor})
+        self.assertEqual(self.changes(response), [('processes', self.process.id, 'updated')])
+        self.assertEqual(response.data['results'][0]['data']['subject'], 'Late')
+    
+    def test_row_changed_twice_appears_once(self):
+        """Test a row created and updated after the cursor is listed once, as created."""
+        cursor = self.client.get('/api/changes/').data['cursor']
+        process = Process.objects.create(
+            process_number='0000002-89.2023.1.02.0001',
+            process_class='Procedimento Comum',
+            subject='Test',
+            judge='Test'
+        )
+        process.subject = 'Updated'
+        process.save()
+        self.party.name = 'Outra Parte'
+        self.party.save()
+        
+        response = self.client.get('/api/changes/', {'since': cursor, 'limit': 1})
+        self.assertEqual(self.changes(response), [('processes', process.id, 'created')])
+        response = self.client.get('/api/changes/', {'since': response.data['cursor']})
+        self.assertEqual(self.changes(response), [('parties', self.party.id, 'updated')])
+        self.assertEqual(Change.objects.filter(resource='processes', object_id=process.id).count(), 1)
+    
+    def test_rejects_invalid_parameters(self):
+        """Test malformed cursors and batch sizes are rejected."""
+        for params in ({'since': 'not-a-cursor'}, {'limit': 0}, {'limit': 'all'}):
+            with self.subTest(**params):
+                response = self.client.get('/api/changes/', params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ProcessIncludeTest(APITestCase):
+    """Test cases for compound documents with ?include=."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        
+        for number in range(3):
+            process = Process.objects.create(
+                process_number=f'{number:07d}-89.2023.1.02.0001',
+                process_class='Procedimento Comum',
+                subject='Test',
+                judge='Test'
+            )
+            for index in range(2):
+                party = Party.objects.create(
+                    process=process, name=f'Parte {index}', document='12345678901', category='AUTOR'
+                )
+                PartyContact.objects.create(party=party, contact_type='EMAIL', value=f'parte{index}@example.com')
+        self.process = process
+    
+    def test_list_includes_parties_and_contacts(self):
+        """Test nested includes are resolved with one query per path."""
+        with CaptureQueriesContext(connection) as plain:
+            self.client.get('/api/processes/', {'ordering': 'process_number'})
+        with CaptureQueriesContext(connection) as compound:
+            response = self.client.get(
+                '/api/processes/', {'ordering': 'process_number', 'include': 'parties.contacts'}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(compound), len(plain) + 2)
+        
+        included = response.data['included']
+        self.assertEqual(len(included['parties']), 6)
+        self.assertEqual(len(included['contacts']), 6)
+        process_ids = {item['id'] for item in response.data['results']}
+        self.assertEqual({party['process'] for party in included['parties']}, process_ids)
+        party_ids = {party['id'] for party in included['parties']}
+        self.assertEqual({contact['party'] for contact in included['contacts']}, party_ids)
+    
+    def test_retrieve_includes_parties(self):
+        """Test a detail response carries its included parties."""
+        response = self.client.get(
+            f'/api/processes/{self.process.id}/', {'include': 'parties', 'omit': 'parties'}
+        )
+        self.assertNotIn('parties', response.data)
+        self.assertEqual(
+            [party['name'] for party in response.data['included']['parties']], ['Parte 0', 'Parte 1']
+        )
+        self.assertNotIn('contacts', response.data['included'])
+    
+    def test_included_contacts_change_etag(self):
+        """Test the ETag follows the rows of every included path."""
+        url = f'/api/processes/{self.process.id}/'
+        params = {'include': 'parties.contacts'}
+        etag = self.client.get(url, params)['ETag']
+        
+        PartyContact.objects.filter(party__process=self.process).first().save()
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+    
+    def test_unknown_include_rejected(self):
+        """Test unknown include paths are a validation error."""
+        response = self.client.get('/api/processes/', {'include': 'judges'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/processes/', {'include': 'parties', 'fields': 'subject'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ProcessSearchTest(APITestCase):
+    """Test cases for full-text search on processes."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        
+        self.debt = Process.objects.create(
+            process_number='1234567-89.2023.1.02.0001',
+            process_class='Execução de Título Extrajudicial',
+            subject='Cobrança de dívida',
+            judge='Dr. João Silva'
+        )
+        self.eviction = Process.objects.create(
+            process_number='7654321-00.2022.8.26.0100',
+            process_class='Procedimento Comum',
+            subject='Despejo por falta de pagamento',
+            judge='Dra. Ana Cobrança'
+        )
+    
+    def test_search_subject(self):
+        """Test searching processes by subject words."""
+        response = self.client.get('/api/processes/', {'search': 'despejo pagamento'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        numbers = [item['process_number'] for item in response.data['results']]
+        self.assertEqual(numbers, [self.eviction.process_number])
+    
+    def test_search_ranks_by_field_weight(self):
+        """Test matches on subject rank above matches on judge."""
+        response = self.client.get('/api/processes/', {'search': 'cobranca'})
+        numbers = [item['process_number'] for item in response.data['results']]
+        self.assertEqual(numbers, [self.debt.process_number, self.eviction.process_number])
+    
+    def test_explicit_ordering_overrides_rank(self):
+        """Test an explicit ordering parameter wins over relevance."""
+        response = self.client.get(
+            '/api/processes/', {'search': 'cobranca', 'ordering': 'process_number'}
+        )
+        numbers = [item['process_number'] for item in response.data['results']]
+        self.assertEqual(numbers, sorted(numbers))
+    
+    def test_search_partial_process_number(self):
+        """Test number-like terms match anywhere in the process number."""
+        for term in ('4567-89', '4567', '456789', '2023.1.02'):
+            response = self.client.get('/api/processes/', {'search': term})
+            numbers = [item['process_number'] for item in response.data['results']]
+            self.assertEqual(numbers, [self.debt.process_number], term)
+        
+        response = self.client.get('/api/processes/', {'search': '99999'})
+        self.assertEqual(response.data['results'], [])
+    
+    def test_index_follows_updates_and_deletes(self):
+        """Test the index is refreshed on save and cleaned up on delete."""
+        self.debt.subject = 'Indenização por danos morais'
+        self.debt.save()
+        
+        response = self.client.get('/api/processes/', {'search': 'danos'})
+        self.assertEqual(len(response.data['results']), 1)
+        response = self.client.get('/api/processes/', {'search': 'divida'})
+        self.assertEqual(len(response.data['results']), 0)
+        
+        self.debt.delete()
+        response = self.client.get('/api/processes/', {'search': 'danos'})
+        self.assertEqual(len(response.data['results']), 0)
+
+
+class ProcessQueryPlanTest(QueryPlanAssertionsMixin, TestCase):
+    """Test every filter/ordering path of the process list is index-backed."""
+    
+    FILTERS = [
+        {},
+        {'process_class': 'Procedimento Comum'},
+        {'judge': 'Dr. João Silva'},
+        {'court': 'Foro Central Cível'},
+        {'court_division': '1ª Vara Cível'},
+        {'status': 'Ativo'},
+        {'distributed_on_after': '2020-01-01', 'distributed_on_before': '2020-12-31'},
+        {'claim_value_min': '1000', 'claim_value_max': '5000'},
+        {'process_number': '12345670720231020001'},
+        {'year': '2016'},
+        {'tribunal': '0'},
+        {'year': '2016', 'tribunal': '0'},
+        {'segment': '8', 'tribunal': '26'},
+    ]
+    ORDERINGS = [
+        None, 'created_at', '-created_at', 'updated_at', '-updated_at', 'process_number',
+        'distributed_on', '-claim_value',
+    ]
+    
+    def test_filter_and_ordering_paths_use_indexes(self):
+        """Test EXPLAIN shows an index for each filter/ordering combination."""
+        for filters in self.FILTERS:
+            for ordering in self.ORDERINGS:
+                params = dict(filters)
+                if ordering:
+                    params['ordering'] = ordering
+                with self.subTest(**params):
+                    queryset = filtered_queryset(ProcessViewSet, params)
+                    self.assertUsesIndex(queryset, 'processes_process')
 
 
 class ProcessValidationTest(TestCase):
@@ -201,3 +1376,317 @@ class ProcessScraperTest(TestCase):
         self.assertEqual(exequente['document'], '123.456.789-01')
         self.assertEqual(executada['name'], 'Maria Santos')
         self.assertEqual(executada['document'], '12.345.678/0001-90')
+    
+    def read_page(self, name):
+        return (settings.BASE_DIR / name).read_text(encoding='utf-8')
+    
+    def test_extract_process_details(self):
+        """Test extracting court, dates, value, badges and movements from a page."""
+        from .scrapers import ProcessDataExtractor
+        
+        details = ProcessDataExtractor(self.read_page('processo-01.html')).extract_details()
+        
+        self.assertEqual(details, {
+            'court': 'Foro Regional VIII - Tatuapé',
+            'court_division': '4ª Vara Cível',
+            'distributed_on': datetime.date(2016, 3, 23),
+            'claim_value': Decimal('5911.72'),
+            'movement_count': 20,
+            'status': 'Ativo',
+            'is_suspended': True,
+            'is_digital': True,
+        })
+        
+        details = ProcessDataExtractor(self.read_page('processo-02.html')).extract_details()
+        self.assertEqual(details['status'], '')
+        self.assertEqual(details['claim_value'], Decimal('51336.07'))
+    
+    def test_missing_details_are_empty(self):
+        """Test pages without details, or with placeholders, leave them empty."""
+        from .scrapers import ProcessDataExtractor
+        
+        extractor = ProcessDataExtractor("""
+        <div><h6>Foro:</h6><span>---</span></div>
+        <div><h6>Distribuição:</h6><div>31/02/2020</div></div>
+        """)
+        details = extractor.extract_details()
+        
+        self.assertEqual(details['court'], '')
+        self.assertIsNone(details['distributed_on'])
+        self.assertIsNone(details['claim_value'])
+        self.assertEqual(details['movement_count'], 0)
+        self.assertFalse(details['is_digital'])
+    
+    def test_import_stores_and_refreshes_details(self):
+        """Test importing a page stores its details, and re-importing refreshes them."""
+        from .scrapers import extract_and_save_process
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            process = extract_and_save_process(self.read_page('processo-01.html'))
+        process.refresh_from_db()
+        self.assertEqual(process.court, 'Foro Regional VIII - Tatuapé')
+        self.assertEqual(process.distributed_on, datetime.date(2016, 3, 23))
+        self.assertEqual(process.claim_value, Decimal('5911.72'))
+        self.assertEqual(process.movement_count, 20)
+        
+        Process.objects.filter(pk=process.pk).update(court='', movement_count=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            extract_and_save_process(self.read_page('processo-01.html'))
+        process.refresh_from_db()
+        self.assertEqual(process.court, 'Foro Regional VIII - Tatuapé')
+        self.assertEqual(process.movement_count, 20)
+
+    
+    def test_import_command(self):
+        """Test the import_processes command imports a page file."""
+        out = io.StringIO()
+        with contextlib.redirect_stdout(io.StringIO()):
+            call_command('import_processes', file=str(settings.BASE_DIR / 'processo-01.html'), stdout=out)
+        
+        self.assertIn('Successfully processed', out.getvalue())
+        process = Process.objects.get()
+        self.assertEqual(process.process_number, '1004030-81.2016.0.00.0008')
+        self.assertEqual(process.parties.count(), 2)
+        
+        out = io.StringIO()
+        call_command('import_processes', stdout=out)
+        self.assertIn('Please provide either --file or --directory', out.getvalue())
+
+
+
+class ProcessDetailFilterTest(APITestCase):
+    """Test cases for filtering processes on their page details."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.tatuape = Process.objects.create(
+            process_number='1004030-81.2016.0.00.0008',
+            process_class='Execução de Título Extrajudicial',
+            subject='Locação de Imóvel',
+            judge='Mariana',
+            court='Foro Regional VIII - Tatuapé',
+            court_division='4ª Vara Cível',
+            status='Ativo',
+            distributed_on=datetime.date(2016, 3, 23),
+            claim_value=Decimal('5911.72')
+        )
+        self.mogi = Process.objects.create(
+            process_number='1007944-79.2020.0.00.0361',
+            process_class='Busca e Apreensão em Alienação Fiduciária',
+            subject='Alienação Fiduciária',
+            judge='Mariana',
+            court='Foro de Mogi das Cruzes',
+            court_division='2ª Vara Cível',
+            distributed_on=datetime.date(2020, 6, 22),
+            claim_value=Decimal('51336.07')
+        )
+    
+    def get_numbers(self, params):
+        response = self.client.get('/api/processes/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [process['process_number'] for process in response.data['results']]
+    
+    def test_exact_filters(self):
+        """Test court, court division and status filters."""
+        self.assertEqual(self.get_numbers({'court': 'Foro de Mogi das Cruzes'}), [self.mogi.process_number])
+        self.assertEqual(self.get_numbers({'court_division': '4ª Vara Cível'}), [self.tatuape.process_number])
+        self.assertEqual(self.get_numbers({'status': 'Ativo'}), [self.tatuape.process_number])
+    
+    def test_range_filters(self):
+        """Test distribution date and claim value ranges."""
+        self.assertEqual(
+            self.get_numbers({'distributed_on_after': '2020-01-01'}), [self.mogi.process_number]
+        )
+        self.assertEqual(
+            self.get_numbers({'distributed_on_before': '2016-03-23'}), [self.tatuape.process_number]
+        )
+        self.assertEqual(
+            self.get_numbers({'claim_value_min': '10000', 'claim_value_max': '60000'}),
+            [self.mogi.process_number]
+        )
+        self.assertEqual(
+            self.get_numbers({'claim_value_max': '5911.72', 'ordering': '-claim_value'}),
+            [self.tatuape.process_number]
+        )
+    
+    def test_details_are_serialized(self):
+        """Test the details appear in list and detail responses."""
+        response = self.client.get('/api/processes/', {'court': 'Foro de Mogi das Cruzes'})
+        result = response.data['results'][0]
+        self.assertEqual(result['distributed_on'], '2020-06-22')
+        self.assertEqual(result['claim_value'], '51336.07')
+        
+        response = self.client.get(f'/api/processes/{self.tatuape.id}/')
+        self.assertEqual(response.data['court_division'], '4ª Vara Cível')
+        self.assertEqual(response.data['movement_count'], 0)
+
+
+class ProcessNumberTest(APITestCase):
+    """Test cases for CNJ number validation, components and lookups."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.tatuape = Process.objects.create(
+            process_number='1004030-81.2016.0.00.0008',
+            process_class='Execução de Título Extrajudicial',
+            subject='Locação de Imóvel',
+            judge='Mariana'
+        )
+        self.sao_paulo = Process.objects.create(
+            process_number=cnj_number(7654321, year=2016, segment=8, tribunal=26, origin=100),
+            process_class='Procedimento Comum',
+            subject='Cobrança',
+            judge='Dr. João Silva'
+        )
+    
+    def test_check_digits(self):
+        """Test the mod-97 check digits of known CNJ numbers."""
+        from .models import validate_process_number
+        
+        # ISO 7064: the digits, check digits moved to the end, are 1 modulo 97.
+        self.assertEqual(int('0000001' '2013' '8' '26' '0100' '25') % 97, 1)
+        validate_process_number('0000001-25.2013.8.26.0100')
+        validate_process_number('00000012520138260100')
+        with self.assertRaises(DjangoValidationError):
+            validate_process_number('0000001-26.2013.8.26.0100')
+        with self.assertRaises(DjangoValidationError):
+            validate_process_number('0000001-33.2013')
+    
+    def test_api_rejects_invalid_numbers(self):
+        """Test numbers without matching check digits are rejected on create and bulk create."""
+        data = {
+            'process_number': '1234567-89.2023.1.02.0001',
+            'process_class': 'Procedimento Comum',
+            'subject': 'Test',
+            'judge': 'Test'
+        }
+        response = self.client.post('/api/processes/', data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('expected 07', str(response.data['process_number'][0]))
+        
+        response = self.client.post('/api/processes/bulk_create/', [data], format='json')
+        self.assertEqual(response.data['created'], 0)
+        self.assertIn('process_number', response.data['errors'][0]['errors'])
+    
+    def test_imported_numbers_can_be_resubmitted(self):
+        """Test imported numbers with wrong check digits are kept, and only changes to them are checked."""
+        from .scrapers import extract_and_save_process
+        
+        html = (settings.BASE_DIR / 'processo-02.html').read_text(encoding='utf-8')
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            process = extract_and_save_process(html)
+        self.assertEqual(process.process_number, '1007944-79.2020.0.00.0361')
+        self.assertIn('expected 17', out.getvalue())
+        
+        data = {
+            'process_number': process.process_number,
+            'process_class': process.process_class,
+            'subject': process.subject,
+            'judge': 'Dr. João Silva'
+        }
+        response = self.client.put(f'/api/processes/{process.id}/', data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        process.refresh_from_db()
+        self.assertEqual(process.judge, 'Dr. João Silva')
+        process.full_clean()
+        
+        response = self.client.put(
+            f'/api/processes/{process.id}/', dict(data, process_number='1007944-78.2020.0.00.0361')
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('expected 17', str(response.data['process_number'][0]))
+        process.process_number = '1007944-78.2020.0.00.0361'
+        with self.assertRaises(DjangoValidationError):
+            process.full_clean()
+    
+    def test_components_follow_the_number(self):
+        """Test the cnj_* columns are set on save, also with update_fields."""
+        self.assertEqual(self.tatuape.cnj_digits, '10040308120160000008')
+        self.assertEqual(
+            (self.tatuape.cnj_sequence, self.tatuape.cnj_check_digits, self.tatuape.cnj_year,
+             self.tatuape.cnj_segment, self.tatuape.cnj_tribunal, self.tatuape.cnj_origin),
+            (1004030, 81, 2016, 0, 0, 8)
+        )
+        
+        self.tatuape.process_number = cnj_number(1004030, year=2017)
+        self.tatuape.save(update_fields=['process_number'])
+        self.tatuape.refresh_from_db()
+        self.assertEqual(self.tatuape.cnj_year, 2017)
+        
+        other = Process.objects.create(process_number='LEGADO-42')
+        self.assertIsNone(other.cnj_digits)
+        self.assertIsNone(other.cnj_year)
+    
+    def test_filters_use_components(self):
+        """Test ?year=, ?tribunal= and ?process_number= in any punctuation."""
+        def numbers(params):
+            response = self.client.get('/api/processes/', params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return [item['process_number'] for item in response.data['results']]
+        
+        self.assertEqual(numbers({'year': 2016, 'tribunal': '00'}), [self.tatuape.process_number])
+        self.assertEqual(numbers({'segment': 8, 'tribunal': 26}), [self.sao_paulo.process_number])
+        self.assertEqual(numbers({'year': 2015}), [])
+        self.assertEqual(
+            numbers({'process_number': '10040308120160000008'}), [self.tatuape.process_number]
+        )
+        self.assertEqual(
+            numbers({'process_number': '1004030 81 2016 0 00 0008'}), [self.tatuape.process_number]
+        )
+    
+    def test_numbers_are_unique_in_any_punctuation(self):
+        """Test create, bulk create and import all see a number stored in other punctuation."""
+        data = {
+            'process_number': '0000001-25.2013.8.26.0100',
+            'process_class': 'Procedimento Comum',
+            'subject': 'Test',
+            'judge': 'Test'
+        }
+        response = self.client.post('/api/processes/', data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        first = Process.objects.get(process_number=data['process_number'])
+        
+        response = self.client.post('/api/processes/', dict(data, process_number='00000012520138260100'))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('process_number', response.data)
+        
+        response = self.client.patch(f'/api/processes/{first.id}/', {'process_number': '0000001 25 2013 8 26 0100'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        response = self.client.post('/api/processes/bulk_create/', [
+            dict(data, process_number='0000001.25.2013.8.26.0100'),
+            dict(data, process_number=cnj_number(2)),
+            dict(data, process_number=cnj_number(2).replace('-', '')),
+        ], format='json')
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([error['index'] for error in response.data['errors']], [0, 2])
+        
+        from .scrapers import extract_and_save_process
+        html = (settings.BASE_DIR / 'processo-01.html').read_text(encoding='utf-8')
+        with contextlib.redirect_stdout(io.StringIO()):
+            process = extract_and_save_process(html.replace('1004030-81.2016.0.00.0008', '10040308120160000008'))
+        self.assertEqual(process, self.tatuape)
+        self.assertEqual(Process.objects.filter(cnj_digits='10040308120160000008').count(), 1)
+    
+    def test_batch_matches_any_punctuation(self):
+        """Test batch lookups match stored numbers through their digits."""
+        response = self.client.get('/api/processes/batch/', {'numbers': '10040308120160000008,LEGADO-42'})
+        self.assertEqual(
+            [item['id'] for item in response.data['results']], [self.tatuape.id]
+        )
+        self.assertEqual(response.data['missing'], ['LEGADO-42'])
+        
+        Process.objects.create(process_number='LEGADO-42')
+        response = self.client.get('/api/processes/batch/', {'numbers': 'LEGADO-42'})
+        self.assertEqual(response.data['missing'], [])
@@ -1,10 +1,15 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ProcessViewSet
+from .async_views import AsyncProcessView
+from .views import ChangeView, ProcessViewSet, StatsView
 
 router = DefaultRouter()
 router.register(r'processes', ProcessViewSet)
 
 urlpatterns = [
+    path('api/changes/', ChangeView.as_view()),
+    path('api/stats/', StatsView.as_view()),
+    path('api/async/processes/', AsyncProcessView.as_view()),
+    path('api/async/processes/<int:pk>/', AsyncProcessView.as_view()),
     path('api/', include(router.urls)),
 ] 
\ No newline at end of file
@@ -1,33 +1,99 @@
+from collections.abc import Iterator
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
-from .models import Process
+from core.caching import ResponseCacheMixin
+from core.changes import ChangeFeedView, ChangeSource
+from core.conditional import ConditionalGetMixin
+from core.exports import StreamingExportMixin
+from core.expressions import related_count
+from core.fieldsets import SparseFieldsetMixin
+from core.includes import IncludeMixin
+from core.nested import NestedListMixin
+from core.parsers import NDJSONParser
+from core.rows import FastListMixin
+from core.search import FullTextSearchFilter, SearchRankOrderingFilter
+from . import stats
+from .bulk import ProcessBulkCreator
+from .filters import ProcessFilter
+from .models import Process, ProcessStat, normalize_process_number
+from .purge import ProcessPurger
+from .search import process_search_index
 from .serializers import (
     ProcessSerializer,
     ProcessListSerializer,
-    ProcessCreateUpdateSerializer
+    ProcessByDocumentSerializer,
+    ProcessCreateUpdateSerializer,
+    ProcessChangeSerializer
 )
-from parties.models import Party
-from parties.serializers import PartySerializer
+from parties.models import Party, PartyContact, normalize_document
+from parties.serializers import PartyContactIncludeSerializer, PartyIncludeSerializer
+from parties.views import PartyViewSet
 import openpyxl
+from django.db.models import Count, Prefetch, Q, Sum
+from django.db.models.functions import TruncMonth
 from django.http import HttpResponse
 from django.utils import timezone
 
 
-class ProcessViewSet(viewsets.ModelViewSet):
+class ProcessViewSet(
+    IncludeMixin, ConditionalGetMixin, ResponseCacheMixin, FastListMixin, SparseFieldsetMixin,
+    StreamingExportMixin, NestedListMixin, viewsets.ModelViewSet
+):
     """
     ViewSet for managing legal processes.
     """
     queryset = Process.objects.all()
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['process_class', 'judge']
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, SearchRankOrderingFilter]
+    filterset_class = ProcessFilter
     search_fields = ['process_number', 'subject', 'judge']
-    ordering_fields = ['process_number', 'created_at', 'updated_at']
+    search_number_fields = ['process_number', 'cnj_digits']
+    search_index = process_search_index
+    ordering_fields = ['process_number', 'distributed_on', 'claim_value', 'created_at', 'updated_at']
     ordering = ['-created_at']
+    export_fields = [
+        'id', 'process_number', 'process_class', 'subject', 'judge',
+        'court', 'court_division', 'status', 'is_suspended', 'is_digital',
+        'distributed_on', 'claim_value', 'movement_count',
+        'created_at', 'updated_at'
+    ]
+    export_filename = 'processes'
+    cache_resource = 'processes'
+    conditional_relations = {
+        'list': ['parties'],
+        'retrieve': ['parties', 'parties__contacts'],
+    }
+    sparse_fieldset_actions = ('list', 'retrieve', 'by_document', 'batch')
+    # parties_count reads the num_parties annotation added by get_queryset().
+    field_dependencies = {'parties_count': []}
+    row_columns = {'parties_count': 'num_parties'}
+    includes = {
+        'parties': ('parties', 'parties', PartyIncludeSerializer),
+        'parties.contacts': ('parties__contacts', 'contacts', PartyContactIncludeSerializer),
+    }
+    # Most process numbers accepted by one batch lookup.
+    batch_max_size = 1000
+    # Most process ids accepted by one bulk delete.
+    bulk_delete_max_size = 10000
+
+    def get_queryset(self):
+        """Load what the current action renders, and nothing else."""
+        queryset = super().get_queryset()
+        if self.action not in self.sparse_fieldset_actions:
+            return queryset
+        if self.is_field_requested('parties_count'):
+            queryset = queryset.annotate(num_parties=related_count(Party, 'process'))
+        if self.action in ('retrieve', 'batch') and self.is_field_requested('parties'):
+            queryset = queryset.prefetch_related('parties__contacts')
+        return queryset
 
     def get_serializer_class(self):
         """Return appropriate serializer class based on action."""
@@ -35,16 +101,137 @@ class ProcessViewSet(viewsets.ModelViewSet):
             return ProcessCreateUpdateSerializer
         elif self.action == 'list':
             return ProcessListSerializer
+        elif self.action == 'by_document':
+            return ProcessByDocumentSerializer
         return ProcessSerializer
 
     @action(detail=True, methods=['get'])
     def parties(self, request, pk=None):
-        """Get all parties for a specific process."""
-        process = self.get_object()
-        parties = Party.objects.filter(process=process)
-        serializer = PartySerializer(parties, many=True)
+        """List the parties of a process, as the party list does."""
+        # The query parameters filter the parties, not the process.
+        process = get_object_or_404(self.get_queryset(), pk=pk)
+        self.check_object_permissions(request, process)
+        return self.delegate_list(request, PartyViewSet, process_id=process.pk)
+
+    @action(detail=False, methods=['get'], url_path=r'by-document/(?P<document>[^/]+)')
+    def by_document(self, request, document=None):
+        """
+        List the processes a CPF/CNPJ takes part in, with its role in each.
+        
+        Served from the (document_normalized, process) index in a fixed
+        number of queries: count, page and one prefetch of the matching parties.
+        """
+        normalized = normalize_document(document)
+        if not normalized:
+            # An empty key would match every party saved without a document.
+            raise ValidationError({'document': ['Must contain digits.']})
+        matches = Party.objects.filter(document_normalized=normalized)
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            pk__in=matches.values('process_id')
+        )
+        if self.is_field_requested('roles'):
+            queryset = queryset.prefetch_related(
+                Prefetch('parties', queryset=matches, to_attr='matched_parties')
+            )
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get', 'post'])
+    def batch(self, request):
+        """
+        Retrieve many processes by CNJ number in one request.
+        
+        Numbers come from ``?numbers=a,b`` or, for long lists, a POSTed
+        ``{"numbers": [...]}``, in any punctuation. Found processes are
+        returned in input order and the others listed under ``missing``, in
+        a fixed number of queries: processes, parties and their contacts.
+        """
+        if request.method == 'POST':
+            numbers = request.data.get('numbers') if isinstance(request.data, dict) else request.data
+            if not isinstance(numbers, list) or not all(isinstance(number, str) for number in numbers):
+                return Response(
+                    {'numbers': ['Expected a list of process numbers.']},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            numbers = [
+                number for value in request.query_params.getlist('numbers')
+                for number in value.split(',')
+            ]
+        numbers = list(dict.fromkeys(number.strip() for number in numbers if number.strip()))
+        if len(numbers) > self.batch_max_size:
+            return Response(
+                {'numbers': [f'Ensure this list has no more than {self.batch_max_size} numbers.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # CNJ numbers are matched on the indexed digits, whatever the
+        # punctuation given or stored; other numbers only as written.
+        by_digits = {}
+        others = []
+        for number in numbers:
+            digits = normalize_process_number(number)
+            if digits is None:
+                others.append(number)
+            else:
+                by_digits.setdefault(digits, []).append(number)
+        
+        found = {}
+        for process in self.get_queryset().filter(
+            Q(cnj_digits__in=list(by_digits)) | Q(process_number__in=others)
+        ):
+            for number in by_digits.get(process.cnj_digits, []):
+                found.setdefault(number, process)
+            if process.process_number in others:
+                found.setdefault(process.process_number, process)
+        serializer = self.get_serializer([found[number] for number in numbers if number in found], many=True)
+        return Response({
+            'results': serializer.data,
+            'missing': [number for number in numbers if number not in found],
+        })
+
+    def perform_destroy(self, instance):
+        # Without loading the parties and contacts of the process.
+        ProcessPurger().delete_chunk([instance.pk])
+
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request):
+        """
+        Delete many processes with their parties and contacts.
+        
+        Takes ``{"ids": [...]}``; processes are deleted in chunks of
+        DELETE_CHUNK_SIZE with one statement per table, children first.
+        With ``?dry_run=true`` nothing is deleted and the counts of what
+        would be are returned.
+        """
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            return Response(
+                {'ids': ['Expected a list of process ids.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > self.bulk_delete_max_size:
+            return Response(
+                {'ids': [f'Ensure this list has no more than {self.bulk_delete_max_size} ids.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true', 'yes')
+        queryset = self.get_queryset().filter(pk__in=ids)
+        existing = set(queryset.values_list('pk', flat=True))
+        deleted = ProcessPurger(dry_run=dry_run).run(queryset)
+        return Response({
+            'deleted': deleted,
+            'missing': [pk for pk in ids if pk not in existing],
+            'dry_run': dry_run,
+        })
+
     @action(detail=False, methods=['get'])
     def export_excel(self, request):
         """Export processes data to Excel file."""
@@ -94,11 +281,115 @@ class ProcessViewSet(viewsets.ModelViewSet):
         wb.save(response)
         return response
 
-    @action(detail=False, methods=['post'])
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, NDJSONParser])
     def bulk_create(self, request):
-        """Create multiple processes at once."""
-        serializer = ProcessCreateUpdateSerializer(data=request.data, many=True)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        """
+        Create multiple processes at once, with their parties and contacts.
+        
+        Accepts a JSON array or a streamed NDJSON body (one process per line).
+        Items are committed in chunks of BULK_CREATE_CHUNK_SIZE; invalid items
+        are reported by index and skipped.
+        """
+        items = request.data
+        # NDJSONParser returns an iterator that is consumed chunk by chunk.
+        if not isinstance(items, (list, Iterator)):
+            return Response(
+                {'non_field_errors': ['Expected a list of items.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        result = ProcessBulkCreator().run(items)
+        if not result['errors']:
+            response_status = status.HTTP_201_CREATED
+        elif result['created']:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(result, status=response_status)
+
+
+class ChangeView(ChangeFeedView):
+    """
+    Changes to processes, parties and contacts, for downstream sync.
+    
+    Rows created before the change log are listed first, processes before
+    their parties and parties before their contacts.
+    """
+    permission_classes = [IsAuthenticated]
+    sources = [
+        ChangeSource('processes', Process.objects.all(), ProcessChangeSerializer),
+        ChangeSource('parties', Party.objects.all(), PartyIncludeSerializer),
+        ChangeSource('contacts', PartyContact.objects.all(), PartyContactIncludeSerializer),
+    ]
+
+
+class StatsView(APIView):
+    """
+    Distributions of processes by class, judge and month of creation, and
+    of their parties by category.
+    
+    Takes the filters of the process list. ``process_class`` and ``judge``
+    are answered from the ``ProcessStat`` summary, in a few milliseconds
+    whatever the size of the tables; other filters (date ranges,
+    ``search``) need grouped queries over the matching processes.
+    ``source`` tells which of the two served the response.
+    """
+    permission_classes = [IsAuthenticated]
+    summary_filters = ('process_class', 'judge')
+    # Filtered and searched exactly like the process list.
+    filterset_class = ProcessViewSet.filterset_class
+    search_fields = ProcessViewSet.search_fields
+    search_number_fields = ProcessViewSet.search_number_fields
+    search_index = ProcessViewSet.search_index
+    
+    def get(self, request, *args, **kwargs):
+        filterset = self.filterset_class(request.query_params, queryset=Process.objects.all(), request=request)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        active = {
+            name: value for name, value in filterset.form.cleaned_data.items()
+            if value not in (None, '')
+        }
+        searching = bool(FullTextSearchFilter().get_search_terms(request))
+        
+        if searching or any(name not in self.summary_filters for name in active):
+            queryset = FullTextSearchFilter().filter_queryset(request, filterset.qs, self).order_by()
+            count = Count('pk')
+            processes = queryset.annotate(month=TruncMonth('created_at'))
+            parties = Party.objects.filter(process__in=queryset.values('pk')).order_by()
+            source = 'live'
+        else:
+            summary = ProcessStat.objects.filter(**active)
+            count = Sum('count')
+            processes = summary.filter(category=stats.PROCESSES)
+            parties = summary.exclude(category=stats.PROCESSES)
+            source = 'summary'
+        
+        def distribution(queryset, field, ordering):
+            return list(
+                queryset.values(field).annotate(count=count).filter(count__gt=0).order_by(*ordering)
+                .values_list(field, 'count')
+            )
+        
+        by_class = distribution(processes, 'process_class', ['-count', 'process_class'])
+        by_judge = distribution(processes, 'judge', ['-count', 'judge'])
+        by_month = distribution(processes, 'month', ['month'])
+        by_category = distribution(parties, 'category', ['-count', 'category'])
+        categories = dict(Party.PARTY_CATEGORY_CHOICES)
+        return Response({
+            'source': source,
+            'processes': sum(count for _, count in by_class),
+            'parties': sum(count for _, count in by_category),
+            'by_process_class': [
+                {'process_class': value, 'count': count} for value, count in by_class
+            ],
+            'by_judge': [{'judge': value, 'count': count} for value, count in by_judge],
+            'by_month': [
+                {'month': stats.month_of(value).strftime('%Y-%m'), 'count': count}
+                for value, count in by_month
+            ],
+            'parties_by_category': [
+                {'category': value, 'category_display': categories.get(value, value), 'count': count}
+                for value, count in by_category
+            ],
+        })
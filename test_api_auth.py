@@ -2,6 +2,7 @@
 """
 Script para testar a API do sistema de processos jurídicos com autenticação.
 """
+import os
 import requests
 import json
 from getpass import getpass
@@ -13,13 +14,12 @@ def test_api_with_auth():
     print("🧪 Testando API do Sistema de Processos Jurídicos (com autenticação)")
     print("=" * 60)
     
-    # Get credentials
-    username = "admin"
-    password = "admin123"  # Updated password
+    # Get credentials (create one with: python manage.py create_api_key admin --name test-script)
+    api_key = os.environ.get("API_KEY", "")
     
     # Create session with authentication
     session = requests.Session()
-    session.auth = (username, password)
+    session.headers["Authorization"] = f"Api-Key {api_key}"
     
     # Test 1: List processes
     print("\n1. 📋 Listando processos...")